@@ -0,0 +1,52 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+# V2 Monte Carlo throughput: M GBM price paths of T steps stepped in lockstep by
+# MonteCarloLPSimulation, reporting the spread of LP value, IL and fees.
+#
+# Usage: python python/benchmark/v2/bench_monte_carlo.py [n_paths] [n_steps]   (default 10,000 x 1,000)
+
+import sys, os, time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+import numpy as np
+from python.prod.analytics.simulate import MonteCarloLPSimulation
+
+N_PATHS = 10_000
+N_STEPS = 1_000
+
+
+def gen_paths(p0, mu, sigma, n_steps, n_paths, seed = 0):
+    rng = np.random.default_rng(seed)
+    dt = 1/n_steps
+    z = rng.standard_normal((n_steps, n_paths))
+    log_ret = (mu - 0.5*sigma**2)*dt + sigma*np.sqrt(dt)*z
+    return p0*np.exp(np.vstack((np.zeros((1, n_paths)), np.cumsum(log_ret, axis = 0))))
+
+
+if __name__ == '__main__':
+    n_paths = int(sys.argv[1]) if len(sys.argv) > 1 else N_PATHS
+    n_steps = int(sys.argv[2]) if len(sys.argv) > 2 else N_STEPS
+    p_paths = gen_paths(100, 0.1, 0.5, n_steps, n_paths)
+    sim = MonteCarloLPSimulation(1000, 100000)
+    start = time.perf_counter()
+    sim.run(p_paths)
+    elapsed = time.perf_counter() - start
+    print(f"{n_paths} paths x {n_steps} steps in {elapsed:.2f} s: {n_paths*n_steps/elapsed:,.0f} pool steps/s")
+    print(f"LP value  p5/p50/p95: {np.percentile(sim.get_lp_value(), [5, 50, 95]).round(1)}")
+    print(f"IL        p5/p50/p95: {np.percentile(sim.get_iloss(), [5, 50, 95]).round(4)}")
+    print(f"fees      p5/p50/p95: {np.percentile(sim.get_fees(), [5, 50, 95]).round(1)}")
@@ -0,0 +1,65 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+# V2 swap throughput on a GWEI pool: integer-native arithmetic (IntMath, the default
+# for TYPE_GWEI) against the Decimal based SaferMath path it replaces.
+#
+# Usage: python python/benchmark/v2/bench_swap_int_math.py [n_swaps]   (default 1,000,000)
+
+import sys, os, time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.erc import ERC20
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.utils.tools import SaferMath
+
+USER = 'user0'
+N_SWAPS = 1_000_000
+
+
+def setup_pool():
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("BENCH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0 = eth, tkn1 = dai, symbol="LP", address="0x011",
+                                    precision = UniswapExchangeData.TYPE_GWEI)
+    lp = factory.deploy(exch_data)
+    lp.add_liquidity(USER, 1000*10**18, 100000*10**18, 1000*10**18, 100000*10**18)
+    return lp, eth, dai
+
+
+def time_swaps(lp, eth, dai, n_swaps):
+    start = time.perf_counter()
+    for k in range(n_swaps // 2):
+        out = lp.swap_exact_tokens_for_tokens(10**17 + k, 0, eth, USER)
+        lp.swap_exact_tokens_for_tokens(out, 0, dai, USER)
+    return time.perf_counter() - start, lp.reserve0, lp.reserve1
+
+
+if __name__ == '__main__':
+    n_swaps = int(sys.argv[1]) if len(sys.argv) > 1 else N_SWAPS
+    lp, eth, dai = setup_pool()
+    t_int, r0_int, r1_int = time_swaps(lp, eth, dai, n_swaps)
+    lp, eth, dai = setup_pool()
+    lp.math = SaferMath()
+    t_dec, r0_dec, r1_dec = time_swaps(lp, eth, dai, n_swaps)
+    print(f"{'path':>10} {'total (s)':>10} {'us/swap':>9}")
+    print(f"{'IntMath':>10} {t_int:>10.2f} {1e6*t_int/n_swaps:>9.2f}")
+    print(f"{'SaferMath':>10} {t_dec:>10.2f} {1e6*t_dec/n_swaps:>9.2f}")
+    print(f"speedup {t_dec/t_int:.2f}x, identical reserves: {(r0_int, r1_int) == (r0_dec, r1_dec)}")
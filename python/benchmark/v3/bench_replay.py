@@ -0,0 +1,75 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+# V3 replay throughput: a synthetic log of swaps in both directions over a pool with
+# nested positions around the price, replayed through ReplayEngine with periodic checkpoints.
+#
+# Usage: python python/benchmark/v3/bench_replay.py [n_events]   (default 100,000)
+
+import sys, os, time, tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+import numpy as np
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.erc import ERC20
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.utils.tools.v3 import TickMath
+from python.prod.analytics.simulate import ReplayEngine
+
+USER = 'user0'
+TICK_SPACING = 60
+FEE = 3000
+N_POSITIONS = 50
+N_EVENTS = 100_000
+
+
+def setup_pool():
+    tkn0 = ERC20("TKN0", "0x09")
+    tkn1 = ERC20("TKN1", "0x111")
+    factory = UniswapFactory("BENCH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0 = tkn0, tkn1 = tkn1, symbol="LP", address="0x011",
+                                    version = UniswapExchangeData.VERSION_V3,
+                                    precision = UniswapExchangeData.TYPE_GWEI,
+                                    tick_spacing = TICK_SPACING, fee = FEE)
+    lp = factory.deploy(exch_data)
+    lp.initialize(TickMath.getSqrtRatioAtTick(0))
+    for k in range(1, N_POSITIONS + 1):
+        lp.mint(USER, -k*TICK_SPACING, k*TICK_SPACING, 10**21)
+    return lp
+
+
+def write_log(path, n_events, seed = 0):
+    rng = np.random.default_rng(seed)
+    zero_for_one = rng.random(n_events) < 0.5
+    amounts = rng.integers(10**17, 10**18, n_events)
+    np.savez(path, event = np.zeros(n_events, dtype = np.int8), user = np.full(n_events, USER),
+             amount0 = np.where(zero_for_one, amounts, 0), amount1 = np.where(zero_for_one, 0, amounts))
+
+
+if __name__ == '__main__':
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else N_EVENTS
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, 'ops.npz')
+        write_log(log_path, n_events)
+        lp = setup_pool()
+        engine = ReplayEngine(lp, os.path.join(tmp, 'replay.ckpt'))
+        start = time.perf_counter()
+        engine.replay(log_path)
+        elapsed = time.perf_counter() - start
+    print(f"{n_events} V3 events in {elapsed:.2f} s: {n_events/elapsed:,.0f} events/s "
+          f"({engine.checkpoint_every} events per checkpoint, tick at end {lp.slot0.tick})")
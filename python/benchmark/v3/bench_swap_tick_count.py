@@ -0,0 +1,96 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+# Swap latency against the number of initialized ticks in a V3 pool.
+#
+# Each pool holds n nested positions around the current price (2n initialized ticks),
+# and every timed swap crosses up to TICKS_CROSSED of them. With the sorted tick index
+# the cost per step is a bisect, so latency should stay flat as the tick count grows;
+# the legacy search (sort all tick keys on every step) is timed for comparison.
+#
+# Usage: python python/benchmark/v3/bench_swap_tick_count.py
+
+import sys, os, time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.erc import ERC20
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.utils.tools.v3 import TickMath
+from python.prod.utils.tools.v3.Shared import MIN_TICK, MAX_TICK, MAX_INT128
+
+USER = 'user0'
+TICK_SPACING = 10
+FEE = 500
+TICKS_CROSSED = 20
+N_SWAPS = 20
+
+
+def setup_pool(n_ticks):
+    tkn0 = ERC20("TKN0", "0x09")
+    tkn1 = ERC20("TKN1", "0x111")
+    factory = UniswapFactory("BENCH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0 = tkn0, tkn1 = tkn1, symbol="LP", address="0x011",
+                                    version = UniswapExchangeData.VERSION_V3,
+                                    precision = UniswapExchangeData.TYPE_GWEI,
+                                    tick_spacing = TICK_SPACING, fee = FEE)
+    lp = factory.deploy(exch_data)
+    lp.initialize(TickMath.getSqrtRatioAtTick(0))
+    for k in range(1, n_ticks // 2 + 1):
+        lp.mint(USER, -k*TICK_SPACING, k*TICK_SPACING, 10**18)
+    return lp
+
+
+def legacy_next_tick(lp):
+    # Previous implementation: sort every tick key on each swap step
+    def next_tick(tick, lte):
+        key_list = list(lp.ticks.keys())
+        if tick not in lp.ticks:
+            key_list += [tick]
+        sorted_keys = sorted(key_list)
+        i = sorted_keys.index(tick)
+        if lte:
+            if tick in lp.ticks:
+                return tick, True
+            elif i == 0:
+                return MIN_TICK, False
+            return sorted_keys[i - 1], True
+        if i == len(sorted_keys) - 1:
+            return MAX_TICK, False
+        return sorted_keys[i + 1], True
+    return next_tick
+
+
+def time_swaps(lp, n_swaps):
+    lwr = TickMath.getSqrtRatioAtTick(-TICKS_CROSSED*TICK_SPACING - 1)
+    upr = TickMath.getSqrtRatioAtTick(TICKS_CROSSED*TICK_SPACING + 1)
+    start = time.perf_counter()
+    for _ in range(n_swaps):
+        lp.swap(USER, True, MAX_INT128, lwr)
+        lp.swap(USER, False, MAX_INT128, upr)
+    return (time.perf_counter() - start) / (2*n_swaps)
+
+
+if __name__ == '__main__':
+    print(f"{'ticks':>8} {'indexed (ms/swap)':>18} {'legacy (ms/swap)':>17}")
+    for n_ticks in (10, 1_000, 100_000):
+        lp = setup_pool(n_ticks)
+        indexed = time_swaps(lp, N_SWAPS)
+        lp.nextTick = legacy_next_tick(lp)
+        legacy = time_swaps(lp, max(1, N_SWAPS // max(1, n_ticks // 1_000)))
+        print(f"{len(lp.ticks):>8} {1e3*indexed:>18.3f} {1e3*legacy:>17.3f}")
@@ -6,6 +6,7 @@ from uniswappy.cpt.exchg import *
 from uniswappy.cpt.factory import *
 from uniswappy.cpt.index import *
 from uniswappy.cpt.quote import *
+from uniswappy.cpt.router import *
 from uniswappy.cpt.vault import *
 from uniswappy.cpt.wallet import *
 from uniswappy.math.basic import *
@@ -16,6 +16,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License
 
+import math
 import numpy as np
 import pandas as pd
 from ...cpt.quote import LPQuote
@@ -24,16 +25,20 @@ from ...math.model import TokenDeltaModel
 from ...utils.data import UniswapExchangeData
 from ...utils.tools.v3 import UniV3Helper
 from ...utils.tools.v3 import UniV3Utils
+from ...utils.tools.v3.Shared import MIN_SQRT_RATIO, MAX_SQRT_RATIO, MAX_INT128
 
 class Arbitrage():
     
     THRES = 0.2
     FRAC = 0.1
+    MODE_RANDOM = 'random'
+    MODE_EXACT = 'exact'
     
-    def __init__(self, lp, mstate, tDel = None):   
+    def __init__(self, lp, mstate, tDel = None, mode = MODE_RANDOM):   
         self.lp = lp
         self.mstate = mstate
         self.tDel = TokenDeltaModel(50) if tDel == None else tDel
+        self.mode = mode
         self.threshold = self.THRES
         self.net_y = 0
         self.net_x = 0
@@ -43,6 +48,9 @@ class Arbitrage():
         self.upr_tick = None         
            
     def apply(self, price_benchmark, user_nm, amt_in = None):
+        if(self.mode == self.MODE_EXACT):
+            return self.apply_exact(price_benchmark, user_nm)
+        
         tokens = self.lp.factory.token_from_exchange[self.lp.name]
         
         x_tkn = tokens[self.lp.token0]
@@ -81,6 +89,96 @@ class Arbitrage():
                     p_x = LPQuote().get_price(self.lp, x_tkn, lwr_tick, upr_tick)
                 #print('[2] p-bench {:.3f} p_x {:.3f}'.format(price_benchmark, p_x))    
         
+        self._tally(amt_x_sell, amt_y_buy, amt_y_sell, amt_x_buy)
+
+    def apply_exact(self, price_benchmark, user_nm):
+        
+        """ apply_exact
+
+            Move the pool price of token0 to price_benchmark with a single swap of the exact 
+            input needed, in place of the random-increment loop of apply; buying token0 is 
+            capped by the threshold portion of the held token1, as in apply
+                
+            Parameters
+            -----------------
+            price_benchmark : float
+                target price of token0 in token1
+            user_nm : str
+                account name                 
+        """  
+        
+        tokens = self.lp.factory.token_from_exchange[self.lp.name]
+        x_tkn = tokens[self.lp.token0]
+        y_tkn = tokens[self.lp.token1]
+        
+        amt_x_sell = 0; amt_y_buy = 0 
+        amt_y_sell = 0; amt_x_buy = 0
+        
+        p_x = self.lp.get_price(x_tkn)
+        num_states = len(self.mstate.states)
+        held_y_amt = self.mstate.get_current_state('dHeld') 
+        
+        if(p_x != None and p_x > price_benchmark):
+            amt_x_sell = self.calc_exact_amount(x_tkn, price_benchmark)
+            if(amt_x_sell > 0):
+                amt_y_buy = self._swap_to_price(x_tkn, user_nm, amt_x_sell, price_benchmark)
+        elif(p_x != None and p_x < price_benchmark and num_states > 3):
+            amt_y_sell = min(self.calc_exact_amount(y_tkn, price_benchmark), self.threshold*held_y_amt)
+            amt_y_sell = self.lp.convert_to_human(self.lp.convert_to_machine(amt_y_sell))
+            if(amt_y_sell > 0):
+                amt_x_buy = self._swap_to_price(y_tkn, user_nm, amt_y_sell, price_benchmark)
+            else:
+                amt_y_sell = 0
+                
+        self._tally(amt_x_sell, amt_y_buy, amt_y_sell, amt_x_buy)
+        
+    def calc_exact_amount(self, token_in, price_benchmark):
+        
+        """ calc_exact_amount
+
+            Input amount of token_in that moves the pool price of token0 to price_benchmark. 
+            V2 solves the constant product with the 0.3% fee in closed form; V3 walks the tick 
+            ranges up to the target sqrt price with a read-only quote
+                
+            Parameters
+            -----------------
+            token_in : ERC20
+                token swapped into the pool
+            price_benchmark : float
+                target price of token0 in token1
+
+            Returns
+            -----------------
+            amount_in : float
+                input amount, 0 when the price is already past the target                
+        """  
+        
+        zero_for_one = token_in.token_name == self.lp.token0
+        if(self.lp.version == UniswapExchangeData.VERSION_V3):
+            quote = self.lp.quote_exact_input(token_in, self.lp.convert_to_human(MAX_INT128), 
+                                              self._sqrt_price_limit(price_benchmark))
+            return quote.amountIn
+        
+        # reserves after a fee-taking input dx leave price r1'/r0' = P at the root of 
+        # 997 dx^2 + 1997 r_in dx + 1000 r_in^2 - 1000 r0 r1 (1/P or P) = 0
+        (r_in, target) = (self.lp.reserve0, self.lp.reserve0*self.lp.reserve1/price_benchmark) if zero_for_one else \
+                         (self.lp.reserve1, self.lp.reserve0*self.lp.reserve1*price_benchmark)
+        c = 1000*r_in**2 - 1000*target
+        if(c >= 0):
+            return 0
+        dx = (-1997*r_in + math.sqrt((1997*r_in)**2 - 4*997*c))/(2*997)
+        return self.lp.convert_to_human(int(dx))
+
+    def _swap_to_price(self, token_in, user_nm, amt, price_benchmark):
+        if(self.lp.version == UniswapExchangeData.VERSION_V3):
+            return Swap().apply(self.lp, token_in, user_nm, amt, self._sqrt_price_limit(price_benchmark))
+        return self.lp.swap_exact_tokens_for_tokens(amt, 0, token_in, user_nm)
+        
+    def _sqrt_price_limit(self, price_benchmark):
+        sqrt_price = int(math.sqrt(price_benchmark)*2**96)
+        return min(max(sqrt_price, MIN_SQRT_RATIO + 1), MAX_SQRT_RATIO - 1)
+
+    def _tally(self, amt_x_sell, amt_y_buy, amt_y_sell, amt_x_buy):
         self.net_x = amt_x_buy - amt_x_sell
         self.net_y = amt_y_buy - amt_y_sell 
         
@@ -17,7 +17,7 @@
 # limitations under the License
 
 from ...utils.tools.v3 import UniV3Helper
-from ...analytics.simulate import SolveDeltas
+from ...analytics.simulate import SolveDeltasAnalytic
 from ...process.deposit import SwapDeposit
 from ...process.swap import WithdrawSwap
 from ...utils.data import UniswapExchangeData
@@ -31,7 +31,7 @@ USER_NM = 'reserve_correction'
 class CorrectReserves:
     
     """ 
-        Applies SolveDeltas to Correct x/y reserve amounts so that price reflects desired input price; 
+        Applies SolveDeltasAnalytic to Correct x/y reserve amounts so that price reflects desired input price; 
         in the marjority of cases, the input price would be the most recent outside market price 
         
         Parameters
@@ -41,12 +41,12 @@ class CorrectReserves:
         x0 : float
             Initial market price at the beginning of the simulation 
         fac : float
-            scipy.fsolve parameter for non-linear solver found in SolveDeltas class
+            scipy.fsolve parameter of SolveDeltas; unused by the closed-form SolveDeltasAnalytic
     """             
     
     def __init__(self, lp, x0 = None, fac = None):
         self.lp = lp
-        self.sDel = SolveDeltas(lp)
+        self.sDel = SolveDeltasAnalytic(lp)
         self.x0 = X0 if x0 == None else int(x0)
         self.fac = FAC if fac == None else fac
         self.swap_dx = 0
@@ -60,12 +60,12 @@ class CorrectReserves:
         
         """ get_swap_dx
 
-            Get delta x reserve adjustment from SolveDeltas class
+            Get delta x reserve adjustment from SolveDeltasAnalytic class
                 
             Returns
             -----------------
             swap_dx : float
-                Delta x reserve adjustment from SolveDeltas class                   
+                Delta x reserve adjustment from SolveDeltasAnalytic class                   
         """         
         
         return self.swap_dx
@@ -74,12 +74,12 @@ class CorrectReserves:
         
         """ get_swap_dy
 
-            Get delta y reserve adjustment from SolveDeltas class
+            Get delta y reserve adjustment from SolveDeltasAnalytic class
                 
             Returns
             -----------------
             swap_dy : float
-                Delta y reserve adjustment from SolveDeltas class                   
+                Delta y reserve adjustment from SolveDeltasAnalytic class                   
         """           
         
         return self.swap_dy    
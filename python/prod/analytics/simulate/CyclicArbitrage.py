@@ -0,0 +1,337 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import math
+from collections import deque
+from ...cpt.router import Router
+from ...utils.data import UniswapExchangeData
+from ...utils.data import Route
+
+Q96 = 2**96
+EPS = 1e-12
+GOLDEN = (math.sqrt(5) - 1) / 2
+MAX_SEARCH_STEPS = 128
+
+class CyclicArbitrage():
+
+    """ Cyclic arbitrage detection across every pool of one or more factories. Each pool adds
+        two edges to a graph over tokens, weighted by the negative log of the fee adjusted spot
+        rate, so a profitable cycle is a negative cycle. Shortest distances from a virtual
+        source are kept between updates and only pools whose price moved are re-weighted,
+        so each update re-relaxes (SPFA) just the part of the graph they affect
+
+        Parameters
+        -----------------
+        factories : UniswapFactory or list
+            factories whose pools are searched
+    """
+
+    def __init__(self, factories):
+        self.router = Router(factories, max_hops = None)
+        self.weights = {}
+        self.pool_keys = {}
+        self.dist = {}
+        self.pred = {}
+
+    def update(self):
+
+        """ update
+
+            Re-weight the pools whose price moved since the last update and re-relax the
+            shortest distances around them
+
+            Returns
+            -----------------
+            cycle_node : str
+                token reached through a negative cycle, None when there is none
+        """
+
+        self.router.sync()
+        graph = self.router.graph
+        pools = {id(lp): lp for factory in self.router.factories for lp in factory.exchanges.values()}
+        removed = set(self.pool_keys) - set(pools)
+        if removed:
+            # pools replaced by a redeploy leave the graph; the tree may have run through them
+            self.pool_keys = {pool_id: key for pool_id, key in self.pool_keys.items() if pool_id in pools}
+            self.weights = {edge: w for edge, w in self.weights.items() if edge[0] in pools}
+            self.dist = {}
+            self.pred = {}
+        touched = set()
+        for lp in pools.values():
+            key = self._pool_key(lp)
+            if self.pool_keys.get(id(lp)) != key:
+                self.pool_keys[id(lp)] = key
+                self._weigh(lp)
+                touched.update((lp.token0, lp.token1))
+
+        for tkn_nm in graph:
+            if tkn_nm not in self.dist:
+                self.dist[tkn_nm] = 0
+                self.pred[tkn_nm] = None
+                touched.add(tkn_nm)
+
+        # Distances along the kept predecessor tree are lengths of real walks under the new
+        # weights, so they remain valid starting bounds; a tree broken by a cycle is reset
+        if not self._rebase_tree(touched):
+            self.dist = {tkn_nm: 0 for tkn_nm in graph}
+            self.pred = {tkn_nm: None for tkn_nm in graph}
+            touched = set(graph)
+
+        seeds = set(touched)
+        for tkn_nm in touched:
+            seeds.update(v for (_, v) in graph[tkn_nm])
+        return self._spfa(seeds)
+
+    def find_cycles(self):
+
+        """ find_cycles
+
+            Negative cycles in the predecessor graph of the last update
+
+            Returns
+            -----------------
+            cycles : list
+                unsized Route of each cycle, tokens starting and ending on the same token
+        """
+
+        cycles = []
+        done = set()
+        for start in self.pred:
+            walk = {}
+            tkn_nm = start
+            while tkn_nm != None and tkn_nm not in done and tkn_nm not in walk:
+                walk[tkn_nm] = len(walk)
+                tkn_nm = self.pred[tkn_nm][0] if self.pred[tkn_nm] != None else None
+            if tkn_nm != None and tkn_nm in walk:
+                cycle = self._trace_cycle(tkn_nm)
+                weight = sum(self.weights[(id(lp), u)] for u, lp in zip(cycle.tokens, cycle.pools))
+                if weight < -EPS:
+                    cycles.append(cycle)
+            done.update(walk)
+        return cycles
+
+    def size_cycle(self, cycle):
+
+        """ size_cycle
+
+            Input amount that maximizes the profit of a cycle; V2 cycles compose their swap
+            functions into a single x -> A x / (B + C x) with the closed form optimum
+            x* = (sqrt(A B) - B) / C, cycles with a V3 pool are sized by searching quotes that
+            walk the ticks
+
+            Parameters
+            -----------------
+            cycle : Route
+                cycle from find_cycles
+
+            Returns
+            -----------------
+            route : Route
+                cycle with its quoted amounts, None when no input is profitable
+        """
+
+        if all(lp.version == UniswapExchangeData.VERSION_V2 for lp in cycle.pools):
+            x = self._closed_form_size(cycle)
+        else:
+            x = self._search_size(cycle)
+        if x == None or not x > 0:
+            return None
+        amounts = self._quote_cycle(cycle, x)
+        if amounts == None or not amounts[-1] > amounts[0]:
+            return None
+        return Route(cycle.tokens, cycle.pools, amounts)
+
+    def execute(self, route, user_nm):
+
+        """ execute
+
+            Trade a sized cycle atomically, reverting every pool if it would lose
+
+            Parameters
+            -----------------
+            route : Route
+                sized cycle from size_cycle
+            user_nm : str
+                account name
+
+            Returns
+            -----------------
+            profit : float
+                amount of the cycle's token gained
+        """
+
+        amount_out = self.router.execute(route, user_nm, amount_out_min = route.amount_in)
+        return amount_out - route.amount_in
+
+    def apply(self, user_nm = None):
+
+        """ apply
+
+            Update the graph, size every negative cycle found and, given a user, trade the
+            most profitable one
+
+            Parameters
+            -----------------
+            user_nm : str
+                account name trading the best cycle, None to only detect
+
+            Returns
+            -----------------
+            routes : list
+                sized profitable cycles, most profitable first
+        """
+
+        if self.update() == None:
+            return []
+        routes = [self.size_cycle(cycle) for cycle in self.find_cycles()]
+        routes = sorted([r for r in routes if r != None], key = lambda r: r.amount_out - r.amount_in, reverse = True)
+        if user_nm != None and routes:
+            self.execute(routes[0], user_nm)
+        return routes
+
+    def _pool_key(self, lp):
+        if lp.version == UniswapExchangeData.VERSION_V2:
+            return (lp.reserve0, lp.reserve1)
+        return lp.slot0.sqrtPriceX96 if hasattr(lp, 'slot0') else None
+
+    def _weigh(self, lp):
+        if lp.version == UniswapExchangeData.VERSION_V2:
+            (rate01, rate10) = (0, 0)
+            if lp.reserve0 > 0 and lp.reserve1 > 0:
+                (rate01, rate10) = (997*lp.reserve1/(1000*lp.reserve0), 997*lp.reserve0/(1000*lp.reserve1))
+        else:
+            price = (lp.slot0.sqrtPriceX96/Q96)**2 if self.pool_keys[id(lp)] != None else 0
+            gamma = 1 - lp.fee/1e6
+            (rate01, rate10) = (gamma*price, gamma/price) if price > 0 else (0, 0)
+        for tkn_nm, rate in ((lp.token0, rate01), (lp.token1, rate10)):
+            if rate > 0:
+                self.weights[(id(lp), tkn_nm)] = -math.log(rate)
+            else:
+                self.weights.pop((id(lp), tkn_nm), None)
+
+    def _rebase_tree(self, touched):
+        dist = {}
+        for start in self.pred:
+            chain = []
+            tkn_nm = start
+            while tkn_nm not in dist and self.pred[tkn_nm] != None:
+                chain.append(tkn_nm)
+                if len(chain) > len(self.pred):
+                    return False
+                tkn_nm = self.pred[tkn_nm][0]
+            if tkn_nm not in dist:
+                dist[tkn_nm] = 0
+            for v in reversed(chain):
+                (u, lp) = self.pred[v]
+                w = self.weights.get((id(lp), u))
+                if w == None or dist[u] + w > 0:
+                    # the edge is gone or the direct source edge is shorter
+                    dist[v] = 0
+                    self.pred[v] = None
+                else:
+                    dist[v] = dist[u] + w
+                if dist[v] != self.dist[v]:
+                    touched.add(v)
+        self.dist = dist
+        return True
+
+    def _spfa(self, seeds):
+        graph = self.router.graph
+        n_nodes = len(graph)
+        queue = deque(sorted(seeds))
+        queued = set(seeds)
+        n_relaxed = {}
+        while queue:
+            u = queue.popleft()
+            queued.discard(u)
+            for lp, v in graph[u]:
+                w = self.weights.get((id(lp), u))
+                if w == None or not self.dist[u] + w < self.dist[v] - EPS:
+                    continue
+                self.dist[v] = self.dist[u] + w
+                self.pred[v] = (u, lp)
+                n_relaxed[v] = n_relaxed.get(v, 0) + 1
+                if n_relaxed[v] >= n_nodes:
+                    return v
+                if v not in queued:
+                    queue.append(v)
+                    queued.add(v)
+        return None
+
+    def _trace_cycle(self, tkn_nm):
+        tokens = [tkn_nm]
+        pools = []
+        u = tkn_nm
+        while True:
+            (u, lp) = self.pred[u]
+            tokens.append(u)
+            pools.append(lp)
+            if u == tkn_nm:
+                break
+        # predecessors run backwards along the cycle
+        return Route(tokens[::-1], pools[::-1], None)
+
+    def _quote_cycle(self, cycle, amount_in):
+        amounts = [amount_in]
+        for lp, tkn_nm in zip(cycle.pools, cycle.tokens):
+            amount_out = self.router.quote_hop(lp, tkn_nm, amounts[-1])
+            if amount_out == None:
+                return None
+            amounts.append(amount_out)
+        return amounts
+
+    def _closed_form_size(self, cycle):
+        (A, B, C) = (1, 1, 0)
+        for lp, tkn_nm in zip(cycle.pools, cycle.tokens):
+            (reserve_in, reserve_out) = (lp.reserve0, lp.reserve1) if tkn_nm == lp.token0 else (lp.reserve1, lp.reserve0)
+            (a, b, c) = (997*reserve_out, 1000*reserve_in, 997)
+            (A, B, C) = (a*A, b*B, b*C + c*A)
+        if A <= B:
+            return None
+        # reserves are in machine units, the sized input is in the pool's precision
+        return cycle.pools[0].convert_to_human((math.isqrt(A*B) - B) // C)
+
+    def _search_size(self, cycle):
+        lp = cycle.pools[0]
+
+        # the search runs over integer machine units, quotes take the pool's precision
+        def profit(x):
+            amounts = self._quote_cycle(cycle, lp.convert_to_human(x))
+            return -math.inf if amounts == None else lp.convert_to_machine(amounts[-1]) - x
+
+        # bracket the maximum of the concave profit by halving to a profitable size, then doubling
+        x = max(1, (lp.reserve0 if cycle.tokens[0] == lp.token0 else lp.reserve1) // 10**6)
+        for _ in range(MAX_SEARCH_STEPS):
+            if profit(x) > 0 or x == 1: break
+            x //= 2
+        if not profit(x) > 0:
+            return None
+        for _ in range(MAX_SEARCH_STEPS):
+            if not profit(2*x) > profit(x): break
+            x *= 2
+
+        # golden-section search on [x/2, 2x]
+        (lo, hi) = (x // 2, 2*x)
+        while hi - lo > 2:
+            m1 = hi - int(GOLDEN*(hi - lo))
+            m2 = lo + int(GOLDEN*(hi - lo))
+            if profit(m1) < profit(m2):
+                lo = m1
+            else:
+                hi = m2
+        return lp.convert_to_human(max(range(lo, hi + 1), key = profit))
@@ -17,23 +17,32 @@
 # limitations under the License
 
 import numpy as np
-import pandas as pd
 from termcolor import colored
 from ...cpt.quote import LPQuote
 from ...process.swap import Swap
 from ...math.model import TokenDeltaModel
+from ...analytics.simulate import StateHistory
+
+COLUMNS = ['Mint', 'Held', 'Vault', 'Burned']
 
 class MarkovState():
     
     def __init__(self, stochastic = True, tDel = None):
         self.tDel = TokenDeltaModel(500) if tDel == None else tDel
         self.stochastic = stochastic
-        self.current_state = [[0, 0, 0, 0]]
-        self.states = self.current_state
+        self.current_state = np.zeros((1, 4))
+        self.history = StateHistory(COLUMNS)
+
+    @property
+    def states(self):
+        return self.history.get_states()
 
     def gen_states(self, N):   
-        for k in range(N):
-            self.next_state(self.tDel.delta())
+        P = self.gen_trans_matrices(N, self.stochastic)
+        added = np.zeros((N, 4))
+        added[:,0] = self.tDel.sample(N, clip = False)
+        self.history.propagate(self.current_state[0], P, added)
+        self.current_state = self.history.get_states()[-1:].copy()
         return self.get_state_df()          
         
     def next_state(self, minted = None):
@@ -41,26 +50,19 @@ class MarkovState():
         self.current_state = np.dot(self.current_state, P)
         minted = self.tDel.delta() if minted == None else minted
         self.current_state = self.current_state  + np.array([[minted, 0.0, 0.0, 0.0]])
-        self.states = np.append(self.states, self.current_state, axis=0)
+        self.history.append(self.current_state)
         
     def update_current_state(self, amt, stat_cat = 'Vault'):
         if(stat_cat == 'Vault'):
             # Update between held and vault
-            self.states[-1,1] += amt  # Add to held
-            self.states[-1,2] -= amt  # Remove from vault
+            self.history.add('Held', amt)  # Add to held
+            self.history.add('Vault', -amt)  # Remove from vault
              
     def get_current_state(self, colnm = None):  
-        df_states = self.get_state_df(self.states[-2:])
-        return df_states.iloc[-1] if colnm == None else df_states[colnm].iloc[-1]
+        return self.history.get_current(colnm)
     
     def get_state_df(self, state_arr = []): 
-        state_arr = self.states[1:,] if len(state_arr) == 0 else state_arr
-        df_states = pd.DataFrame(self.states[1:,])    
-        df_states.columns = ['Mint', 'Held', 'Vault', 'Burned'] 
-        df_states['dHeld'] = np.insert(np.diff(df_states['Held'].values), 0, 0)
-        df_states['dVault'] = np.insert(np.diff(df_states['Vault'].values), 0, 0)
-        df_states['dBurned'] = np.insert(np.diff(df_states['Burned'].values), 0, 0) 
-        return df_states
+        return self.history.get_df()
         
     def scale_x(self, x):
         return list(x/np.sum(x))
@@ -86,6 +88,18 @@ class MarkovState():
 
         P = P_stochastic if stochastic else P_deterministic  
         return np.array(list(map(self.scale_x, P))) 
+
+    def gen_trans_matrices(self, N, stochastic = True):
+        if not stochastic:
+            return np.broadcast_to(self.gen_trans_matrix(False), (N, 4, 4))
+        # the draws of N gen_trans_matrix calls, made at once
+        P = np.zeros((N, 4, 4))
+        P[:,0,1] = 1
+        P[:,1,1:] = np.random.beta([19, 4, 1], [81, 1, 99], (N, 3))
+        P[:,2,1] = np.clip(np.random.beta(1, 4, N), 0.2, 0.3)
+        P[:,2,2] = np.clip(np.random.beta(4, 1, N), 0.7, 0.8)
+        P[:,3,3] = 1
+        return P/P.sum(axis = 2, keepdims = True)
     
     def inspect_states(self, tail = True, num_states = 5):
         dfDistrLP1 = self.get_state_df()
@@ -0,0 +1,188 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import numpy as np
+
+FEE = 0.003
+
+class MonteCarloLPSimulation:
+
+    """ Monte Carlo simulation of M independent V2 pools stepped in lockstep over a (T x M)
+        matrix of outside prices, such as BrownianModel.gen_gbms. Reserves, total supply and
+        fee accumulators are NumPy arrays of length M; at each step every pool is traded
+        by the fee-paying swap that moves its price to the outside price, as with
+        SolveDeltasAnalytic.calc_swap on a single UniswapExchange
+
+        Parameters
+        -----------------
+        x_amt : float or array
+            initial token0 reserve of each pool, in human units
+        y_amt : float or array
+            initial token1 reserve of each pool, in human units
+        lp_amt : float or array
+            liquidity of the tracked position; defaults to the whole pool
+        fee : float
+            swap fee, 0.3% for V2
+    """
+
+    def __init__(self, x_amt, y_amt, lp_amt = None, fee = FEE):
+        self.x_init = np.asarray(x_amt, dtype = float)
+        self.y_init = np.asarray(y_amt, dtype = float)
+        self.total_supply = np.sqrt(self.x_init*self.y_init)
+        self.lp_amt = self.total_supply if lp_amt is None else np.asarray(lp_amt, dtype = float)
+        self.gamma = 1 - fee
+        self.x = None
+        self.y = None
+        self.fee_x = None
+        self.fee_y = None
+        self.fee_val = None
+        self.price = None
+        self.x_amt_arr = None
+        self.y_amt_arr = None
+
+    def run(self, p_paths, record = False):
+
+        """ run
+
+            Step every pool across its price path
+
+            Parameters
+            -----------------
+            p_paths : array
+                (T x M) outside prices of token0 in token1, one column per path
+            record : bool
+                keep the (T x M) reserve histories, see get_x_amt_sim and get_y_amt_sim
+        """
+
+        p_paths = np.asarray(p_paths, dtype = float)
+        if p_paths.ndim == 1:
+            p_paths = p_paths[:, None]
+        (n_step, n_paths) = p_paths.shape
+
+        self.x = np.broadcast_to(self.x_init, (n_paths,)).copy()
+        self.y = np.broadcast_to(self.y_init, (n_paths,)).copy()
+        self.fee_x = np.zeros(n_paths)
+        self.fee_y = np.zeros(n_paths)
+        self.fee_val = np.zeros(n_paths)
+        if record:
+            self.x_amt_arr = np.empty((n_step, n_paths))
+            self.y_amt_arr = np.empty((n_step, n_paths))
+
+        for t in range(n_step):
+            self._step(p_paths[t])
+            if record:
+                self.x_amt_arr[t] = self.x
+                self.y_amt_arr[t] = self.y
+        self.price = p_paths[-1]
+
+    def _step(self, p):
+        # input d with price r1'/r0' = p after the swap is the positive root of
+        # gamma d^2 + (1 + gamma) r_in d + r_in^2 - x y (1/p or p) = 0, in its stable form
+        (x, y, g) = (self.x, self.y, self.gamma)
+        up = p*x > y
+        r_in = np.where(up, y, x)
+        b = (1 + g)*r_in
+        c = r_in**2 - x*y*np.where(up, p, 1/p)
+        d_in = np.maximum(-2*c/(b + np.sqrt(b**2 - 4*g*c)), 0)
+        fee = (1 - g)*d_in
+        self.fee_x += np.where(up, 0, fee)
+        self.fee_y += np.where(up, fee, 0)
+        self.fee_val += np.where(up, fee, fee*p)
+        # the whole input, fee included, stays in the pool
+        k = x*y
+        self.x = np.where(up, k/(y + g*d_in), x + d_in)
+        self.y = np.where(up, y + d_in, k/(x + g*d_in))
+
+    def get_x_amt(self):
+        return self.x
+
+    def get_y_amt(self):
+        return self.y
+
+    def get_x_amt_sim(self):
+        return self.x_amt_arr
+
+    def get_y_amt_sim(self):
+        return self.y_amt_arr
+
+    def get_lp_value(self):
+
+        """ get_lp_value
+
+            Value of the position at the last price, in token1
+
+            Returns
+            -----------------
+            value : array
+                position value per path
+        """
+
+        share = self.lp_amt/self.total_supply
+        return share*(self.price*self.x + self.y)
+
+    def get_hold_value(self):
+
+        """ get_hold_value
+
+            Value at the last price of holding the tokens deposited for the position, in token1
+
+            Returns
+            -----------------
+            value : array
+                hold value per path
+        """
+
+        share = self.lp_amt/self.total_supply
+        return share*(self.price*self.x_init + self.y_init)
+
+    def get_fees(self):
+
+        """ get_fees
+
+            Swap fees earned by the position, each valued in token1 at the price of its step
+
+            Returns
+            -----------------
+            fees : array
+                fee revenue per path
+        """
+
+        return self.lp_amt/self.total_supply*self.fee_val
+
+    def get_iloss(self, fees = False):
+
+        """ get_iloss
+
+            Impermanent loss of the position against holding, as UniswapImpLoss.apply
+
+            Parameters
+            -----------------
+            fees : bool
+                include the fees earned, which stay in the reserves; otherwise the price
+                ratio formula 2 sqrt(a) / (1 + a) - 1
+
+            Returns
+            -----------------
+            iloss : array
+                impermanent loss per path
+        """
+
+        if fees:
+            return self.get_lp_value()/self.get_hold_value() - 1
+        alpha = self.price/(self.y_init/self.x_init)
+        return 2*np.sqrt(alpha)/(1 + alpha) - 1
@@ -0,0 +1,287 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from ...utils.data import UniswapExchangeData
+from ...utils.tools import EventJournal
+from ...utils.tools.EventJournal import EVENT_NAMES
+from ...utils.tools.v3 import UniV3Utils
+from ...process import LPTransaction
+
+DEFAULT_CHUNK_SIZE = 65_536
+DEFAULT_CHECKPOINT_EVERY = 100_000
+
+# Operation log columns; missing columns read as 0
+COLUMNS = ('event', 'user', 'amount0', 'amount1', 'liquidity', 'tick_lower', 'tick_upper')
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_NAMES)}
+
+class ReplayEngine():
+
+    """ Deterministic replay of a recorded operation log against a factory deployed pool. Rows
+        are streamed in chunks and dispatched straight to the exchange methods, and the pool
+        state is checkpointed to disk every checkpoint_every events so an interrupted replay
+        can resume where it left off
+
+        Log columns (one row per operation, events coded as in EventJournal)
+        -----------------
+        event : int or str
+            0/'swap', 1/'mint', 2/'burn' or 3/'collect'
+        user : str
+            account performing the operation
+        amount0, amount1 : int or float
+            swap: exact input of the token with the positive amount; V2 mint: deposited amounts;
+            V3 collect: requested amounts
+        liquidity : int or float
+            V2 burn: LP tokens removed; V3 mint/burn: position liquidity
+        tick_lower, tick_upper : int
+            V3 mint/burn/collect position bounds
+
+        Parameters
+        -----------------
+        lp : UniswapExchange or UniswapV3Exchange
+            pool the log is replayed against
+        checkpoint_path : str
+            checkpoint file, None to disable checkpointing
+        checkpoint_every : int
+            events between checkpoints
+        chunk_size : int
+            rows read and dispatched at a time
+        skip_errors : bool
+            count operations the pool rejects in n_failed instead of raising; each operation 
+            then runs in an LPTransaction, so a rejected one is rolled back in full rather 
+            than left partially applied
+    """
+
+    def __init__(self, lp, checkpoint_path = None, checkpoint_every = DEFAULT_CHECKPOINT_EVERY,
+                 chunk_size = DEFAULT_CHUNK_SIZE, skip_errors = False):
+        self.lp = lp
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.chunk_size = chunk_size
+        self.skip_errors = skip_errors
+        self.n_applied = 0
+        self.n_failed = 0
+
+    def replay(self, source, resume = False):
+
+        """ replay
+
+            Apply every operation of the log to the pool
+
+            Parameters
+            -----------------
+            source : str, pandas.DataFrame or dict
+                a .csv file, a .npz archive, a directory of per-column .npy files (memory
+                mapped), or in-memory columns
+            resume : bool
+                restore the pool from the last checkpoint and skip the rows it already covers
+
+            Returns
+            -----------------
+            n_applied : int
+                rows consumed from the log in total, including any before the resumed checkpoint
+        """
+
+        start = self.load_checkpoint() if resume else 0
+        self.n_applied = start
+        since_checkpoint = 0
+
+        for chunk in self._read_chunks(source, start):
+            n_rows = len(chunk['event'])
+            pos = 0
+            while pos < n_rows:
+                # split chunks at checkpoint boundaries so the row loop never checks for them
+                stop = n_rows
+                if self.checkpoint_path != None:
+                    stop = min(n_rows, pos + self.checkpoint_every - since_checkpoint)
+                self._dispatch({name: col[pos:stop] for name, col in chunk.items()})
+                since_checkpoint += stop - pos
+                self.n_applied += stop - pos
+                pos = stop
+                if self.checkpoint_path != None and since_checkpoint == self.checkpoint_every:
+                    self.checkpoint()
+                    since_checkpoint = 0
+
+        if self.checkpoint_path != None and since_checkpoint > 0:
+            self.checkpoint()
+
+        return self.n_applied
+
+    def resume(self, source):
+
+        """ resume
+
+            Continue an interrupted replay from the last checkpoint
+
+            Parameters
+            -----------------
+            source : str, pandas.DataFrame or dict
+                same log the interrupted replay was reading
+
+            Returns
+            -----------------
+            n_applied : int
+                rows consumed from the log in total
+        """
+
+        return self.replay(source, resume = True)
+
+    def checkpoint(self):
+
+        """ checkpoint
+
+            Write the pool snapshot and the log position to checkpoint_path; the file is
+            replaced atomically so a crash mid-write leaves the previous checkpoint intact
+        """
+
+        assert self.checkpoint_path != None, 'ReplayEngine: NO_CHECKPOINT_PATH'
+        state = {'n_applied': self.n_applied, 'n_failed': self.n_failed, 'snapshot': self.lp.snapshot()}
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def load_checkpoint(self):
+
+        """ load_checkpoint
+
+            Restore the pool from checkpoint_path
+
+            Returns
+            -----------------
+            n_applied : int
+                log rows covered by the checkpoint, 0 when none has been written yet
+        """
+
+        if self.checkpoint_path == None or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path, 'rb') as f:
+            state = pickle.load(f)
+        self.lp.restore(state['snapshot'])
+        self.n_failed = state['n_failed']
+        return state['n_applied']
+
+    def _read_chunks(self, source, start):
+        if isinstance(source, str) and source.endswith('.csv'):
+            # keep the header row, skip the rows already applied
+            reader = pd.read_csv(source, chunksize = self.chunk_size, skiprows = range(1, start + 1),
+                                 dtype = {'user': str})
+            for df in reader:
+                yield self._columns(df, len(df))
+            return
+
+        if isinstance(source, str) and os.path.isdir(source):
+            source = {os.path.splitext(fname)[0]: np.load(os.path.join(source, fname), mmap_mode = 'r')
+                      for fname in os.listdir(source) if fname.endswith('.npy')}
+        elif isinstance(source, str):
+            with np.load(source) as archive:
+                source = dict(archive)
+        elif isinstance(source, pd.DataFrame):
+            source = {name: source[name].to_numpy() for name in source.columns}
+
+        n_rows = len(source['event'])
+        for pos in range(start, n_rows, self.chunk_size):
+            stop = min(pos + self.chunk_size, n_rows)
+            yield self._columns({name: source[name][pos:stop] for name in COLUMNS if name in source}, stop - pos)
+
+    def _columns(self, cols, n_rows):
+        # tolist() turns NumPy scalars into Python ints/floats, so pool arithmetic never overflows int64
+        chunk = {}
+        for name in COLUMNS:
+            col = cols[name] if name in cols else None
+            chunk[name] = [0]*n_rows if col is None else np.asarray(col).tolist()
+        if n_rows > 0 and isinstance(chunk['event'][0], str):
+            chunk['event'] = [EVENT_CODES[e] for e in chunk['event']]
+        if n_rows > 0 and not isinstance(chunk['user'][0], str):
+            chunk['user'] = [str(u) for u in chunk['user']]
+        return chunk
+
+    def _dispatch(self, chunk):
+        if self.lp.version == UniswapExchangeData.VERSION_V3:
+            self._dispatch_v3(chunk)
+        else:
+            self._dispatch_v2(chunk)
+
+    def _dispatch_v2(self, chunk):
+        lp = self.lp
+        tokens = lp.factory.token_from_exchange[lp.name]
+        (tkn0, tkn1) = (tokens[lp.token0], tokens[lp.token1])
+        rows = zip(chunk['event'], chunk['user'], chunk['amount0'], chunk['amount1'], chunk['liquidity'])
+        if self.skip_errors:
+            for row in rows:
+                self._apply(self._apply_v2, tkn0, tkn1, *row)
+            return
+        # swaps dominate the log, so they are dispatched inline without a call per row
+        swap = lp.swap_exact_tokens_for_tokens
+        for event, user, amount0, amount1, liquidity in rows:
+            if event == EventJournal.EVENT_SWAP:
+                if amount0 > 0:
+                    swap(amount0, 0, tkn0, user)
+                else:
+                    swap(amount1, 0, tkn1, user)
+            else:
+                self._apply_v2(tkn0, tkn1, event, user, amount0, amount1, liquidity)
+
+    def _dispatch_v3(self, chunk):
+        limit0 = UniV3Utils.getSqrtPriceLimitX96(UniV3Utils.TEST_TOKENS[0])
+        limit1 = UniV3Utils.getSqrtPriceLimitX96(UniV3Utils.TEST_TOKENS[1])
+        rows = zip(chunk['event'], chunk['user'], chunk['amount0'], chunk['amount1'], chunk['liquidity'],
+                   chunk['tick_lower'], chunk['tick_upper'])
+        for row in rows:
+            self._apply(self._apply_v3, limit0, limit1, *row)
+
+    def _apply(self, apply_row, *args):
+        if not self.skip_errors:
+            apply_row(*args)
+            return
+        try:
+            ## a row that fails partway through is rolled back as a whole
+            with LPTransaction(self.lp.factory):
+                apply_row(*args)
+        except AssertionError:
+            self.n_failed += 1
+
+    def _apply_v2(self, tkn0, tkn1, event, user, amount0, amount1, liquidity):
+        lp = self.lp
+        if event == EventJournal.EVENT_SWAP:
+            if amount0 > 0:
+                lp.swap_exact_tokens_for_tokens(amount0, 0, tkn0, user)
+            else:
+                lp.swap_exact_tokens_for_tokens(amount1, 0, tkn1, user)
+        elif event == EventJournal.EVENT_MINT:
+            lp.add_liquidity(user, amount0, amount1, 0, 0)
+        elif event == EventJournal.EVENT_BURN:
+            lp.remove_liquidity(user, liquidity, 0, 0)
+
+    def _apply_v3(self, limit0, limit1, event, user, amount0, amount1, liquidity, tick_lower, tick_upper):
+        lp = self.lp
+        if event == EventJournal.EVENT_SWAP:
+            # swap takes machine units, the log is in the pool's precision like mint/burn/collect
+            if amount0 > 0:
+                lp.swap(user, True, lp.convert_to_machine(amount0), limit0)
+            else:
+                lp.swap(user, False, lp.convert_to_machine(amount1), limit1)
+        elif event == EventJournal.EVENT_MINT:
+            lp.mint(user, tick_lower, tick_upper, liquidity)
+        elif event == EventJournal.EVENT_BURN:
+            lp.burn(user, tick_lower, tick_upper, liquidity)
+        elif event == EventJournal.EVENT_COLLECT:
+            lp.collect(user, tick_lower, tick_upper, amount0, amount1)
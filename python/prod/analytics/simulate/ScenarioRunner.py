@@ -0,0 +1,234 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import os
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from ...erc import ERC20
+from ...math.model import BrownianModel
+from ...analytics.simulate import SimpleLPSimulation
+
+WORKER_CRASHED = 'ScenarioRunner: WORKER CRASHED'
+# Keys of the scenario and root seed stored with each result file in results_dir
+SCENARIO_KEY = '__scenario__'
+ENTROPY_KEY = '__entropy__'
+
+class ScenarioRunner:
+
+    """ Runs a sweep of independent scenarios over a ProcessPoolExecutor. Every scenario gets
+        its own RNG stream spawned from one SeedSequence, so results depend on the seed and
+        the scenario's position only, not on the number of workers. Results stream back as
+        dicts of NumPy arrays as they complete; a scenario that raises or kills its worker
+        is recorded in errors without losing the others, and with results_dir each result
+        is written to disk so an interrupted sweep resumes where it stopped
+
+        Parameters
+        -----------------
+        fn : function
+            module level function fn(scenario, rng) returning a dict of arrays or an array;
+            the global np.random is also seeded from the scenario's stream for models that use it
+        max_workers : int
+            number of worker processes, all cores by default
+        seed : int
+            root seed of the sweep, random when None (see seed_seq.entropy)
+        results_dir : str
+            directory keeping one .npz file per finished scenario; a file is reused only 
+            when the scenario and root seed stored in it match the sweep's, otherwise the 
+            scenario is run again
+        retries : int
+            times a scenario whose worker crashed is retried, alone in a fresh worker
+    """
+
+    def __init__(self, fn = None, max_workers = None, seed = None, results_dir = None, retries = 1):
+        self.fn = run_lp_scenario if fn == None else fn
+        self.max_workers = max_workers
+        self.seed_seq = np.random.SeedSequence(seed)
+        self.results_dir = results_dir
+        self.retries = retries
+        self.results = {}
+        self.errors = {}
+        if results_dir != None:
+            os.makedirs(results_dir, exist_ok = True)
+
+    def grid(self, **params):
+
+        """ grid
+
+            Scenarios over every combination of the given parameter values
+
+            Parameters
+            -----------------
+            params : list
+                values of each scenario parameter, e.g. x_amt = [1000, 5000], sigma = [0.2, 0.5]
+
+            Returns
+            -----------------
+            scenarios : list
+                one dict per combination
+        """
+
+        keys = list(params)
+        return [dict(zip(keys, values)) for values in itertools.product(*params.values())]
+
+    def run(self, scenarios):
+
+        """ run
+
+            Run every scenario and wait for all of them
+
+            Parameters
+            -----------------
+            scenarios : list
+                scenario dicts passed to fn
+
+            Returns
+            -----------------
+            results : list
+                result of each scenario in order, None where it failed (see errors)
+        """
+
+        scenarios = list(scenarios)
+        for _ in self.iter_run(scenarios):
+            pass
+        return [self.results.get(k) for k in range(len(scenarios))]
+
+    def iter_run(self, scenarios):
+
+        """ iter_run
+
+            Run every scenario, yielding results as they complete
+
+            Parameters
+            -----------------
+            scenarios : list
+                scenario dicts passed to fn
+
+            Returns
+            -----------------
+            (index, result) : generator
+                position of the scenario and its dict of arrays
+        """
+
+        scenarios = list(scenarios)
+        seeds = self.seed_seq.spawn(len(scenarios))
+        pending = []
+        for k in range(len(scenarios)):
+            if k in self.results or self._load(k, scenarios[k]):
+                yield k, self.results[k]
+            else:
+                pending.append(k)
+
+        crashed = []
+        if pending:
+            with ProcessPoolExecutor(self.max_workers) as executor:
+                futures = {executor.submit(_run_scenario, self.fn, scenarios[k], seeds[k]): k for k in pending}
+                for future in as_completed(futures):
+                    k = futures[future]
+                    if self._collect(k, scenarios[k], future, crashed):
+                        yield k, self.results[k]
+
+        # a crash breaks the whole pool, so the scenarios in flight are retried one per worker
+        for k in crashed:
+            for _ in range(self.retries):
+                with ProcessPoolExecutor(1) as executor:
+                    future = executor.submit(_run_scenario, self.fn, scenarios[k], seeds[k])
+                    retry = []
+                    if self._collect(k, scenarios[k], future, retry):
+                        yield k, self.results[k]
+                if not retry:
+                    break
+
+    def _collect(self, k, scenario, future, crashed):
+        try:
+            result = future.result()
+        except BrokenProcessPool:
+            crashed.append(k)
+            self.errors[k] = WORKER_CRASHED
+            return False
+        except Exception as e:
+            self.errors[k] = e
+            return False
+        self.errors.pop(k, None)
+        self.results[k] = result
+        self._save(k, scenario, result)
+        return True
+
+    def _path(self, k):
+        return os.path.join(self.results_dir, 'scenario_{}.npz'.format(k))
+
+    def _stamp(self, scenario):
+        ## strings, so that neither needs pickling; the root entropy may exceed int64
+        items = sorted(scenario.items()) if isinstance(scenario, dict) else scenario
+        return {SCENARIO_KEY: repr(items), ENTROPY_KEY: str(self.seed_seq.entropy)}
+
+    def _save(self, k, scenario, result):
+        if self.results_dir == None:
+            return
+        tmp_path = self._path(k) + '.tmp.npz'
+        np.savez(tmp_path, **result, **self._stamp(scenario))
+        os.replace(tmp_path, self._path(k))
+
+    def _load(self, k, scenario):
+        if self.results_dir == None or not os.path.exists(self._path(k)):
+            return False
+        with np.load(self._path(k)) as data:
+            # a file left by another sweep in the same directory is not this scenario's result
+            stamp = {key: str(data[key]) for key in (SCENARIO_KEY, ENTROPY_KEY) if key in data.files}
+            if stamp != self._stamp(scenario):
+                return False
+            self.results[k] = {key: data[key] for key in data.files if key not in stamp}
+        return True
+
+
+def _run_scenario(fn, scenario, seed):
+    np.random.seed(seed.generate_state(1)[0])
+    result = fn(scenario, np.random.default_rng(seed))
+    if isinstance(result, dict):
+        return {key: np.asarray(val) for key, val in result.items()}
+    return {'result': np.asarray(result)}
+
+
+def run_lp_scenario(scenario, rng):
+
+    """ run_lp_scenario
+
+        Default scenario of ScenarioRunner: SimpleLPSimulation over a GBM price path
+
+        Parameters
+        -----------------
+        scenario : dict
+            x_amt (1000), init_price (100), mu (0.1), sigma (0.5), n_step (100)
+        rng : Generator
+            scenario's RNG stream; BrownianModel draws from the seeded global np.random
+
+        Returns
+        -----------------
+        result : dict
+            price, x_amt and y_amt arrays of the pool at each step
+    """
+
+    init_price = scenario.get('init_price', 100)
+    p_arr = BrownianModel(init_price).gen_gbm(scenario.get('mu', 0.1), scenario.get('sigma', 0.5),
+                                              scenario.get('n_step', 100))
+    sim = SimpleLPSimulation()
+    sim.init_amts(scenario.get('x_amt', 1000), init_price)
+    sim.create_lp(ERC20("TKN", "0x111"), ERC20("DAI", "0x09"))
+    sim.run(p_arr)
+    return {'price': sim.get_tkn_price_sim(), 'x_amt': sim.get_x_amt_sim(), 'y_amt': sim.get_y_amt_sim()}
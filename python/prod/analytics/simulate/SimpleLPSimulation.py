@@ -16,9 +16,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License
 
+import itertools
 from ...utils.data import UniswapExchangeData
 from ...cpt.factory import UniswapFactory
-from ...analytics.simulate import SolveDeltas
+from ...analytics.simulate import SolveDeltasAnalytic
 from ...process.deposit import SwapDeposit
 from ...process.swap import WithdrawSwap
 
@@ -48,15 +49,32 @@ class SimpleLPSimulation:
         self.lp = factory.deploy(exchg_data)
         self.lp.add_liquidity(USER_NM, self.tkn_x_amt, self.tkn_y_amt, self.tkn_x_amt, self.tkn_y_amt)
 
-    def run(self, p_trial_arr):
-        sDel = SolveDeltas(self.lp)
+    def run(self, p_trial_arr, record = True):
+        
+        """ run
+
+            Correct the pool reserves to each price of a path; any iterable of prices works. 
+            A streamed path is column j of every BrownianModel.stream_gbms block in turn, 
+            chained as itertools.chain.from_iterable(block[:, j] for block in stream), which 
+            keeps long horizons in constant memory with record = False; a column of a single 
+            block only covers that block's steps
+                
+            Parameters
+            -----------------
+            p_trial_arr : iterable
+                price path, starting with the initial price
+            record : bool
+                append price and reserves of every step to the simulation arrays
+        """
+        
+        sDel = SolveDeltasAnalytic(self.lp)
         tkn_x = self.lp.factory.token_from_exchange[self.lp.name][self.lp.token0]
         tkn_y = self.lp.factory.token_from_exchange[self.lp.name][self.lp.token1]
         tkn_price_arr = []
         lp_tot_arr = []
         x_amt_arr = []
         y_amt_arr = []
-        for p in p_trial_arr[1:]: 
+        for p in itertools.islice(p_trial_arr, 1, None): 
             
             swap_dx, swap_dy = sDel.calc(p)   
             if(swap_dx >= 0):
@@ -69,7 +87,9 @@ class SimpleLPSimulation:
             # ************************* #
             # do advanced lp stuff here
             # ************************* #
-                
+            
+            if not record:
+                continue
             self.tkn_price_arr.append(self.lp.get_price(tkn_x))    
             self.x_amt_arr.append(self.lp.get_reserve(tkn_x))  
             self.y_amt_arr.append(self.lp.get_reserve(tkn_y))  
@@ -0,0 +1,203 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import bisect
+import numpy as np
+from ...utils.data import UniswapExchangeData
+
+Q96 = 2**96
+
+class SolveDeltasAnalytic():
+
+    """ Closed-form alternative to SolveDeltas and SolveDeltasRobust, with no fsolve.
+
+        Substituting dy = p dx into the SolveDeltas system leaves a linear equation, so the
+        reserve correction to price p is |dx| = |p x - y| / 2p and |dy| = p |dx|; calc()
+        returns it with the SolveDeltas sign convention, for V3 on virtual reserves as before.
+        calc_swap() instead gives the single fee-paying swap that moves the pool price to p,
+        walking the tick ranges for V3. Target prices can be NumPy arrays, and calc_path()
+        pre-solves the corrections along a whole price path
+
+        Parameters
+        -----------------
+        lp : UniswapExchange or UniswapV3Exchange
+            pool to rebalance
+    """
+
+    def __init__(self, lp):
+        self.lp = lp
+        self.tkn_x = lp.factory.token_from_exchange[lp.name][lp.token0]
+        self.tkn_y = lp.factory.token_from_exchange[lp.name][lp.token1]
+        self.x = self._get_reserve(self.tkn_x)
+        self.y = self._get_reserve(self.tkn_y)
+        self.p = lp.get_price(self.tkn_x)
+        self.p_prev = lp.get_price(self.tkn_x)
+        self.dp = 0
+
+    def get_lp(self):
+        return self.lp
+
+    def calc(self, p, x0 = None, fac = None):
+
+        """ calc
+
+            Reserve correction (dx, dy) that moves the pool to price p; drop-in for
+            SolveDeltas.calc, which solves the same system numerically
+
+            Parameters
+            -----------------
+            p : float or array
+                target price of token0 in token1
+            x0 : float
+                unused, kept for signature compatibility with SolveDeltas
+            fac : float
+                unused, kept for signature compatibility with SolveDeltas
+
+            Returns
+            -----------------
+            dx, dy : float or array
+                signed reserve changes; (-u, +v) when the price rises, (+u, -v) when it falls
+        """
+
+        self._refresh(p)
+        p_arr = np.asarray(p, dtype = float)
+        u = np.abs(p_arr*self.x - self.y)/(2*p_arr)
+        up = p_arr >= self.p_prev
+        self.p_prev = p
+        return self._result(p, np.where(up, -u, u), np.where(up, p_arr*u, -p_arr*u))
+
+    def calc_path(self, p_arr):
+
+        """ calc_path
+
+            Corrections along a price path, each step applied to the reserves left by the
+            previous one. A correction leaves x' = (p x + y) / 2p and y' = p x', so the
+            reserves follow a cumulative product and the path is solved without a loop
+
+            Parameters
+            -----------------
+            p_arr : array
+                target price of token0 in token1 at each step
+
+            Returns
+            -----------------
+            dx, dy : array
+                signed reserve changes at each step
+        """
+
+        self._refresh(p_arr)
+        p_arr = np.asarray(p_arr, dtype = float)
+        p_before = np.concatenate(([self.y/self.x], p_arr[:-1]))
+        x_after = self.x*np.cumprod((p_arr + p_before)/(2*p_arr))
+        y_after = p_arr*x_after
+        dx = np.diff(x_after, prepend = self.x)
+        dy = np.diff(y_after, prepend = self.y)
+        return dx, dy
+
+    def calc_swap(self, p):
+
+        """ calc_swap
+
+            Single swap, including the pool fee, that moves the pool price to p. V2 solves
+            the constant product with the 0.3% fee in closed form; V3 walks the initialized
+            tick ranges, with the liquidity of each range, from the current sqrt price to sqrt(p)
+
+            Parameters
+            -----------------
+            p : float or array
+                target price of token0 in token1
+
+            Returns
+            -----------------
+            dx, dy : float or array
+                signed changes of the pool balances; the input side includes the fee
+        """
+
+        self._refresh(p)
+        p_arr = np.asarray(p, dtype = float)
+        if(self.lp.version == UniswapExchangeData.VERSION_V3):
+            (dx, dy) = self._swap_v3(p_arr)
+        else:
+            (dx, dy) = self._swap_v2(p_arr)
+        return self._result(p, dx, dy)
+
+    def _swap_v2(self, p):
+        # input dr with price r1'/r0' = p after the swap is the positive root of
+        # 997 dr^2 + 1997 r_in dr + 1000 r_in^2 - 1000 x y (1/p or p) = 0, in its stable form
+        (x, y) = (self.x, self.y)
+        up = p >= self.p_prev
+        r_in = np.where(up, y, x)
+        b = 1997*r_in
+        c = 1000*r_in**2 - 1000*x*y*np.where(up, p, 1/p)
+        d_in = np.maximum(-2*c/(b + np.sqrt(b**2 - 4*997*c)), 0)
+        out_x = x - (y + d_in)/p
+        out_y = y - p*(x + d_in)
+        return np.where(up, -out_x, d_in), np.where(up, d_in, -out_y)
+
+    def _swap_v3(self, p):
+        lp = self.lp
+        gamma = 1 - lp.fee/1e6
+        s0 = lp.slot0.sqrtPriceX96/Q96
+        s = np.sqrt(p)
+        ticks = lp.get_initialized_ticks()
+        i = bisect.bisect_right(ticks, lp.slot0.tick)
+        # the pool's swap loop starts from the gross liquidity and adds (removes) liquidityNet
+        # at each tick crossed upward (downward)
+        L0 = lp.convert_to_human(lp.total_supply)
+        (in1, out0) = self._walk(s0, s, L0, ticks[i:], 1)
+        (in0, out1) = self._walk(s0, s, L0, ticks[:i][::-1], -1)
+        up = s >= s0
+        dx = np.where(up, -out0, in0/gamma)
+        dy = np.where(up, in1/gamma, -out1)
+        return dx, dy
+
+    def _walk(self, s0, s, L0, ticks, direction):
+        # per range [b_k, b_k+1]: liquidity L_k, token amounts L |db| and L |d(1/b)|
+        lp = self.lp
+        b = np.array([s0] + [lp.sqrt_ratio_cache.getSqrtRatioAtTick(t)/Q96 for t in ticks])
+        net = [direction*lp.convert_to_human(lp.ticks.peek(t).liquidityNet) for t in ticks]
+        L = L0 + np.cumsum([0.0] + net)
+        amt_p = np.concatenate(([0.0], np.cumsum(L[:-1]*np.abs(np.diff(b)))))
+        amt_inv = np.concatenate(([0.0], np.cumsum(L[:-1]*np.abs(np.diff(1/b)))))
+        if(direction > 0):
+            k = np.clip(np.searchsorted(b, s, side = 'right') - 1, 0, len(b) - 1)
+        else:
+            k = np.clip(np.searchsorted(-b, -s, side = 'right') - 1, 0, len(b) - 1)
+        d_p = amt_p[k] + L[k]*np.abs(s - b[k])
+        d_inv = amt_inv[k] + L[k]*np.abs(1/s - 1/b[k])
+        # upward the sqrt price side is paid in (token1); downward the inverse side (token0)
+        return (d_p, d_inv) if direction > 0 else (d_inv, d_p)
+
+    def _refresh(self, p):
+        self.p = p
+        self.p_prev = self.lp.get_price(self.tkn_x)
+        self.dp = p - self.p_prev
+        self.x = self._get_reserve(self.tkn_x)
+        self.y = self._get_reserve(self.tkn_y)
+
+    def _result(self, p, dx, dy):
+        if np.ndim(p) == 0:
+            return float(dx), float(dy)
+        return dx, dy
+
+    def _get_reserve(self, tkn):
+
+        if(self.lp.version == UniswapExchangeData.VERSION_V2):
+            return float(self.lp.get_reserve(tkn))
+        elif(self.lp.version == UniswapExchangeData.VERSION_V3):
+            return float(self.lp.get_virtual_reserve(tkn))
@@ -0,0 +1,194 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import numpy as np
+import pandas as pd
+
+CHUNK = 1024
+
+class StateHistory():
+
+    """ State history of MarkovState and TokenSupplyState: a preallocated state matrix,
+        grown by doubling from chunk rows, with the step deltas of every column but the
+        first kept alongside, so appending a state (amortized) and reading the current one
+        are O(1). Row 0 is the initial zero state, and the first state after it has zero
+        deltas as in get_state_df
+
+        Parameters
+        -----------------
+        columns : list
+            state column names, e.g. ['Mint', 'Held', 'Vault', 'Burned']
+        chunk : int
+            initial number of rows
+    """
+
+    def __init__(self, columns, chunk = CHUNK):
+        self.columns = list(columns)
+        self.delta_columns = ['d' + col for col in self.columns[1:]]
+        self.__chunk = chunk
+        self.__states = np.zeros((chunk, len(self.columns)))
+        self.__deltas = np.zeros((chunk, len(self.columns) - 1))
+        self.__n = 1
+
+    def __len__(self):
+        return self.__n
+
+    def get_states(self):
+        return self.__states[:self.__n]
+
+    def append(self, state):
+
+        """ append
+
+            Add the next state
+
+            Parameters
+            -----------------
+            state : array
+                state row
+        """
+
+        self.extend(np.reshape(state, (1, -1)))
+
+    def extend(self, states):
+
+        """ extend
+
+            Add the next states at once
+
+            Parameters
+            -----------------
+            states : array
+                (N x columns) state rows
+        """
+
+        n_new = len(states)
+        self._reserve(n_new)
+        (n0, n1) = (self.__n, self.__n + n_new)
+        self.__states[n0:n1] = states
+        self.__deltas[n0:n1] = self.__states[n0:n1, 1:] - self.__states[n0 - 1:n1 - 1, 1:]
+        if n0 == 1:
+            self.__deltas[1] = 0
+        self.__n = n1
+
+    def add(self, col, amt):
+
+        """ add
+
+            Add an amount to one column of the current state
+
+            Parameters
+            -----------------
+            col : str
+                state column name
+            amt : float
+                amount added
+        """
+
+        k = self.columns.index(col)
+        self.__states[self.__n - 1, k] += amt
+        if k > 0 and self.__n > 2:
+            self.__deltas[self.__n - 1, k - 1] += amt
+
+    def get_current(self, colnm = None):
+
+        """ get_current
+
+            Current state
+
+            Parameters
+            -----------------
+            colnm : str
+                state or delta column name; all of them when None
+
+            Returns
+            -----------------
+            state : float or pd.Series
+                value of the column, or the state and its deltas
+        """
+
+        if colnm == None:
+            return pd.Series(np.concatenate((self.__states[self.__n - 1], self.__deltas[self.__n - 1])),
+                             index = self.columns + self.delta_columns, name = self.__n - 2)
+        elif colnm in self.columns:
+            return self.__states[self.__n - 1, self.columns.index(colnm)]
+        return self.__deltas[self.__n - 1, self.delta_columns.index(colnm)]
+
+    def get_df(self):
+
+        """ get_df
+
+            States after the initial one, with their delta columns
+
+            Returns
+            -----------------
+            df_states : pd.DataFrame
+                one row per state
+        """
+
+        df_states = pd.DataFrame(self.__states[1:self.__n].copy(), columns = self.columns)
+        for k, col in enumerate(self.delta_columns):
+            df_states[col] = self.__deltas[1:self.__n, k]
+        return df_states
+
+    def propagate(self, state, P, added):
+
+        """ propagate
+
+            Step a state through N affine transitions s -> s P_k + added_k and
+            append the N states. The transitions compose as augmented matrices, so their
+            prefix products come from log2(N) batched matmuls instead of N dependent steps
+
+            Parameters
+            -----------------
+            state : array
+                state the transitions start from
+            P : array
+                (N x columns x columns) transition matrices
+            added : array
+                (N x columns) amounts added after each transition
+        """
+
+        n_steps = len(P)
+        if n_steps == 0:
+            return
+        width = len(self.columns)
+        A = np.zeros((n_steps, width + 1, width + 1))
+        A[:, :width, :width] = P
+        A[:, width, :width] = added
+        A[:, width, width] = 1
+        # inclusive scan: A_0 A_1 ... A_k for every k
+        d = 1
+        while d < n_steps:
+            A[d:] = np.matmul(A[:-d], A[d:])
+            d *= 2
+        s0 = np.append(state, 1)
+        self.extend(np.matmul(s0, A)[:, :width])
+
+    def _reserve(self, n_new):
+        if self.__n + n_new <= len(self.__states):
+            return
+        # doubling keeps the copies amortized O(1) per state
+        n_rows = len(self.__states) + max(len(self.__states), n_new, self.__chunk)
+        self.__states = self._grow(self.__states, n_rows)
+        self.__deltas = self._grow(self.__deltas, n_rows)
+
+    def _grow(self, arr, n_rows):
+        grown = np.zeros((n_rows, arr.shape[1]))
+        grown[:self.__n] = arr[:self.__n]
+        return grown
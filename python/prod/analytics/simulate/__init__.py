@@ -1,8 +1,14 @@
 from .SolveDeltas import SolveDeltas
 from .SolveDeltasRobust import SolveDeltasRobust
+from .SolveDeltasAnalytic import SolveDeltasAnalytic
 from .SimpleLPSimulation import SimpleLPSimulation
+from .StateHistory import StateHistory
+from .MonteCarloLPSimulation import MonteCarloLPSimulation
 from .MarkovState import MarkovState
 from .Arbitrage import Arbitrage
 from .CorrectReserves import CorrectReserves
 from .QuantTerminal import QuantTerminal
 from .TokenSupplyState import TokenSupplyState
+from .ReplayEngine import ReplayEngine
+from .CyclicArbitrage import CyclicArbitrage
+from .ScenarioRunner import ScenarioRunner
@@ -21,12 +21,16 @@ from ..exchg import UniswapExchange
 from ..quote import LPQuote
 from ...utils.data import UniswapExchangeData
 from ...utils.data import FactoryData
+from ...utils.tools import EventJournal
+from ...utils.tools import UndoLog
 import math
 
 MINIMUM_LIQUIDITY = 1e-15
 
 class ChildUniswapExchange(UniswapExchange):
     
+    _snapshot_attrs = UniswapExchange._snapshot_attrs + ('hybrid_supply',)
+    _snapshot_maps = UniswapExchange._snapshot_maps + ('hybrid_liquidity_providers',)
     
     def __init__(self, factory_struct: FactoryData, exchg_struct: UniswapExchangeData) -> None:
         super().__init__(factory_struct, exchg_struct)
@@ -132,6 +136,7 @@ class ChildUniswapExchange(UniswapExchange):
         self._update(balance0, balance1)
         self._mint(to, liquidity)  
         self._mint_hybrid(to, hybrid_liquidity)
+        self._record_event(EventJournal.EVENT_MINT, to, amount0, amount1, liquidity)
         
     def _calc_liquidity(self, amount0, amount1, liq_type):
 
@@ -192,6 +197,11 @@ class ChildUniswapExchange(UniswapExchange):
                 amount of new liquidity                  
         """          
         
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self, 'hybrid_supply')
+            log.record_item(self.hybrid_liquidity_providers, to)
+
         if self.hybrid_liquidity_providers.get(to):
             self.hybrid_liquidity_providers[to] += value
         else:
@@ -213,6 +223,11 @@ class ChildUniswapExchange(UniswapExchange):
                 amount of liquidity to be burned                           
         """            
         
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self, 'hybrid_supply')
+            log.record_item(self.hybrid_liquidity_providers, to)
+
         available_liquidity = self.hybrid_liquidity_providers.get(to)
         self.hybrid_liquidity_providers[to] = available_liquidity - value
         self.hybrid_supply -= value          
\ No newline at end of file
@@ -20,9 +20,16 @@ from ...erc import LPERC20
 from ...utils.interfaces import IExchange 
 from ...utils.data import UniswapExchangeData
 from ...utils.data import FactoryData
+from ...utils.data import PoolSnapshot
 from ...utils.tools.v3 import UniV3Helper
 from ...utils.tools import SaferMath
+from ...utils.tools import IntMath
+from ...utils.tools import FeeLedger
+from ...utils.tools import EventJournal
+from ...utils.tools import UndoLog
+import copy
 import math
+import numpy as np
 
 
 #MINIMUM_LIQUIDITY = 1e-15
@@ -40,6 +47,12 @@ class UniswapExchange(IExchange, LPERC20):
         exchg_struct : UniswapExchangeInit
             Exchange initialization data           
     """          
+
+    # State captured by snapshot(): plain values, and provider maps copied as dicts
+    _snapshot_attrs = ('reserve0', 'reserve1', 'total_supply', 'token_total', 'last_liquidity_deposit',
+                       'aggr_fee0', 'aggr_fee1', 'collected_fee0', 'collected_fee1')
+    _snapshot_maps = ('liquidity_providers',)
+
     def __init__(self, factory_struct: FactoryData, exchg_struct: UniswapExchangeData):
         super().__init__(exchg_struct.tkn0.token_name+exchg_struct.tkn1.token_name, exchg_struct.address)
         self.version = exchg_struct.version
@@ -49,8 +62,9 @@ class UniswapExchange(IExchange, LPERC20):
         self.token1 = exchg_struct.tkn1.token_name       
         self.reserve0 = 0             
         self.reserve1 = 0       
-        self.fee0_arr = []
-        self.fee1_arr = []
+        self.fee_ledger = FeeLedger(exchg_struct.fee_ledger, exchg_struct.fee_ledger_size, 
+                                    exchg_struct.fee_ledger_spill_dir, exchg_struct.fee_ledger_dtype)
+        self.journal = EventJournal() if exchg_struct.journal else None
         self.aggr_fee0 = 0
         self.aggr_fee1 = 0
         self.collected_fee0 = 0
@@ -60,6 +74,8 @@ class UniswapExchange(IExchange, LPERC20):
         self.liquidity_providers = {}
         self.last_liquidity_deposit = 0
         self.total_supply = 0
+        # GWEI amounts are plain ints, so their arithmetic can skip SaferMath's Decimal round-trips
+        self.math = IntMath() if self.precision == UniswapExchangeData.TYPE_GWEI else SaferMath()
 
     def summary(self):
 
@@ -186,8 +202,8 @@ class UniswapExchange(IExchange, LPERC20):
         if liquidity >= total_liquidity:
             liquidity = total_liquidity
 
-        amountA = SaferMath().mul_div_round(liquidity, balanceA, self.total_supply)
-        amountB = SaferMath().mul_div_round(liquidity, balanceB, self.total_supply)
+        amountA = self.math.mul_div_round(liquidity, balanceA, self.total_supply)
+        amountB = self.math.mul_div_round(liquidity, balanceB, self.total_supply)
         
         return amountA, amountB    
     
@@ -229,8 +245,8 @@ class UniswapExchange(IExchange, LPERC20):
         if liquidity >= total_liquidity:
             liquidity = total_liquidity
 
-        amountA = SaferMath().mul_div_round(liquidity, balanceA, self.total_supply)
-        amountB = SaferMath().mul_div_round(liquidity, balanceB, self.total_supply)
+        amountA = self.math.mul_div_round(liquidity, balanceA, self.total_supply)
+        amountB = self.math.mul_div_round(liquidity, balanceB, self.total_supply)
 
         assert (round(int(amountA),-20) >= round(int(amountAMin),-20)), 'AMOUNTA {} AMOUNT_A_MIN {}'.format(round(amountA,5), round(amountAMin,5))
         assert amountA > 0 and amountB > 0, 'UniswapV2: INSUFFICIENT_LIQUIDITY_BURNED'
@@ -308,6 +324,7 @@ class UniswapExchange(IExchange, LPERC20):
         balanceB = tokens.get(self.token1).token_total
 
         self._update(balanceA, balanceB)
+        self._record_event(EventJournal.EVENT_BURN, to_addr, -amountA, -amountB, liquidity)
 
     def _burn(self, to_addr, value):
         
@@ -323,6 +340,11 @@ class UniswapExchange(IExchange, LPERC20):
                 amount of liquidity to be burned                           
         """            
         
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self, 'total_supply')
+            log.record_item(self.liquidity_providers, to_addr)
+
         available_liquidity = self.liquidity_providers.get(to_addr)
         self.liquidity_providers[to_addr] = available_liquidity - value
         self.total_supply -= value
@@ -358,8 +380,8 @@ class UniswapExchange(IExchange, LPERC20):
 
         if self.total_supply != 0:
             liquidity = min(
-                SaferMath().mul_div_round(amountA, self.total_supply, self.reserve0),
-                SaferMath().mul_div_round(amountB, self.total_supply, self.reserve1)
+                self.math.mul_div_round(amountA, self.total_supply, self.reserve0),
+                self.math.mul_div_round(amountB, self.total_supply, self.reserve1)
             )
         else:
             liquidity = math.isqrt(amountA * amountB) - MINIMUM_LIQUIDITY
@@ -369,6 +391,7 @@ class UniswapExchange(IExchange, LPERC20):
         
         self._update(balanceA, balanceB)
         self._mint(to_addr, liquidity)
+        self._record_event(EventJournal.EVENT_MINT, to_addr, amountA, amountB, liquidity)
 
     def _update(self, balanceA, balanceB):
         
@@ -384,6 +407,9 @@ class UniswapExchange(IExchange, LPERC20):
                 new reserve amount of B                   
         """         
         
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self, 'reserve0', 'reserve1')
         self.reserve0 = int(balanceA)  
         self.reserve1 = int(balanceB)
 
@@ -401,6 +427,11 @@ class UniswapExchange(IExchange, LPERC20):
                 amount of new liquidity                  
         """          
         
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self, 'last_liquidity_deposit', 'total_supply')
+            log.record_item(self.liquidity_providers, to_addr)
+
         if self.liquidity_providers.get(to_addr):
             self.liquidity_providers[to_addr] += value
         else:
@@ -409,6 +440,30 @@ class UniswapExchange(IExchange, LPERC20):
         self.last_liquidity_deposit = value     
         self.total_supply += value
         
+    @property
+    def fee0_arr(self):
+        
+        """ fee0_arr
+
+            Retained per-swap fees from reserve0, oldest first (see fee_ledger); the array is 
+            built from the whole history on each access, fee_ledger.last() and 
+            fee_ledger.count are the O(1) reads               
+        """ 
+        
+        return self.fee_ledger.history()[:, 0]
+
+    @property
+    def fee1_arr(self):
+        
+        """ fee1_arr
+
+            Retained per-swap fees from reserve1, oldest first (see fee_ledger); the array is 
+            built from the whole history on each access, fee_ledger.last() and 
+            fee_ledger.count are the O(1) reads               
+        """ 
+        
+        return self.fee_ledger.history()[:, 1]
+
     def _tally_fees(self, fee0, fee1):
         
         """ _tally_fees
@@ -422,8 +477,11 @@ class UniswapExchange(IExchange, LPERC20):
             fee1 : float
                 fee from reserve1                 
         """         
-        self.fee0_arr.append(fee0)
-        self.fee1_arr.append(fee1)
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self, 'collected_fee0', 'collected_fee1', 'aggr_fee0', 'aggr_fee1')
+            self.fee_ledger.record_undo(log)
+        self.fee_ledger.append(fee0, fee1)
         self.collected_fee0 += fee0 
         self.collected_fee1 += fee1        
         self.aggr_fee0 += fee0 
@@ -449,31 +507,26 @@ class UniswapExchange(IExchange, LPERC20):
         assert amountA_out < self.reserve0 and amountB_out < self.reserve1, 'UniswapV2: INSUFFICIENT_LIQUIDITY'
 
         tokens = self.factory.token_from_exchange[self.name]
-        assert tokens.get(self.token0).token_addr != to_addr, 'UniswapV2: INVALID_TO_ADDRESS'
-        assert tokens.get(self.token1).token_addr != to_addr, 'UniswapV2: INVALID_TO_ADDRESS'
+        tokenA = tokens.get(self.token0)
+        tokenB = tokens.get(self.token1)
+        assert tokenA.token_addr != to_addr, 'UniswapV2: INVALID_TO_ADDRESS'
+        assert tokenB.token_addr != to_addr, 'UniswapV2: INVALID_TO_ADDRESS'
 
-        tokens.get(self.token0).transfer(to_addr, amountA_out)
-        tokens.get(self.token1).transfer(to_addr, amountB_out)    
+        tokenA.transfer(to_addr, amountA_out)
+        tokenB.transfer(to_addr, amountB_out)    
         
-        balanceA = tokens.get(self.token0).token_total
-        balanceB = tokens.get(self.token1).token_total
+        balanceA = tokenA.token_total
+        balanceB = tokenB.token_total
 
         amountA_in = balanceA - (self.reserve0 - amountA_out) if balanceA > self.reserve0 - amountA_out else 0
         amountB_in = balanceB - (self.reserve1 - amountB_out) if balanceB > self.reserve1 - amountB_out else 0
         assert amountA_in > 0 or amountB_in > 0, 'UniswapV2: INSUFFICIENT_INPUT_AMOUNT'
 
-        balanceA_adjusted = balanceA * 1000 - amountA_in * 3  
-        balanceB_adjusted = balanceB * 1000 - amountB_in * 3  
- 
-        adj_digits = max(len(str(balanceA_adjusted * balanceB_adjusted))-11, 1)
-        lside = round(math.ceil(balanceA_adjusted * balanceB_adjusted), -adj_digits)
-        rside = round(math.ceil(self.reserve0 * self.reserve1 * 1000**2), -adj_digits)
-
-        # ******** FIX ********
-        #assert  lside  ==  rside , 'UniswapV2: K'
-    
         self._update(balanceA, balanceB)
-        self._tally_fees(SaferMath().mul_div_round(amountA_in, 3, 1000), SaferMath().mul_div_round(amountB_in, 3, 1000))             
+        fee0 = self.math.mul_div_round(amountA_in, 3, 1000)
+        fee1 = self.math.mul_div_round(amountB_in, 3, 1000)
+        self._tally_fees(fee0, fee1)
+        self._record_event(EventJournal.EVENT_SWAP, to_addr, amountA_in - amountA_out, amountB_in - amountB_out, 0, fee0, fee1)
  
     def quote(self, amountA, reserveA, reserveB):
         
@@ -497,7 +550,7 @@ class UniswapExchange(IExchange, LPERC20):
         
         assert amountA > 0, 'UniswapV2Library: INSUFFICIENT_AMOUNT'
         assert reserveA > 0 and reserveB > 0, 'UniswapV2Library: INSUFFICIENT_LIQUIDITY'
-        quote_out = SaferMath().mul_div_round(amountA, reserveB, reserveA)   
+        quote_out = self.math.mul_div_round(amountA, reserveB, reserveA)   
         
         return self.convert_to_human(quote_out)
 
@@ -550,7 +603,7 @@ class UniswapExchange(IExchange, LPERC20):
         assert self.reserve0 > 0 and self.reserve1 > 0, 'UniswapV2Library: INSUFFICIENT_LIQUIDITY'
 
         amount_in_with_fee = amount_in * 997  
-        amount_out =  SaferMath().div_round(amount_in * 997  * self.reserve1, self.reserve0 * 1000 + amount_in_with_fee)
+        amount_out =  self.math.div_round(amount_in * 997  * self.reserve1, self.reserve0 * 1000 + amount_in_with_fee)
 
         return self.convert_to_human(amount_out) 
     
@@ -577,10 +630,53 @@ class UniswapExchange(IExchange, LPERC20):
         assert self.reserve0 > 0 and self.reserve1 > 0, 'UniswapV2Library: INSUFFICIENT_LIQUIDITY'
 
         amount_in_with_fee = amount_in * 997    
-        amount_out = SaferMath().div_round(amount_in_with_fee * self.reserve0, self.reserve1 * 1000 + amount_in_with_fee)
+        amount_out = self.math.div_round(amount_in_with_fee * self.reserve0, self.reserve1 * 1000 + amount_in_with_fee)
 
         return self.convert_to_human(amount_out)  
 
+    def get_amounts_out(self, amounts_in, token_in):
+        
+        """ get_amounts_out
+
+            Vectorized get_amount_out over an array of input amounts of token
+                
+            Parameters
+            -----------------
+            amounts_in : array_like
+                input amounts of an asset
+            token_in : ERC20
+                asset token  
+                          
+            Returns
+            -------
+            amounts out : numpy.ndarray
+                amounts of opposing asset; exact integers (object dtype) for GWEI pools, 
+                float64 for DEC pools                     
+        """        
+
+        if(token_in.token_name == self.token0):    
+            (reserve_in, reserve_out) = (self.reserve0, self.reserve1)
+        elif(token_in.token_name == self.token1):
+            (reserve_in, reserve_out) = (self.reserve1, self.reserve0)
+        else:
+            assert False, 'UniswapV2: WRONG_INPUT_TOKEN'
+        
+        assert reserve_in > 0 and reserve_out > 0, 'UniswapV2Library: INSUFFICIENT_LIQUIDITY'
+
+        if self.precision == UniswapExchangeData.TYPE_GWEI:
+            # Python ints in an object array, so the ceiling division matches div_round exactly
+            amounts_in = np.array([int(amount) for amount in np.ravel(amounts_in)], dtype = object)
+            assert (amounts_in > 0).all(), 'UniswapV2Library: INSUFFICIENT_INPUT_AMOUNT'
+            amount_in_with_fee = amounts_in * 997
+            return -(-(amount_in_with_fee * reserve_out) // (reserve_in * 1000 + amount_in_with_fee))
+        
+        amounts_in = np.asarray(amounts_in, dtype = float)
+        assert (amounts_in > 0).all(), 'UniswapV2Library: INSUFFICIENT_INPUT_AMOUNT'
+        reserve_in = self.convert_to_human(reserve_in)
+        reserve_out = self.convert_to_human(reserve_out)
+        amount_in_with_fee = amounts_in * 997
+        return amount_in_with_fee * reserve_out / (reserve_in * 1000 + amount_in_with_fee)
+
     def update_reserves(self, user_nm, amountA_update = None, amountB_update = None):
         
         """ update_reserves
@@ -705,6 +801,88 @@ class UniswapExchange(IExchange, LPERC20):
         else:
             assert False, 'UniswapV2: WRONG_INPUT_TOKEN'  
 
+    def snapshot(self):
+        
+        """ snapshot
+
+            Capture the mutable state of the pool (reserves, supply, provider map, fee ledger 
+            and the pair token totals) so that it can be restored later
+                          
+            Returns
+            -------
+            snap : PoolSnapshot
+                Captured pool state                       
+        """  
+
+        state = {attr: getattr(self, attr) for attr in self._snapshot_attrs}
+        state.update({attr: getattr(self, attr).copy() for attr in self._snapshot_maps})
+        state['fee_ledger'] = self.fee_ledger.copy()
+        tokens = self.factory.token_from_exchange[self.name]
+        token_totals = {tkn_nm: tkn.token_total for tkn_nm, tkn in tokens.items()}
+        return PoolSnapshot(self.name, state, token_totals)
+
+    def restore(self, snap):
+        
+        """ restore
+
+            Restore the pool to a state captured by snapshot(); the snapshot is left intact and 
+            can be restored again
+                
+            Parameters
+            -----------------
+            snap : PoolSnapshot
+                Pool state captured by snapshot()                    
+        """ 
+
+        assert snap.pool_name == self.name, 'UniswapV2: WRONG_SNAPSHOT'
+        tokens = self.factory.token_from_exchange[self.name]
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self, *self._snapshot_attrs, *self._snapshot_maps, 'fee_ledger')
+            for tkn_nm in snap.token_totals:
+                log.record_token(tokens[tkn_nm])
+        for attr in self._snapshot_attrs:
+            setattr(self, attr, snap.state[attr])
+        for attr in self._snapshot_maps:
+            setattr(self, attr, snap.state[attr].copy())
+        self.fee_ledger = snap.state['fee_ledger'].copy()
+        for tkn_nm, token_total in snap.token_totals.items():
+            tokens[tkn_nm].token_total = token_total
+
+    def fork(self):
+        
+        """ fork
+
+            Branch an independent copy of the pool for what-if simulation; the fork holds its own 
+            copies of the pair tokens, so trading on it leaves this pool and the factory untouched
+                          
+            Returns
+            -------
+            forked : UniswapExchange
+                Independent copy of the pool                       
+        """  
+
+        forked = copy.copy(self)
+        tokens = self.factory.token_from_exchange[self.name]
+        forked.factory = FactoryData({self.name: {tkn_nm: copy.copy(tkn) for tkn_nm, tkn in tokens.items()}},
+                                     self.factory.parent_lp, self.factory.name, self.factory.address)
+        forked.restore(self.snapshot())
+        ## the fork keeps its own journal, starting at the current step
+        if self.journal != None:
+            forked.journal = EventJournal(self.journal.chunk_size)
+            forked.journal.step = self.journal.step
+        return forked
+
+    def _record_event(self, event, user, amount0, amount1, liquidity, fee0 = 0, fee1 = 0):
+        if self.journal != None:
+            log = UndoLog.active
+            if log != None and log.covers(self.factory):
+                self.journal.record_undo(log)
+            self.journal.record(event, user, self.convert_to_human(amount0), self.convert_to_human(amount1),
+                                self.convert_to_human(liquidity), self.convert_to_human(self.reserve0), 
+                                self.convert_to_human(self.reserve1), 
+                                fee0 = self.convert_to_human(fee0), fee1 = self.convert_to_human(fee1))
+
     def convert_to_human(self, val): 
         val = val if self.precision == UniswapExchangeData.TYPE_GWEI else UniV3Helper().gwei2dec(val)
         return val
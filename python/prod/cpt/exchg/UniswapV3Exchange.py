@@ -28,16 +28,24 @@
 # Licensed under the MIT License.
 # Original copyright (c) 2022 chainflip-io contributors.
 
+import copy
 import math
+import bisect
+import numpy as np
 from decimal import Decimal
 from dataclasses import dataclass
 from ...erc import LPERC20
 from ...utils.interfaces import IExchange
 from ...utils.data import FactoryData
 from ...utils.data import UniswapExchangeData
+from ...utils.data import PoolSnapshot
+from ...utils.tools import CopyOnWriteDict
+from ...utils.tools import UndoLog
+from ...utils.tools import EventJournal
 from ...utils.tools.v3.Shared import *
 from ...utils.tools.v3 import Position, Tick, SqrtPriceMath, LiquidityMath
 from ...utils.tools.v3 import SwapMath, TickMath, SafeMath, FullMath, UniV3Utils
+from ...utils.tools.v3 import TickBitmap
 from ...utils.tools.v3 import UniV3Helper
 from ...utils.tools.v3.Position import PositionInfo
 
@@ -90,6 +98,8 @@ class SwapState:
 
     ## list of ticks crossed during the swap
     ticksCrossed: list
+    ## total fee paid in the input token, including the protocol fee
+    feeAmount: int = 0
 
 @dataclass
 class StepComputations:
@@ -108,6 +118,32 @@ class StepComputations:
     ## how much fee is being paid in
     feeAmount: int
 
+@dataclass
+class QuoteResult:
+    ## amount of the input token paid into the pool, including fees
+    amountIn: int
+    ## amount of the output token paid out of the pool
+    amountOut: int
+    ## sqrt(price) after the swap
+    sqrtPriceX96After: int
+    ## the tick associated with the price after the swap
+    tickAfter: int
+    ## initialized ticks crossed during the swap, in crossing order
+    ticksCrossed: list
+    ## total fee paid in the input token, including the protocol fee
+    feeAmount: int
+
+@dataclass
+class QuoteCurve:
+    ## amounts of the input token paid into the pool, including fees
+    amountIn: np.ndarray
+    ## amounts of the output token paid out of the pool
+    amountOut: np.ndarray
+    ## sqrt(price) after each swap
+    sqrtPriceX96After: np.ndarray
+    ## total fees paid in the input token, including the protocol fee
+    feeAmount: np.ndarray
+
 @dataclass
 class ProtocolFees:
     token0: int
@@ -125,6 +161,15 @@ class UniswapV3Exchange(IExchange, LPERC20):
         exchg_struct : UniswapExchangeInit
             Exchange initialization data           
     """       
+
+    # State captured by snapshot(): plain values, dicts of plain values, copy-on-write maps 
+    # of mutable records, and small objects copied outright
+    _snapshot_attrs = ('reserve0', 'reserve1', 'total_supply', 'token_total', 'last_liquidity_deposit',
+                       'aggr_fee0', 'aggr_fee1', 'collected_fee0', 'collected_fee1',
+                       'feeGrowthGlobal0X128', 'feeGrowthGlobal1X128')
+    _snapshot_maps = ('liquidity_providers', 'tick_bitmap', 'tick_index')
+    _snapshot_cow_maps = ('ticks', 'positions', 'positions_for_owner')
+    _snapshot_objects = ('slot0', 'protocolFees')
                        
     def __init__(self, factory_struct: FactoryData, exchg_struct: UniswapExchangeData):
         super().__init__(exchg_struct.tkn0.token_name+exchg_struct.tkn1.token_name, exchg_struct.address)
@@ -146,15 +191,21 @@ class UniswapV3Exchange(IExchange, LPERC20):
         self.last_liquidity_deposit = 0
         self.total_supply = 0
         self.slot0 = Slot0(0, 0, 0)
-        self.positions = {}
-        self.ticks = {}
+        self.positions = CopyOnWriteDict()
+        self.ticks = CopyOnWriteDict()
+        self.tick_index = []
+        self.tick_bitmap = {}
+        self.tick_search = exchg_struct.tick_search
+        self.unchecked = exchg_struct.execution == UniswapExchangeData.EXECUTION_UNCHECKED
+        self.journal = EventJournal() if exchg_struct.journal else None
         self.feeGrowthGlobal0X128 = 0
         self.feeGrowthGlobal1X128 = 0  
         self.protocolFees = ProtocolFees(0, 0)
         self.tickSpacing = exchg_struct.tick_spacing
         self.maxLiquidityPerTick = Tick.tickSpacingToMaxLiquidityPerTick(self.tickSpacing)  
+        self.sqrt_ratio_cache = TickMath.getSqrtRatioCache(self.tickSpacing)
         self.liquidity_providers = {}
-        self.positions_for_owner = {}
+        self.positions_for_owner = CopyOnWriteDict()
 
     def summary(self):
 
@@ -192,6 +243,9 @@ class UniswapV3Exchange(IExchange, LPERC20):
 
         tick = TickMath.getTickAtSqrtRatio(sqrtPriceX96)
 
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self, 'slot0')
         self.slot0 = Slot0(
             sqrtPriceX96,
             tick,
@@ -232,9 +286,10 @@ class UniswapV3Exchange(IExchange, LPERC20):
         )
         assert amount > 0
 
-        (_, amount0Int, amount1Int) = self._modifyPosition(
-            ModifyPositionParams(recipient, tickLower, tickUpper, amount)
-        )
+        with uncheckedInputs(self.unchecked):
+            (_, amount0Int, amount1Int) = self._modifyPosition(
+                ModifyPositionParams(recipient, tickLower, tickUpper, amount)
+            )
         self._update_provider_liquidity(recipient, amount)
 
         amount0 = toUint256(abs(amount0Int))
@@ -256,6 +311,7 @@ class UniswapV3Exchange(IExchange, LPERC20):
     
         assert balance0Before + amount0 <= tokens.get(self.token0).token_total, 'UniswapV3: M0' 
         assert balance1Before + amount1 <= tokens.get(self.token1).token_total, 'UniswapV3: M0' 
+        self._record_event(EventJournal.EVENT_MINT, recipient, amount0, amount1, amount)
  
         amount0 = self.convert_to_human(amount0)
         amount1 = self.convert_to_human(amount1)        
@@ -302,6 +358,10 @@ class UniswapV3Exchange(IExchange, LPERC20):
             int24=(tickLower, tickUpper),
             uint128=(amount0Requested, amount1Requested),
         )
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            self.positions.record_undo(log, Position.key(recipient, tickLower, tickUpper))
+
         # Add this check to prevent creating a new position if the position doesn't exist or it's empty
         position = Position.assertPositionExists(
             self.positions, recipient, tickLower, tickUpper
@@ -329,6 +389,7 @@ class UniswapV3Exchange(IExchange, LPERC20):
             position.tokensOwed1 -= amount1
             tokens.get(self.token1).deposit(recipient, amount1) 
             #self.ledger.transferToken(self, recipient, self.token1, amount1)
+        self._record_event(EventJournal.EVENT_COLLECT, recipient, -amount0, -amount1, 0)
   
         amount0 = self.convert_to_human(amount0)
         amount1 = self.convert_to_human(amount1)        
@@ -374,12 +435,16 @@ class UniswapV3Exchange(IExchange, LPERC20):
 
         # Add check if the position exists - when poking an uninitialized position it can be that
         # getFeeGrowthInside finds a non-initialized tick before Position.update reverts.
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            self.positions.record_undo(log, Position.key(recipient, tickLower, tickUpper))
         Position.assertPositionExists(self.positions, recipient, tickLower, tickUpper)
 
         # Added extra recipient input variable to mimic msg.sender
-        (position, amount0Int, amount1Int) = self._modifyPosition(
-            ModifyPositionParams(recipient, tickLower, tickUpper, -amount)
-        )
+        with uncheckedInputs(self.unchecked):
+            (position, amount0Int, amount1Int) = self._modifyPosition(
+                ModifyPositionParams(recipient, tickLower, tickUpper, -amount)
+            )
         self._update_provider_liquidity(recipient, -amount)
         
         tokens = self.factory.token_from_exchange[self.name]
@@ -390,6 +455,7 @@ class UniswapV3Exchange(IExchange, LPERC20):
         balanceB = tokens.get(self.token1).token_total
 
         self._update(balanceA, balanceB)        
+        self._record_event(EventJournal.EVENT_BURN, recipient, amount0Int, amount1Int, amount)
 
         # Mimic conversion to uint256
         amount0 = abs(-amount0Int) & (2**256 - 1)
@@ -581,42 +647,215 @@ class UniswapV3Exchange(IExchange, LPERC20):
             int256=(amountSpecified),
             uint160=(sqrtPriceLimitX96),
         )
-        assert amountSpecified != 0, "UniswapV3: AS"
+        slot0Start = self.slot0
+        (cache, state) = self._startSwap(zeroForOne, amountSpecified, sqrtPriceLimitX96)
+        exactInput = amountSpecified > 0
+
+        # Inputs are validated above; in unchecked execution the swap steps skip the per-call checks
+        with uncheckedInputs(self.unchecked):
+            self._computeSwap(state, cache, zeroForOne, exactInput, sqrtPriceLimitX96)
+
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self.slot0, 'sqrtPriceX96', 'tick')
+            log.record_attrs(self, 'liquidity', 'feeGrowthGlobal0X128', 'feeGrowthGlobal1X128')
+            log.record_attrs(self.protocolFees, 'token0', 'token1')
+
+        ## End of swap loop
+        ## update tick
+        if state.tick != slot0Start.tick:
+            self.slot0.sqrtPriceX96 = state.sqrtPriceX96
+            self.slot0.tick = state.tick
+        else:
+            ## otherwise just update the price
+            self.slot0.sqrtPriceX96 = state.sqrtPriceX96
+
+        ## update liquidity if it changed
+        if cache.liquidityStart != state.liquidity:
+            self.liquidity = state.liquidity
+
+        ## update fee growth global and, if necessary, protocol fees
+        ## overflow is acceptable, protocol has to withdraw before it hits type(uint128).max fees
 
-        slot0Start = self.slot0        
-        
         if zeroForOne:
-            assert (
-                sqrtPriceLimitX96 < slot0Start.sqrtPriceX96
-                and sqrtPriceLimitX96 > TickMath.MIN_SQRT_RATIO
-            ), "UniswapV3: ZEROFORONE SPL"
+            self.feeGrowthGlobal0X128 = state.feeGrowthGlobalX128
+            if state.protocolFee > 0:
+                self.protocolFees.token0 += state.protocolFee
         else:
-            assert (
-                sqrtPriceLimitX96 > slot0Start.sqrtPriceX96
-                and sqrtPriceLimitX96 < TickMath.MAX_SQRT_RATIO
-            ), "UniswapV3: ONEFORZERO SPL"
-  
-        feeProtocol = (
-            (slot0Start.feeProtocol % 16)
-            if zeroForOne
-            else (slot0Start.feeProtocol >> 4)
-        )
+            self.feeGrowthGlobal1X128 = state.feeGrowthGlobalX128
+            if state.protocolFee > 0:
+                self.protocolFees.token1 += state.protocolFee
 
-        cache = SwapCache(feeProtocol, self.total_supply)
+        (amount0, amount1) = (
+            (amountSpecified - state.amountSpecifiedRemaining, state.amountCalculated)
+            if (zeroForOne == exactInput)
+            else (
+                state.amountCalculated,
+                amountSpecified - state.amountSpecifiedRemaining,
+            )
+        )
+        
+        tokens = self.factory.token_from_exchange[self.name]
+        if zeroForOne: 
+            tokens.get(self.token0).deposit(recipient, abs(amount0))
+            self._swap_tokens(0, abs(amount1), recipient)            
+        else: 
+            tokens.get(self.token1).deposit(recipient, abs(amount1))
+            self._swap_tokens(abs(amount0), 0, recipient)            
 
-        exactInput = amountSpecified > 0
+        self._record_event(EventJournal.EVENT_SWAP, recipient, amount0, amount1, state.liquidity, 
+                           state.feeAmount if zeroForOne else 0, 0 if zeroForOne else state.feeAmount)
 
-        state = SwapState(
-            amountSpecified,
-            0,
-            slot0Start.sqrtPriceX96,
-            slot0Start.tick,
-            self.feeGrowthGlobal0X128 if zeroForOne else self.feeGrowthGlobal1X128,
-            0,
-            cache.liquidityStart,
-            [],
+        amount0 = self.convert_to_human(amount0)
+        amount1 = self.convert_to_human(amount1)
+        liquidity = self.convert_to_human(state.liquidity)
+        self._update_fees()
+        
+        return (
+            recipient,
+            amount0,
+            amount1,
+            state.sqrtPriceX96,
+            liquidity,
+            state.tick,
         )
 
+    def quote_exact_input(self, token_in, amount_in, sqrtPriceLimit = None):
+
+        """ quote_exact_input
+
+            Quote a swap of an exact amount of token_in without executing it; the swap loop 
+            runs against the current pool state, which is read but never modified
+                
+            Parameters
+            -----------------    
+            token_in : ERC20
+                Token being swapped into the pool      
+            amount_in : int
+                How much token to swap
+            sqrtPriceLimit : int
+                The Q64.96 sqrt price limit of the swap, defaults to the min/max sqrt ratio
+                
+            Returns
+            -------
+            quote : QuoteResult
+                amountIn, amountOut, sqrtPriceX96After, tickAfter, ticksCrossed and feeAmount 
+                of the swap; token amounts are in the precision of the pool                        
+        """ 
+        
+        zeroForOne = self._quoteDirection(token_in)
+        return self._quote(zeroForOne, self.convert_to_machine(amount_in), sqrtPriceLimit)
+
+    def quote_exact_output(self, token_in, amount_out, sqrtPriceLimit = None):
+
+        """ quote_exact_output
+
+            Quote a swap of token_in for an exact amount of the other token without executing 
+            it; the swap loop runs against the current pool state, which is read but never modified
+                
+            Parameters
+            -----------------    
+            token_in : ERC20
+                Token being swapped into the pool      
+            amount_out : int
+                How much of the other token to receive
+            sqrtPriceLimit : int
+                The Q64.96 sqrt price limit of the swap, defaults to the min/max sqrt ratio
+                
+            Returns
+            -------
+            quote : QuoteResult
+                amountIn, amountOut, sqrtPriceX96After, tickAfter, ticksCrossed and feeAmount 
+                of the swap; token amounts are in the precision of the pool                        
+        """ 
+        
+        zeroForOne = self._quoteDirection(token_in)
+        return self._quote(zeroForOne, -self.convert_to_machine(amount_out), sqrtPriceLimit)
+
+    def quote_exact_input_curve(self, token_in, amounts_in):
+
+        """ quote_exact_input_curve
+
+            Quote exact input swaps of token_in for an ascending array of amounts in one 
+            traversal of the tick range; each entry equals quote_exact_input for that amount
+                
+            Parameters
+            -----------------    
+            token_in : ERC20
+                Token being swapped into the pool      
+            amounts_in : array_like
+                Ascending amounts of token to swap
+                
+            Returns
+            -------
+            curve : QuoteCurve
+                NumPy arrays of amountIn, amountOut, sqrtPriceX96After and feeAmount, one 
+                entry per input amount; token amounts are in the precision of the pool                        
+        """ 
+        
+        zeroForOne = self._quoteDirection(token_in)
+        amounts = [self.convert_to_machine(amount) for amount in amounts_in]
+        assert len(amounts) > 0 and amounts[0] > 0, 'UniswapV3: AS'
+        assert all(a <= b for a, b in zip(amounts, amounts[1:])), 'UniswapV3: AMOUNTS_NOT_SORTED'
+        return self._quoteCurve(zeroForOne, amounts, None)
+
+    def quote_price_curve(self, token_in, sqrt_prices_x96):
+
+        """ quote_price_curve
+
+            Quote the swaps of token_in needed to move the pool to each of an array of target 
+            sqrt prices, ordered in the swap direction, in one traversal of the tick range
+                
+            Parameters
+            -----------------    
+            token_in : ERC20
+                Token being swapped into the pool      
+            sqrt_prices_x96 : array_like
+                Target Q64.96 sqrt prices, descending when token_in is token0 and ascending 
+                when token_in is token1
+                
+            Returns
+            -------
+            curve : QuoteCurve
+                NumPy arrays of amountIn, amountOut, sqrtPriceX96After and feeAmount, one 
+                entry per target price; token amounts are in the precision of the pool                        
+        """ 
+        
+        zeroForOne = self._quoteDirection(token_in)
+        prices = [int(price) for price in sqrt_prices_x96]
+        assert len(prices) > 0, 'UniswapV3: AS'
+        if zeroForOne:
+            assert prices[0] <= self.slot0.sqrtPriceX96 and prices[-1] > TickMath.MIN_SQRT_RATIO, 'UniswapV3: SPL'
+        else:
+            assert prices[0] >= self.slot0.sqrtPriceX96 and prices[-1] < TickMath.MAX_SQRT_RATIO, 'UniswapV3: SPL'
+        assert all((a >= b) if zeroForOne else (a <= b) for a, b in zip(prices, prices[1:])), \
+            'UniswapV3: PRICES_NOT_SORTED'
+        return self._quoteCurve(zeroForOne, None, prices)
+
+    def _computeSwap(self, state, cache, zeroForOne, exactInput, sqrtPriceLimitX96, dryRun = False):
+
+        """ _computeSwap
+
+            Runs the tick-crossing swap loop, updating state in place until the specified 
+            amount is used up or the price limit is reached. With dryRun the crossed ticks 
+            are only read, so pool state is left untouched
+                
+            Parameters
+            -----------------    
+            state : SwapState
+                Swap state at the start of the swap      
+            cache : SwapCache
+                Protocol fee and liquidity at the beginning of the swap  
+            zeroForOne : bool
+                The direction of the swap, true for token0 to token1                     
+            exactInput : bool
+                Whether the swap is exact input (true) or exact output (false)
+            sqrtPriceLimitX96 : int
+                The Q64.96 sqrt price limit of the swap
+            dryRun : bool
+                Read liquidityNet of crossed ticks instead of running the tick transition
+        """ 
+
         while (
             state.amountSpecifiedRemaining != 0
             and state.sqrtPriceX96 != sqrtPriceLimitX96
@@ -627,7 +866,7 @@ class UniswapV3Exchange(IExchange, LPERC20):
             (step.tickNext, step.initialized) = self.nextTick(state.tick, zeroForOne)
 
             ## get the price for the next tick
-            step.sqrtPriceNextX96 = TickMath.getSqrtRatioAtTick(step.tickNext)
+            step.sqrtPriceNextX96 = self.sqrt_ratio_cache.getSqrtRatioAtTick(step.tickNext)
 
             ## compute values to swap to the target tick, price limit, or point where input#output amount is exhausted
             if zeroForOne:
@@ -655,6 +894,7 @@ class UniswapV3Exchange(IExchange, LPERC20):
                 state.amountSpecifiedRemaining,
                 self.fee,
             )
+            state.feeAmount += step.feeAmount
 
             if exactInput:
                 state.amountSpecifiedRemaining -= step.amountIn + step.feeAmount
@@ -686,16 +926,22 @@ class UniswapV3Exchange(IExchange, LPERC20):
                 ## if the tick is initialized, run the tick transition
                 ## @dev: here is where we should handle the case of an uninitialized boundary tick
                 if step.initialized:
-                    liquidityNet = Tick.cross(
-                        self.ticks,
-                        step.tickNext,
-                        state.feeGrowthGlobalX128
-                        if zeroForOne
-                        else self.feeGrowthGlobal0X128,
-                        self.feeGrowthGlobal1X128
-                        if zeroForOne
-                        else state.feeGrowthGlobalX128,
-                    )
+                    if dryRun:
+                        liquidityNet = self.ticks.peek(step.tickNext).liquidityNet
+                    else:
+                        if UndoLog.active != None and UndoLog.active.covers(self.factory):
+                            self.ticks.record_undo(UndoLog.active, step.tickNext)
+                        liquidityNet = Tick.cross(
+                            self.ticks,
+                            step.tickNext,
+                            state.feeGrowthGlobalX128
+                            if zeroForOne
+                            else self.feeGrowthGlobal0X128,
+                            self.feeGrowthGlobal1X128
+                            if zeroForOne
+                            else state.feeGrowthGlobalX128,
+                        )
+                    state.ticksCrossed.append(step.tickNext)
                     ## if we're moving leftward, we interpret liquidityNet as the opposite sign
                     ## safe because liquidityNet cannot be type(int128).min
                     if zeroForOne:
@@ -710,62 +956,6 @@ class UniswapV3Exchange(IExchange, LPERC20):
                 ## recompute unless we're on a lower tick boundary (i.e. already transitioned ticks), and haven't moved
                 state.tick = TickMath.getTickAtSqrtRatio(state.sqrtPriceX96)
 
-        ## End of swap loop
-        ## update tick
-        if state.tick != slot0Start.tick:
-            self.slot0.sqrtPriceX96 = state.sqrtPriceX96
-            self.slot0.tick = state.tick
-        else:
-            ## otherwise just update the price
-            self.slot0.sqrtPriceX96 = state.sqrtPriceX96
-
-        ## update liquidity if it changed
-        if cache.liquidityStart != state.liquidity:
-            self.liquidity = state.liquidity
-
-        ## update fee growth global and, if necessary, protocol fees
-        ## overflow is acceptable, protocol has to withdraw before it hits type(uint128).max fees
-
-        if zeroForOne:
-            self.feeGrowthGlobal0X128 = state.feeGrowthGlobalX128
-            if state.protocolFee > 0:
-                self.protocolFees.token0 += state.protocolFee
-        else:
-            self.feeGrowthGlobal1X128 = state.feeGrowthGlobalX128
-            if state.protocolFee > 0:
-                self.protocolFees.token1 += state.protocolFee
-
-        (amount0, amount1) = (
-            (amountSpecified - state.amountSpecifiedRemaining, state.amountCalculated)
-            if (zeroForOne == exactInput)
-            else (
-                state.amountCalculated,
-                amountSpecified - state.amountSpecifiedRemaining,
-            )
-        )
-        
-        tokens = self.factory.token_from_exchange[self.name]
-        if zeroForOne: 
-            tokens.get(self.token0).deposit(recipient, abs(amount0))
-            self._swap_tokens(0, abs(amount1), recipient)            
-        else: 
-            tokens.get(self.token1).deposit(recipient, abs(amount1))
-            self._swap_tokens(abs(amount0), 0, recipient)            
-
-        amount0 = self.convert_to_human(amount0)
-        amount1 = self.convert_to_human(amount1)
-        liquidity = self.convert_to_human(state.liquidity)
-        self._update_fees()
-        
-        return (
-            recipient,
-            amount0,
-            amount1,
-            state.sqrtPriceX96,
-            liquidity,
-            state.tick,
-        )
-
     def setFeeProtocol(self, feeProtocol0, feeProtocol1):
 
         """ setFeeProtocol
@@ -789,6 +979,9 @@ class UniswapV3Exchange(IExchange, LPERC20):
         feeProtocolNew = feeProtocol0 + (feeProtocol1 << 4)
         # Health check
         checkUInt8(feeProtocolNew)
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self.slot0, 'feeProtocol')
         self.slot0.feeProtocol = feeProtocolNew
         return (feeProtocolOld % 16, feeProtocolOld >> 4, feeProtocol0, feeProtocol1)
 
@@ -820,6 +1013,8 @@ class UniswapV3Exchange(IExchange, LPERC20):
             (keys) have been initialized within the boundaries. However, if there is no initialized 
             tick to the left or right we will return the next boundary. Then we need to return the 
             initialized bool to indicate that we are at the boundary and it is not an initalized tick.
+            With the BITMAP tick search the scan is limited to one word of the tick bitmap, as in 
+            Solidity, so the word boundary can also be returned as an uninitialized tick.
             
             Parameters
             -----------------    
@@ -836,33 +1031,39 @@ class UniswapV3Exchange(IExchange, LPERC20):
         
         checkInputTypes(int24=(tick), bool=(lte))
 
-        keyList = list(self.ticks.keys())
-
-        # If tick doesn't exist in the mapping we fake it (easier than searching for nearest value). This is probably not the
-        # best way, but it is a simple and intuitive way to reproduce the behaviour of the logic.
-        if not self.ticks.__contains__(tick):
-            keyList += [tick]
-        sortedKeyList = sorted(keyList)
-        indexCurrentTick = sortedKeyList.index(tick)
-
-        if lte:
-            # If the current tick is initialized (not faked), we return the current tick
-            if self.ticks.__contains__(tick):
-                return tick, True
-            elif indexCurrentTick == 0:
-                # No tick to the left
-                return TickMath.MIN_TICK, False
-            else:
-                nextTick = sortedKeyList[indexCurrentTick - 1]
-        else:
+        if self.tick_search == UniswapExchangeData.TICK_SEARCH_BITMAP:
+            # Solidity-style search: scan at most one 256-bit word of the tick bitmap, returning
+            # the word boundary as an uninitialized tick if nothing is found in the word
+            (nextTick, initialized) = TickBitmap.nextInitializedTickWithinOneWord(
+                self.tick_bitmap, tick, self.tickSpacing, lte
+            )
+            ## ensure that we do not overshoot the min/max tick, as the tick bitmap is not aware of these bounds
+            if nextTick < TickMath.MIN_TICK:
+                nextTick = TickMath.MIN_TICK
+            elif nextTick > TickMath.MAX_TICK:
+                nextTick = TickMath.MAX_TICK
+            return nextTick, initialized
+
+        # tick_index is the sorted list of initialized ticks, maintained by Tick.update 
+        # and Tick.clear, so the search is a bisect rather than a sort of self.ticks
+        return Tick.nextInitializedTick(self.tick_index, tick, lte)
 
-            if indexCurrentTick == len(sortedKeyList) - 1:
-                # No tick to the right
-                return TickMath.MAX_TICK, False
-            nextTick = sortedKeyList[indexCurrentTick + 1]
+    def get_initialized_ticks(self):
 
-        # Return tick within the boundaries
-        return nextTick, True  
+        """ get_initialized_ticks
+
+            Sorted initialized ticks; the tick index is only kept by INDEX tick search pools, 
+            BITMAP pools sort the tick keys instead
+                
+            Returns
+            -----------------
+            ticks : list
+                initialized ticks in ascending order                  
+        """ 
+
+        if self.tick_search == UniswapExchangeData.TICK_SEARCH_BITMAP:
+            return sorted(dict.keys(self.ticks))
+        return self.tick_index
 
     def get_price(self, token):  
         
@@ -967,6 +1168,101 @@ class UniswapV3Exchange(IExchange, LPERC20):
         else:
             assert False, 'UniswapV3: WRONG_INPUT_TOKEN'           
 
+    def snapshot(self):
+        
+        """ snapshot
+
+            Capture the mutable state of the pool (price, fee growth, ticks, positions, provider 
+            maps and the pair token totals) so that it can be restored later. Ticks and positions 
+            are shared copy-on-write with the pool rather than copied
+                          
+            Returns
+            -------
+            snap : PoolSnapshot
+                Captured pool state                       
+        """  
+
+        state = {attr: getattr(self, attr) for attr in self._snapshot_attrs}
+        state.update({attr: getattr(self, attr).copy() for attr in self._snapshot_maps})
+        state.update({attr: getattr(self, attr).fork() for attr in self._snapshot_cow_maps})
+        state.update({attr: copy.copy(getattr(self, attr)) for attr in self._snapshot_objects})
+        ## liquidity is only set once a swap has moved it
+        if hasattr(self, 'liquidity'):
+            state['liquidity'] = self.liquidity
+        tokens = self.factory.token_from_exchange[self.name]
+        token_totals = {tkn_nm: tkn.token_total for tkn_nm, tkn in tokens.items()}
+        return PoolSnapshot(self.name, state, token_totals)
+
+    def restore(self, snap):
+        
+        """ restore
+
+            Restore the pool to a state captured by snapshot(); the snapshot is left intact and 
+            can be restored again
+                
+            Parameters
+            -----------------
+            snap : PoolSnapshot
+                Pool state captured by snapshot()                    
+        """ 
+
+        assert snap.pool_name == self.name, 'UniswapV3: WRONG_SNAPSHOT'
+        tokens = self.factory.token_from_exchange[self.name]
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self, *self._snapshot_attrs, *self._snapshot_maps, *self._snapshot_cow_maps,
+                             *self._snapshot_objects, 'liquidity')
+            for tkn_nm in snap.token_totals:
+                log.record_token(tokens[tkn_nm])
+        for attr in self._snapshot_attrs:
+            setattr(self, attr, snap.state[attr])
+        for attr in self._snapshot_maps:
+            setattr(self, attr, snap.state[attr].copy())
+        for attr in self._snapshot_cow_maps:
+            setattr(self, attr, snap.state[attr].fork())
+        for attr in self._snapshot_objects:
+            setattr(self, attr, copy.copy(snap.state[attr]))
+        if 'liquidity' in snap.state:
+            self.liquidity = snap.state['liquidity']
+        elif hasattr(self, 'liquidity'):
+            del self.liquidity
+        for tkn_nm, token_total in snap.token_totals.items():
+            tokens[tkn_nm].token_total = token_total
+
+    def fork(self):
+        
+        """ fork
+
+            Branch an independent copy of the pool for what-if simulation; the fork holds its own 
+            copies of the pair tokens, so trading on it leaves this pool and the factory untouched
+                          
+            Returns
+            -------
+            forked : UniswapV3Exchange
+                Independent copy of the pool                       
+        """  
+
+        forked = copy.copy(self)
+        tokens = self.factory.token_from_exchange[self.name]
+        forked.factory = FactoryData({self.name: {tkn_nm: copy.copy(tkn) for tkn_nm, tkn in tokens.items()}},
+                                     self.factory.parent_lp, self.factory.name, self.factory.address)
+        forked.restore(self.snapshot())
+        ## the fork keeps its own journal, starting at the current step
+        if self.journal != None:
+            forked.journal = EventJournal(self.journal.chunk_size)
+            forked.journal.step = self.journal.step
+        return forked
+
+    def _record_event(self, event, user, amount0, amount1, liquidity, fee0 = 0, fee1 = 0):
+        if self.journal != None:
+            log = UndoLog.active
+            if log != None and log.covers(self.factory):
+                self.journal.record_undo(log)
+            self.journal.record(event, user, self.convert_to_human(amount0), self.convert_to_human(amount1),
+                                self.convert_to_human(liquidity), self.convert_to_human(self.reserve0), 
+                                self.convert_to_human(self.reserve1), self.slot0.sqrtPriceX96, self.slot0.tick,
+                                self.convert_to_human(fee0), self.convert_to_human(fee1))
+
     def convert_to_human(self, val): 
         val = val if self.precision == UniswapExchangeData.TYPE_GWEI else UniV3Helper().gwei2dec(val)
         return val
@@ -977,6 +1273,10 @@ class UniswapV3Exchange(IExchange, LPERC20):
 
     def _update_provider_liquidity(self, recipient, amount):
 
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_item(self.liquidity_providers, recipient)
+
         if((recipient in self.liquidity_providers) and (amount > 0)):
             self.liquidity_providers[recipient] = self.liquidity_providers[recipient] + amount
             
@@ -993,10 +1293,156 @@ class UniswapV3Exchange(IExchange, LPERC20):
             assert False, 'UniswapV3: INSUFFICIENT_ADD_AMOUNT'     
             
     def _update_fees(self): 
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self, 'collected_fee0', 'collected_fee1')
         liquidity = UniV3Helper().gwei2dec(self.total_supply)
         self.collected_fee0 = liquidity*self.feeGrowthGlobal0X128/2**128
         self.collected_fee1 = liquidity*self.feeGrowthGlobal1X128/2**128
     
+    def _startSwap(self, zeroForOne, amountSpecified, sqrtPriceLimitX96):
+        assert amountSpecified != 0, "UniswapV3: AS"
+
+        slot0Start = self.slot0        
+        
+        if zeroForOne:
+            assert (
+                sqrtPriceLimitX96 < slot0Start.sqrtPriceX96
+                and sqrtPriceLimitX96 > TickMath.MIN_SQRT_RATIO
+            ), "UniswapV3: ZEROFORONE SPL"
+        else:
+            assert (
+                sqrtPriceLimitX96 > slot0Start.sqrtPriceX96
+                and sqrtPriceLimitX96 < TickMath.MAX_SQRT_RATIO
+            ), "UniswapV3: ONEFORZERO SPL"
+  
+        feeProtocol = (
+            (slot0Start.feeProtocol % 16)
+            if zeroForOne
+            else (slot0Start.feeProtocol >> 4)
+        )
+
+        cache = SwapCache(feeProtocol, self.total_supply)
+
+        state = SwapState(
+            amountSpecified,
+            0,
+            slot0Start.sqrtPriceX96,
+            slot0Start.tick,
+            self.feeGrowthGlobal0X128 if zeroForOne else self.feeGrowthGlobal1X128,
+            0,
+            cache.liquidityStart,
+            [],
+        )
+        return (cache, state)
+
+    def _quoteDirection(self, token_in):
+        if token_in.token_name == self.token0:
+            return True
+        elif token_in.token_name == self.token1:
+            return False
+        assert False, 'UniswapV3: WRONG_INPUT_TOKEN'
+
+    def _quote(self, zeroForOne, amountSpecified, sqrtPriceLimitX96):
+        sqrtPriceLimitX96 = (
+            sqrtPriceLimitX96
+            if sqrtPriceLimitX96 != None
+            else UniV3Utils.getSqrtPriceLimitX96(UniV3Utils.TEST_TOKENS[0 if zeroForOne else 1])
+        )
+        checkInputTypes(
+            bool=(zeroForOne),
+            int256=(amountSpecified),
+            uint160=(sqrtPriceLimitX96),
+        )
+        (cache, state) = self._startSwap(zeroForOne, amountSpecified, sqrtPriceLimitX96)
+        exactInput = amountSpecified > 0
+
+        with uncheckedInputs(self.unchecked):
+            self._computeSwap(state, cache, zeroForOne, exactInput, sqrtPriceLimitX96, dryRun = True)
+
+        amountSpecifiedUsed = amountSpecified - state.amountSpecifiedRemaining
+        (amountIn, amountOut) = (
+            (amountSpecifiedUsed, -state.amountCalculated)
+            if exactInput
+            else (state.amountCalculated, -amountSpecifiedUsed)
+        )
+        return QuoteResult(
+            self.convert_to_human(amountIn),
+            self.convert_to_human(amountOut),
+            state.sqrtPriceX96,
+            state.tick,
+            state.ticksCrossed,
+            self.convert_to_human(state.feeAmount),
+        )
+
+    def _quoteCurve(self, zeroForOne, amounts, prices):
+        ## walk the tick range once; within each step every pending target either stops inside the 
+        ## step (a partial computeSwapStep from the step start, as the full swap would take) or 
+        ## belongs to a later step, so the targets are resolved in order as the walk advances
+        sqrtPriceLimitX96 = UniV3Utils.getSqrtPriceLimitX96(UniV3Utils.TEST_TOKENS[0 if zeroForOne else 1])
+        (_, state) = self._startSwap(zeroForOne, MAX_INT256, sqrtPriceLimitX96)
+        targets = amounts if prices == None else prices
+        (amountIn, amountOut, feeAmount) = (0, 0, 0)
+        rows = []
+
+        with uncheckedInputs(self.unchecked):
+            while len(rows) < len(targets) and state.sqrtPriceX96 != sqrtPriceLimitX96:
+                (tickNext, initialized) = self.nextTick(state.tick, zeroForOne)
+                sqrtPriceNextX96 = self.sqrt_ratio_cache.getSqrtRatioAtTick(tickNext)
+                if zeroForOne:
+                    sqrtRatioTargetX96 = max(sqrtPriceNextX96, sqrtPriceLimitX96)
+                else:
+                    sqrtRatioTargetX96 = min(sqrtPriceNextX96, sqrtPriceLimitX96)
+
+                while len(rows) < len(targets):
+                    target = targets[len(rows)]
+                    if prices == None:
+                        remaining = target - amountIn
+                        step = SwapMath.computeSwapStep(
+                            state.sqrtPriceX96, sqrtRatioTargetX96, state.liquidity, remaining, self.fee
+                        )
+                        if step[0] == sqrtRatioTargetX96 and remaining > step[1] + step[3]:
+                            break
+                    else:
+                        if (target < sqrtRatioTargetX96) if zeroForOne else (target > sqrtRatioTargetX96):
+                            break
+                        step = SwapMath.computeSwapStep(
+                            state.sqrtPriceX96, target, state.liquidity, MAX_INT256, self.fee
+                        )
+                    rows.append((amountIn + step[1] + step[3], amountOut + step[2], step[0], feeAmount + step[3]))
+
+                if len(rows) == len(targets):
+                    break
+
+                ## no target stops in this step, so run it to completion
+                (state.sqrtPriceX96, stepIn, stepOut, stepFee) = SwapMath.computeSwapStep(
+                    state.sqrtPriceX96, sqrtRatioTargetX96, state.liquidity, MAX_INT256, self.fee
+                )
+                amountIn += stepIn + stepFee
+                amountOut += stepOut
+                feeAmount += stepFee
+
+                if state.sqrtPriceX96 == sqrtPriceNextX96:
+                    if initialized:
+                        liquidityNet = self.ticks.peek(tickNext).liquidityNet
+                        if zeroForOne:
+                            liquidityNet = -liquidityNet
+                        state.liquidity = LiquidityMath.addDelta(state.liquidity, liquidityNet)
+                    state.tick = (tickNext - 1) if zeroForOne else tickNext
+
+        ## the price limit was reached: the remaining targets cannot be filled past it
+        while len(rows) < len(targets):
+            rows.append((amountIn, amountOut, state.sqrtPriceX96, feeAmount))
+
+        dtype = object if self.precision == UniswapExchangeData.TYPE_GWEI else float
+        (amountsIn, amountsOut, sqrtPrices, fees) = zip(*rows)
+        return QuoteCurve(
+            np.array([self.convert_to_human(amt) for amt in amountsIn], dtype = dtype),
+            np.array([self.convert_to_human(amt) for amt in amountsOut], dtype = dtype),
+            np.array(sqrtPrices, dtype = object),
+            np.array([self.convert_to_human(amt) for amt in fees], dtype = dtype),
+        )
+
     def _swap(self, inputToken, amounts, recipient, sqrtPriceLimitX96):
         [amountIn, amountOut] = amounts
         exactInput = amountOut == 0
@@ -1068,6 +1514,9 @@ class UniswapV3Exchange(IExchange, LPERC20):
                 New reserve amount of B                   
         """         
         
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            log.record_attrs(self, 'reserve0', 'reserve1')
         self.reserve0 = balanceA
         self.reserve1 = balanceB    
     
@@ -1096,19 +1545,19 @@ class UniswapV3Exchange(IExchange, LPERC20):
                 ## current tick is below the passed range; liquidity can only become in range by crossing from left to
                 ## right, when we'll need _more_ token0 (it's becoming more valuable) so user must provide it
                 amount0 = SqrtPriceMath.getAmount0DeltaHelper(
-                    TickMath.getSqrtRatioAtTick(params.tickLower),
-                    TickMath.getSqrtRatioAtTick(params.tickUpper),
+                    self.sqrt_ratio_cache.getSqrtRatioAtTick(params.tickLower),
+                    self.sqrt_ratio_cache.getSqrtRatioAtTick(params.tickUpper),
                     params.liquidityDelta,
                 )
             elif self.slot0.tick < params.tickUpper:
                 ## current tick is inside the passed range
                 amount0 = SqrtPriceMath.getAmount0DeltaHelper(
                     self.slot0.sqrtPriceX96,
-                    TickMath.getSqrtRatioAtTick(params.tickUpper),
+                    self.sqrt_ratio_cache.getSqrtRatioAtTick(params.tickUpper),
                     params.liquidityDelta,
                 )
                 amount1 = SqrtPriceMath.getAmount1DeltaHelper(
-                    TickMath.getSqrtRatioAtTick(params.tickLower),
+                    self.sqrt_ratio_cache.getSqrtRatioAtTick(params.tickLower),
                     self.slot0.sqrtPriceX96,
                     params.liquidityDelta,
                 )
@@ -1116,10 +1565,13 @@ class UniswapV3Exchange(IExchange, LPERC20):
                 ## current tick is above the passed range; liquidity can only become in range by crossing from right to
                 ## left, when we'll need _more_ token1 (it's becoming more valuable) so user must provide it
                 amount1 = SqrtPriceMath.getAmount1DeltaHelper(
-                    TickMath.getSqrtRatioAtTick(params.tickLower),
-                    TickMath.getSqrtRatioAtTick(params.tickUpper),
+                    self.sqrt_ratio_cache.getSqrtRatioAtTick(params.tickLower),
+                    self.sqrt_ratio_cache.getSqrtRatioAtTick(params.tickUpper),
                     params.liquidityDelta,
                 )
+            log = UndoLog.active
+            if log != None and log.covers(self.factory):
+                log.record_attrs(self, 'total_supply', 'last_liquidity_deposit')
             self.total_supply = LiquidityMath.addDelta(
                 self.total_supply, params.liquidityDelta
             )
@@ -1133,9 +1585,17 @@ class UniswapV3Exchange(IExchange, LPERC20):
             int24=(tickLower, tickUpper, tick),
             int128=(liquidityDelta),
         )
-        # This will create a position if it doesn't exist
+        ## only the structure the tick search reads is kept in sync with the ticks
+        use_bitmap = self.tick_search == UniswapExchangeData.TICK_SEARCH_BITMAP
+        tick_index = None if use_bitmap else self.tick_index
 
-        
+        log = UndoLog.active
+        if log != None and log.covers(self.factory):
+            self._record_position_undo(log, owner, tickLower, tickUpper, use_bitmap)
+        else:
+            log = None
+
+        # This will create a position if it doesn't exist
         position = Position.get(self.positions, owner, tickLower, tickUpper)
 
         # Initialize values
@@ -1152,6 +1612,7 @@ class UniswapV3Exchange(IExchange, LPERC20):
                 self.feeGrowthGlobal1X128,
                 False,
                 self.maxLiquidityPerTick,
+                tick_index,
             )
             flippedUpper = Tick.update(
                 self.ticks,
@@ -1162,12 +1623,17 @@ class UniswapV3Exchange(IExchange, LPERC20):
                 self.feeGrowthGlobal1X128,
                 True,
                 self.maxLiquidityPerTick,
+                tick_index,
             )
 
         if flippedLower:
             assert tickLower % self.tickSpacing == 0  ## ensure that the tick is spaced
+            if use_bitmap:
+                TickBitmap.flipTick(self.tick_bitmap, tickLower, self.tickSpacing)
         if flippedUpper:
             assert tickUpper % self.tickSpacing == 0  ## ensure that the tick is spaced
+            if use_bitmap:
+                TickBitmap.flipTick(self.tick_bitmap, tickUpper, self.tickSpacing)
 
         (feeGrowthInside0X128, feeGrowthInside1X128) = Tick.getFeeGrowthInside(
             self.ticks,
@@ -1197,11 +1663,51 @@ class UniswapV3Exchange(IExchange, LPERC20):
         ## clear any tick data that is no longer needed
         if liquidityDelta < 0:
             if flippedLower:
-                Tick.clear(self.ticks, tickLower)
+                Tick.clear(self.ticks, tickLower, tick_index)
+                if log != None and not use_bitmap:
+                    log.record_call(bisect.insort, self.tick_index, tickLower)
             if flippedUpper:
-                Tick.clear(self.ticks, tickUpper)
+                Tick.clear(self.ticks, tickUpper, tick_index)
+                if log != None and not use_bitmap:
+                    log.record_call(bisect.insort, self.tick_index, tickUpper)
         return position    
 
+    def _record_position_undo(self, log, owner, tickLower, tickUpper, use_bitmap):
+        
+        """ _record_position_undo
+
+            Record in an UndoLog the position, ticks and tick search entries that an update of 
+            the position can change
+                
+            Parameters
+            -----------------
+            log : UndoLog
+                log of the open transaction
+            owner : str
+                owner of the position
+            tickLower : int
+                lower tick of the position
+            tickUpper : int
+                upper tick of the position
+            use_bitmap : bool
+                whether the pool searches ticks with tick_bitmap rather than tick_index
+        """  
+
+        self.positions.record_undo(log, Position.key(owner, tickLower, tickUpper))
+        self.positions_for_owner.record_undo(log, owner)
+        for tick in (tickLower, tickUpper):
+            if use_bitmap:
+                log.record_item(self.tick_bitmap, TickBitmap.position(tick // self.tickSpacing)[0])
+            elif tick not in self.ticks:
+                ## a new tick is inserted into tick_index; the undo tolerates an update that fails first
+                log.record_call(self._unindex_tick, tick)
+            self.ticks.record_undo(log, tick)
+
+    def _unindex_tick(self, tick):
+        i = bisect.bisect_left(self.tick_index, tick)
+        if i < len(self.tick_index) and self.tick_index[i] == tick:
+            del self.tick_index[i]
+
     def get_owners(self) -> list[str]:
         """ get_owners
         
@@ -23,6 +23,7 @@ from ...erc import LPERC20
 from ...utils.interfaces import IExchangeFactory 
 from ...utils.data import UniswapExchangeData
 from ...utils.data import FactoryData
+from ...utils.tools import UndoLog
 
 class UniswapFactory(IExchangeFactory):
 
@@ -39,6 +40,8 @@ class UniswapFactory(IExchangeFactory):
             Map of tokens to exchanges
         tokens_from_exchange : dictionary
             Map of exchanges to pair tokens          
+        exchanges : dictionary
+            Map of exchange names to deployed exchanges, in deployment order
     """     
     
     def __init__(self, name: str, address: str) -> None:
@@ -46,6 +49,7 @@ class UniswapFactory(IExchangeFactory):
         self.address = address
         self.exchange_from_token = {}
         self.token_from_exchange = {}
+        self.exchanges = {}
         self.parent_lp = None
 
     def deploy(self, exchg_data : UniswapExchangeData):
@@ -72,6 +76,10 @@ class UniswapFactory(IExchangeFactory):
         precision = exchg_data.precision
 
         assert symbol not in self.token_from_exchange, 'UniswapV2Factory: EXCHANGE_CREATED'
+
+        log = UndoLog.active
+        if log != None and log.covers(self):
+            log.record_attrs(self, 'parent_lp')
             
         self.parent_lp = token0.parent_lp if token0.type == 'index' else self.parent_lp
         self.parent_lp = token1.parent_lp if token1.type == 'index' else self.parent_lp 
@@ -80,17 +88,31 @@ class UniswapFactory(IExchangeFactory):
 
         match exchg_data.version:
             case UniswapExchangeData.VERSION_V2:
-                exchg_struct = UniswapExchangeData(tkn0 = token0, tkn1 = token1, symbol=symbol, precision = precision, address=address)
+                exchg_struct = UniswapExchangeData(tkn0 = token0, tkn1 = token1, symbol=symbol, precision = precision, address=address,
+                                                   fee_ledger = exchg_data.fee_ledger, 
+                                                   fee_ledger_size = exchg_data.fee_ledger_size,
+                                                   fee_ledger_spill_dir = exchg_data.fee_ledger_spill_dir,
+                                                   fee_ledger_dtype = exchg_data.fee_ledger_dtype,
+                                                   journal = exchg_data.journal)
                 exchange = UniswapExchange(factory_struct, exchg_struct) 
             case UniswapExchangeData.VERSION_V3: 
                 exchg_struct = UniswapExchangeData(tkn0 = token0, tkn1 = token1, symbol=symbol, 
                                                    address=address, version = UniswapExchangeData.VERSION_V3, 
                                                    precision = precision, 
-                                                   tick_spacing = exchg_data.tick_spacing, fee = exchg_data.fee)                
+                                                   tick_spacing = exchg_data.tick_spacing, fee = exchg_data.fee,
+                                                   tick_search = exchg_data.tick_search,
+                                                   execution = exchg_data.execution,
+                                                   journal = exchg_data.journal)                
                 exchange = UniswapV3Exchange(factory_struct, exchg_struct) 
         
+        if log != None and log.covers(self):
+            log.record_item(self.exchange_from_token, token0.token_name)
+            log.record_item(self.token_from_exchange, exchange.name)
+            log.record_item(self.exchanges, exchange.name)
+            log.add_tokens((token0, token1))
         self.exchange_from_token[token0.token_name] = exchange
         self.token_from_exchange[exchange.name] = {token0.token_name: token0, token1.token_name: token1}
+        self.exchanges[exchange.name] = exchange
         
         return exchange
 
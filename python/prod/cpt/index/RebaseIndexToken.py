@@ -18,7 +18,6 @@
 
 from ...erc import ERC20
 from ...utils.data import UniswapExchangeData
-from ...utils.tools.v3 import TickMath
 from ...utils.tools.v3 import UniV3Helper
 from ...utils.tools.v3 import FullMath
 from ...utils.tools import SaferMath
@@ -86,8 +85,8 @@ class RebaseIndexToken():
         L = lp.get_liquidity()
         L_diff = (L - dL) 
         if(token_in.token_name == lp.token0):
-            sqrtp_pa = TickMath.getSqrtRatioAtTick(lwr_tick)/2**96
-            sqrtp_pb = TickMath.getSqrtRatioAtTick(upr_tick)/2**96 
+            sqrtp_pa = lp.sqrt_ratio_cache.getSqrtRatioAtTick(lwr_tick)/2**96
+            sqrtp_pb = lp.sqrt_ratio_cache.getSqrtRatioAtTick(upr_tick)/2**96 
             sqrtp_cur = lp.slot0.sqrtPriceX96/2**96 
             dPy = (sqrtp_cur - sqrtp_pa)
             dPx = (1/sqrtp_cur - 1/sqrtp_pb)  
@@ -97,8 +96,8 @@ class RebaseIndexToken():
             itkn_amt = dx + L_diff * (1/sqrtp_cur - 1/sqrtp_next)
         elif(token_in.token_name == lp.token1):
             sqrtp_cur = 2**96/lp.slot0.sqrtPriceX96
-            sqrtp_pa = 2**96/TickMath.getSqrtRatioAtTick(lwr_tick)
-            sqrtp_pb = 2**96/TickMath.getSqrtRatioAtTick(upr_tick)
+            sqrtp_pa = 2**96/lp.sqrt_ratio_cache.getSqrtRatioAtTick(lwr_tick)
+            sqrtp_pb = 2**96/lp.sqrt_ratio_cache.getSqrtRatioAtTick(upr_tick)
             dPy = (1/sqrtp_cur - 1/sqrtp_pa)
             dPx = (sqrtp_cur - sqrtp_pb)
             dx = dL*dPx
@@ -20,7 +20,6 @@ import math
 from decimal import Decimal, getcontext
 getcontext().prec = 50
 from ...utils.data import UniswapExchangeData
-from ...utils.tools.v3 import TickMath
 from ...utils.tools.v3 import UniV3Helper
 from ...utils.tools.v3 import FullMath
 
@@ -94,14 +93,14 @@ class SettlementLPToken():
 
         if(token_in.token_name == lp.token0):
             sqrtp_cur = Decimal(str(lp.slot0.sqrtPriceX96)) / Q96
-            sqrtp_pa = Decimal(str(TickMath.getSqrtRatioAtTick(lwr_tick))) / Q96
-            sqrtp_pb = Decimal(str(TickMath.getSqrtRatioAtTick(upr_tick))) / Q96
+            sqrtp_pa = Decimal(str(lp.sqrt_ratio_cache.getSqrtRatioAtTick(lwr_tick))) / Q96
+            sqrtp_pb = Decimal(str(lp.sqrt_ratio_cache.getSqrtRatioAtTick(upr_tick))) / Q96
             dPy = sqrtp_cur - sqrtp_pa
             dPx = Decimal(1) / sqrtp_cur - Decimal(1) / sqrtp_pb
         elif(token_in.token_name == lp.token1):
             sqrtp_cur = Q96 / Decimal(str(lp.slot0.sqrtPriceX96))
-            sqrtp_pa = Q96 / Decimal(str(TickMath.getSqrtRatioAtTick(lwr_tick)))
-            sqrtp_pb = Q96 / Decimal(str(TickMath.getSqrtRatioAtTick(upr_tick)))
+            sqrtp_pa = Q96 / Decimal(str(lp.sqrt_ratio_cache.getSqrtRatioAtTick(lwr_tick)))
+            sqrtp_pb = Q96 / Decimal(str(lp.sqrt_ratio_cache.getSqrtRatioAtTick(upr_tick)))
             dPx = Decimal(1) / sqrtp_cur - Decimal(1) / sqrtp_pa
             dPy = sqrtp_cur - sqrtp_pb
 
@@ -0,0 +1,258 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+from ...utils.data import UniswapExchangeData
+from ...utils.data import Route
+import math
+
+MAX_HOPS = 3
+QUOTE_REL_TOL = 1e-9
+
+class Router():
+
+    """ Multi-hop swap routing across the pools deployed by one or more factories. The
+        token/pool graph is extended incrementally with pools deployed since the last search,
+        candidate routes are quoted against read-only pool state, and the chosen route is
+        executed atomically
+
+        Parameters
+        -----------------
+        factories : UniswapFactory or list
+            factories whose pools are routed through
+        max_hops : int
+            maximum number of pools in a route
+    """
+
+    def __init__(self, factories, max_hops = MAX_HOPS):
+        self.factories = factories if isinstance(factories, list) else [factories]
+        self.max_hops = max_hops
+        self.graph = {}
+        # pools in the graph per factory, by exchange name
+        self.synced = [{} for _ in self.factories]
+
+    def sync(self):
+
+        """ sync
+
+            Bring the token graph in line with the factories: add the pools deployed since the 
+            last sync, and swap out the pools whose exchange name now maps to another exchange 
+            (a redeploy) or to none
+
+            Returns
+            -----------------
+            n_added : int
+                number of pools added
+        """
+
+        n_added = 0
+        for synced, factory in zip(self.synced, self.factories):
+            for name, lp in factory.exchanges.items():
+                if synced.get(name) is lp:
+                    continue
+                if name in synced:
+                    self._unlink(synced[name])
+                self.graph.setdefault(lp.token0, []).append((lp, lp.token1))
+                self.graph.setdefault(lp.token1, []).append((lp, lp.token0))
+                synced[name] = lp
+                n_added += 1
+            for name in [name for name in synced if name not in factory.exchanges]:
+                self._unlink(synced.pop(name))
+        return n_added
+
+    def get_routes(self, token_in, token_out, amount_in, max_hops = None):
+
+        """ get_routes
+
+            Quote every route from token_in to token_out of up to max_hops pools, without
+            visiting a token twice; pools are only read, never modified
+
+            Parameters
+            -----------------
+            token_in : ERC20
+                token swapped into the first pool
+            token_out : ERC20
+                token received from the last pool
+            amount_in : float
+                amount of token_in
+            max_hops : int
+                maximum number of pools in a route, defaults to the router's
+
+            Returns
+            -----------------
+            routes : list
+                quoted Route of each feasible path
+        """
+
+        self.sync()
+        max_hops = self.max_hops if max_hops == None else max_hops
+        routes = []
+        # depth-first over simple paths; quotes of a shared prefix are computed once
+        stack = [([token_in.token_name], [], [amount_in])]
+        while stack:
+            (tokens, pools, amounts) = stack.pop()
+            for lp, tkn_nm in self.graph.get(tokens[-1], []):
+                if tkn_nm in tokens:
+                    continue
+                amount_out = self.quote_hop(lp, tokens[-1], amounts[-1])
+                if amount_out == None:
+                    continue
+                path = (tokens + [tkn_nm], pools + [lp], amounts + [amount_out])
+                if tkn_nm == token_out.token_name:
+                    routes.append(Route(*path))
+                elif len(pools) + 1 < max_hops:
+                    stack.append(path)
+        return routes
+
+    def get_best_route(self, token_in, token_out, amount_in, max_hops = None):
+
+        """ get_best_route
+
+            Route of up to max_hops pools with the largest output
+
+            Parameters
+            -----------------
+            token_in : ERC20
+                token swapped into the first pool
+            token_out : ERC20
+                token received from the last pool
+            amount_in : float
+                amount of token_in
+            max_hops : int
+                maximum number of pools in a route, defaults to the router's
+
+            Returns
+            -----------------
+            route : Route
+                best quoted route, None when token_out is unreachable
+        """
+
+        routes = self.get_routes(token_in, token_out, amount_in, max_hops)
+        return max(routes, key = lambda route: route.amount_out, default = None)
+
+    def quote_hop(self, lp, tkn_nm, amount_in):
+
+        """ quote_hop
+
+            Read-only quote of swapping amount_in of token tkn_nm through one pool
+
+            Parameters
+            -----------------
+            lp : UniswapExchange or UniswapV3Exchange
+                pool swapped through
+            tkn_nm : str
+                name of the token swapped in
+            amount_in : float
+                amount swapped in
+
+            Returns
+            -----------------
+            amount_out : float
+                amount received, None when the pool cannot fill the whole amount
+        """
+
+        if not amount_in > 0:
+            return None
+        tkn = lp.factory.token_from_exchange[lp.name][tkn_nm]
+        try:
+            if lp.version == UniswapExchangeData.VERSION_V2:
+                return lp.get_amount_out(amount_in, tkn)
+            quote = lp.quote_exact_input(tkn, amount_in)
+        except AssertionError:
+            return None
+        # a swap stopped by the price limit leaves input unspent, which a route cannot use; 
+        # the quote is in human units, so DEC pools only match up to the decimal conversion
+        if not math.isclose(quote.amountIn, amount_in, rel_tol = QUOTE_REL_TOL):
+            return None
+        return quote.amountOut
+
+    def swap(self, token_in, token_out, amount_in, user_nm, amount_out_min = 0, max_hops = None):
+
+        """ swap
+
+            Swap along the best route of up to max_hops pools
+
+            Parameters
+            -----------------
+            token_in : ERC20
+                token swapped into the first pool
+            token_out : ERC20
+                token received from the last pool
+            amount_in : float
+                amount of token_in
+            user_nm : str
+                account name
+            amount_out_min : float
+                minimum amount of token_out, otherwise no pool is changed
+            max_hops : int
+                maximum number of pools in a route, defaults to the router's
+
+            Returns
+            -----------------
+            amount_out : float
+                amount of token_out received
+        """
+
+        route = self.get_best_route(token_in, token_out, amount_in, max_hops)
+        assert route != None, 'Router: NO_ROUTE'
+        return self.execute(route, user_nm, amount_out_min)
+
+    def execute(self, route, user_nm, amount_out_min = 0):
+
+        """ execute
+
+            Swap along a route atomically; if any hop fails, or the output is below
+            amount_out_min, every pool on the route is restored to its state before the swap
+
+            Parameters
+            -----------------
+            route : Route
+                route from get_routes or get_best_route
+            user_nm : str
+                account name
+            amount_out_min : float
+                minimum amount received from the last pool
+
+            Returns
+            -----------------
+            amount_out : float
+                amount received from the last pool
+        """
+
+        snaps = [(lp, lp.snapshot()) for lp in {id(lp): lp for lp in route.pools}.values()]
+        try:
+            amount = route.amount_in
+            for lp, tkn_nm in zip(route.pools, route.tokens):
+                amount = self._swap_hop(lp, tkn_nm, amount, user_nm)
+            assert amount >= amount_out_min, 'Router: INSUFFICIENT_OUTPUT_AMOUNT'
+        except Exception:
+            for lp, snap in snaps:
+                lp.restore(snap)
+            raise
+        return amount
+
+    def _swap_hop(self, lp, tkn_nm, amount_in, user_nm):
+        tkn = lp.factory.token_from_exchange[lp.name][tkn_nm]
+        if lp.version == UniswapExchangeData.VERSION_V2:
+            return lp.swap_exact_tokens_for_tokens(amount_in, 0, tkn, user_nm)
+        if tkn_nm == lp.token0:
+            return abs(lp.swapExact0For1(user_nm, amount_in, None)[2])
+        return abs(lp.swapExact1For0(user_nm, amount_in, None)[1])
+
+    def _unlink(self, lp):
+        for tkn_nm in (lp.token0, lp.token1):
+            self.graph[tkn_nm] = [(pool, v) for (pool, v) in self.graph[tkn_nm] if pool is not lp]
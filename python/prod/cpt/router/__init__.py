@@ -0,0 +1 @@
+from .Router import Router
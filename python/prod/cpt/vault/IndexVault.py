@@ -17,6 +17,7 @@
 # limitations under the License
 
 from ...erc import ERC20
+from ...utils.tools import UndoDict
 from .Vault import Vault 
 from ..index import RebaseIndexToken
 
@@ -44,9 +45,9 @@ class IndexVault(Vault):
     def __init__(self, name: str, addr: str) -> None:
         self.token_name = name
         self.token_addr = addr 
-        self.lp_providers = {}
-        self.lp_tokens = {}
-        self.index_tokens = {}
+        self.lp_providers = UndoDict()
+        self.lp_tokens = UndoDict()
+        self.index_tokens = UndoDict()
       
     def rebase_index_tkn(self, lp_token, token = None, lwr_tick = None, upr_tick = None):
         
@@ -99,11 +100,11 @@ class IndexVault(Vault):
             if self.__chk_tkn_nm(_to, lp_tkn):
                 self.lp_providers[_to][lp_tkn.token_name]['amount'] += amt
             else:
-                self.lp_providers[_to][lp_tkn.token_name] = {}
+                self.lp_providers[_to][lp_tkn.token_name] = UndoDict()
                 self.lp_providers[_to][lp_tkn.token_name]['amount'] = amt                
         else:
-            self.lp_providers[_to] = {}
-            self.lp_providers[_to][lp_tkn.token_name] = {}
+            self.lp_providers[_to] = UndoDict()
+            self.lp_providers[_to][lp_tkn.token_name] = UndoDict()
             self.lp_providers[_to][lp_tkn.token_name]['amount'] = amt    
             
 
@@ -247,7 +248,7 @@ class IndexVault(Vault):
         for account in self.lp_providers:
             amt = self.lp_providers[account][exchange]['amount']
             exch_tkn = lp_tkn.factory.token_from_exchange[lp_tkn.name][tkn_nm]
-            self.lp_providers[account][index_tokens[tkn_nm]] = {}
+            self.lp_providers[account][index_tokens[tkn_nm]] = UndoDict()
             self.lp_providers[account][index_tokens[tkn_nm]]['amount'] = self.get_tkn_pair_amount(lp_tkn, exch_tkn, amt, lwr_tick, upr_tick)             
                   
     def update_account(self, lp_tkn, tkn, _from): 
@@ -273,7 +274,7 @@ class IndexVault(Vault):
         for tkn_nm in index_tokens.keys():
             amt = self.lp_providers[_from][exchange]['amount']
             exch_tkn = lp_tkn.factory.token_from_exchange[lp_tkn.name][tkn_nm]
-            self.lp_providers[_from][index_tokens[tkn_nm]] = {}
+            self.lp_providers[_from][index_tokens[tkn_nm]] = UndoDict()
             self.lp_providers[_from][index_tokens[tkn_nm]]['amount'] = self.get_tkn_pair_amount(lp_tkn, exch_tkn, amt)  
             
         if(self.lp_providers[_from][lp_tkn.token_name]['amount'] == 0):
@@ -346,7 +347,7 @@ class IndexVault(Vault):
         tkn.deposit(None, amt) 
         
         if mint_tkn_name not in self.index_tokens:    
-            self.index_tokens[mint_tkn_name] = {}
+            self.index_tokens[mint_tkn_name] = UndoDict()
             self.index_tokens[mint_tkn_name]['token'] = tkn 
             self.index_tokens[mint_tkn_name]['total'] = self.get_tkn_pair_amount(lp_token, token, liq, lwr_tick, upr_tick) 
             self.index_tokens[mint_tkn_name]['total_lp'] = liq
@@ -406,7 +407,7 @@ class IndexVault(Vault):
                 amount of new inititalized token                 
         """          
         
-        self.lp_tokens[token.token_name] = {}
+        self.lp_tokens[token.token_name] = UndoDict()
         self.lp_tokens[token.token_name]['token'] = token 
         self.lp_tokens[token.token_name]['total_amount'] = amt
         self.lp_tokens[token.token_name]['last_deposit'] = amt
@@ -16,11 +16,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License
 
+from ...utils.tools import UndoDict
+
 class Wallets():
     
     def __init__(self):
-        self.accounts = {}
-        self.tokens = {}
+        self.accounts = UndoDict()
+        self.tokens = UndoDict()
         
     def update(self, _to, tkn, amt):
         
@@ -41,11 +43,11 @@ class Wallets():
             if self.__chk_tkn_nm(_to, tkn):
                 self.accounts[_to][tkn.token_name]['amount'] += amt
             else:
-                self.accounts[_to][tkn.token_name] = {}
+                self.accounts[_to][tkn.token_name] = UndoDict()
                 self.accounts[_to][tkn.token_name]['amount'] = amt                
         else:
-            self.accounts[_to] = {}
-            self.accounts[_to][tkn.token_name] = {}
+            self.accounts[_to] = UndoDict()
+            self.accounts[_to][tkn.token_name] = UndoDict()
             self.accounts[_to][tkn.token_name]['amount'] = amt
             
 
@@ -71,7 +73,7 @@ class Wallets():
         return self.tokens[tkn.token_name]['total_amount']
     
     def __init_tkn(self, token, amt):        
-        self.tokens[token.token_name] = {}
+        self.tokens[token.token_name] = UndoDict()
         self.tokens[token.token_name]['token'] = token 
         self.tokens[token.token_name]['total_amount'] = amt
         self.tokens[token.token_name]['last_deposit'] = amt 
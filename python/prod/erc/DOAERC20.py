@@ -16,6 +16,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License
 from .ERC20 import ERC20
+from ..utils.tools import UndoLog
 
 class DOAERC20(ERC20):
     
@@ -52,6 +53,8 @@ class DOAERC20(ERC20):
                 token total        
         """         
         
+        if UndoLog.active != None:
+            UndoLog.active.record_token(self)
         self.token_total = token_total
 
     def add_token_lp(self, value):
@@ -66,6 +69,8 @@ class DOAERC20(ERC20):
                 token delta        
         """            
         
+        if UndoLog.active != None:
+            UndoLog.active.record_token(self)
         self.token_total += value           
         
     def remove_token_lp(self, value):
@@ -80,5 +85,7 @@ class DOAERC20(ERC20):
                 token delta        
         """          
         
+        if UndoLog.active != None:
+            UndoLog.active.record_token(self)
         self.token_total -= value        
 
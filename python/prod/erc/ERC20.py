@@ -15,6 +15,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License
+from ..utils.tools import UndoLog
+
 GWEI_PRECISION = 18
 
 class ERC20:
@@ -52,6 +54,8 @@ class ERC20:
                 delta to add to total                
         """           
         
+        if UndoLog.active != None:
+            UndoLog.active.record_token(self)
         self.token_total += value
 
     def transfer(self, _to, value):
@@ -68,5 +72,7 @@ class ERC20:
                 delta to remove from total                
         """         
         
+        if UndoLog.active != None:
+            UndoLog.active.record_token(self)
         self.token_total -= value
         
@@ -17,6 +17,7 @@
 # limitations under the License
 
 from .ERC20 import ERC20
+from ..utils.tools import UndoLog
 
 class LPERC20(ERC20):
     
@@ -53,6 +54,8 @@ class LPERC20(ERC20):
                 token total        
         """         
         
+        if UndoLog.active != None:
+            UndoLog.active.record_token(self)
         self.token_total = token_total
 
     def add_token_lp(self, value):
@@ -67,6 +70,8 @@ class LPERC20(ERC20):
                 token delta        
         """            
         
+        if UndoLog.active != None:
+            UndoLog.active.record_token(self)
         self.token_total += value           
         
     def remove_token_lp(self, value):
@@ -81,5 +86,7 @@ class LPERC20(ERC20):
                 token delta        
         """          
         
+        if UndoLog.active != None:
+            UndoLog.active.record_token(self)
         self.token_total -= value        
 
@@ -19,57 +19,300 @@
 import numpy as np
 
 class BrownianModel():
-    
-    def __init__(self, x0=0):
+
+    """ Brownian motion path generators. Paths are built from whole matrices of normal draws
+        by cumulative sums (and exp for GBM), one column per path
+
+        Parameters
+        -----------------
+        x0 : float
+            starting value of every path
+        rng : np.random.Generator
+            source of the draws; None draws from the global np.random, in the same order
+            as the former per-step loops
+    """
+
+    def __init__(self, x0=0, rng = None):
         self.__x0 = float(x0)
-    
-    def gen_gbm(self, mu, sigma, n_step, T = 1):
-        
-        if n_step < 30:
-            print("WARNING! The number of steps is small. It may not generate a good stochastic process sequence!")
-                
+        self.rng = rng
+
+    def gen_gbm(self, mu, sigma, n_step, T = 1, dtype = np.float64):
+
+        """ gen_gbm
+
+            Geometric Brownian motion path
+
+            Parameters
+            -----------------
+            mu : float
+                drift
+            sigma : float
+                volatility
+            n_step : int
+                number of steps
+            T : float
+                time horizon
+            dtype : type
+                np.float64 or np.float32
+
+            Returns
+            -----------------
+            path : array
+                n_step + 1 values starting at x0
+        """
+
+        return self.gen_gbms(mu, sigma, n_step, 1, T, dtype)[:,0]
+
+    def gen_gbms(self, mu, sigma, n_step, n_paths = 1, T = 1, dtype = np.float64, out = None, chunk_paths = None):
+
+        """ gen_gbms
+
+            Geometric Brownian motion paths, generated chunk_paths columns at a time so the
+            normal draws never take more than one chunk of memory; out may be a np.memmap
+            for path counts that do not fit in memory
+
+            Parameters
+            -----------------
+            mu : float
+                drift
+            sigma : float
+                volatility
+            n_step : int
+                number of steps
+            n_paths : int
+                number of paths
+            T : float
+                time horizon
+            dtype : type
+                np.float64 or np.float32
+            out : array
+                (n_step + 1 x n_paths) array to fill instead of allocating one
+            chunk_paths : int
+                paths generated per chunk, all at once when None
+
+            Returns
+            -----------------
+            paths : array
+                (n_step + 1 x n_paths) paths, one per column
+        """
+
+        self._check_steps(n_step)
+        paths = np.empty((n_step + 1, n_paths), dtype) if out is None else out
+        for (k0, block) in self.iter_gbms(mu, sigma, n_step, n_paths, T, dtype, chunk_paths):
+            paths[:, k0:k0 + block.shape[1]] = block
+        return paths
+
+    def iter_gbms(self, mu, sigma, n_step, n_paths = 1, T = 1, dtype = np.float64, chunk_paths = None):
+
+        """ iter_gbms
+
+            Geometric Brownian motion paths chunk by chunk, for consumers that reduce each
+            chunk and never hold all the paths
+
+            Parameters
+            -----------------
+            mu : float
+                drift
+            sigma : float
+                volatility
+            n_step : int
+                number of steps
+            n_paths : int
+                number of paths
+            T : float
+                time horizon
+            dtype : type
+                np.float64 or np.float32
+            chunk_paths : int
+                paths per chunk, all at once when None
+
+            Returns
+            -----------------
+            (k0, block) : generator
+                index of the first path and the (n_step + 1 x chunk) block of paths
+        """
+
+        dt = float(T) / n_step
+        chunk_paths = n_paths if chunk_paths == None else chunk_paths
+        for k0 in range(0, n_paths, chunk_paths):
+            n = min(chunk_paths, n_paths - k0)
+            block = np.empty((n_step + 1, n), dtype)
+            block[0] = self.__x0
+            # draws are taken path by path, as the loop over gen_gbm did
+            z = self._normal((n, n_step), dtype).T
+            z *= sigma * np.sqrt(dt)
+            z += (mu - 0.5 * sigma ** 2) * dt
+            np.cumsum(z, axis = 0, out = block[1:])
+            np.exp(block[1:], out = block[1:])
+            block[1:] *= self.__x0
+            yield k0, block
+
+    def stream_gbms(self, mu, sigma, n_step, n_paths = 1, T = 1, block_steps = 1024, dtype = np.float64):
+
+        """ stream_gbms
+
+            Geometric Brownian motion paths block by block along time, carrying the last
+            value of every path between blocks, so horizons of any length take constant memory
+
+            Parameters
+            -----------------
+            mu : float
+                drift
+            sigma : float
+                volatility
+            n_step : int
+                number of steps
+            n_paths : int
+                number of paths
+            T : float
+                time horizon
+            block_steps : int
+                steps per block
+            dtype : type
+                np.float64 or np.float32
+
+            Returns
+            -----------------
+            block : generator
+                (block_steps x n_paths) consecutive values; the first block starts with x0,
+                so the blocks stack to the n_step + 1 rows of gen_gbms
+        """
+
+        self._check_steps(n_step)
         dt = float(T) / n_step
-        path = np.zeros(n_step + 1, np.float64)
-        path[0] = self.__x0
-        for t in range(1, n_step + 1):
-            rand = np.random.standard_normal()
-            path[t] = path[t - 1] * np.exp((mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rand)
-        return path
-    
-    
-    def gen_gbms(self, mu, sigma, n_step, n_paths = 1, T = 1):
-        paths = np.zeros((n_step+1, n_paths), np.float64)
-        for k in range(n_paths):
-            paths[:,k] = self.gen_gbm(mu, sigma, n_step, T)
-        return paths      
-    
+        x = np.full(n_paths, self.__x0)
+        for t0 in range(0, n_step, block_steps):
+            z = self._normal((min(block_steps, n_step - t0), n_paths), np.float64)
+            z *= sigma * np.sqrt(dt)
+            z += (mu - 0.5 * sigma ** 2) * dt
+            np.cumsum(z, axis = 0, out = z)
+            np.exp(z, out = z)
+            z *= x
+            x = z[-1].copy()
+            yield self._start_block(z, t0, dtype)
+
+    def stream_random_walk(self, n_step, n_paths = 1, block_steps = 1024):
+
+        """ stream_random_walk
+
+            gen_random_walk paths block by block along time
+
+            Parameters
+            -----------------
+            n_step : int
+                number of values
+            n_paths : int
+                number of paths
+            block_steps : int
+                steps per block
+
+            Returns
+            -----------------
+            block : generator
+                (block_steps x n_paths) consecutive values; the first block starts with x0
+        """
+
+        if self.rng is None:
+            draw = lambda size: np.random.choice([1,-1], size = size)
+        else:
+            draw = lambda size: self.rng.choice([1,-1], size = size)
+        return self._stream_walk(draw, n_step, n_paths, block_steps)
+
+    def stream_normal(self, n_step, n_paths = 1, block_steps = 1024):
+
+        """ stream_normal
+
+            gen_normal paths block by block along time
+
+            Parameters
+            -----------------
+            n_step : int
+                number of values
+            n_paths : int
+                number of paths
+            block_steps : int
+                steps per block
+
+            Returns
+            -----------------
+            block : generator
+                (block_steps x n_paths) consecutive values; the first block starts with x0
+        """
+
+        return self._stream_walk(lambda size: self._normal(size, np.float64), n_step, n_paths, block_steps)
+
     def gen_random_walk(self, n_step=100):
-        
-        # Warning about the small number of steps
-        if n_step < 30:
-            print("WARNING! The number of steps is small. It may not generate a good stochastic process sequence!")
-        
-        w = np.ones(n_step)*self.x0
-        
-        for i in range(1,n_step):
-            # Sampling from the Normal distribution with probability 1/2
-            yi = np.random.choice([1,-1])
-            # Weiner process
-            w[i] = w[i-1]+(yi/np.sqrt(n_step))
-        
-        return w
-    
+
+        """ gen_random_walk
+
+            Random walk of +/- 1/sqrt(n_step) steps with probability 1/2
+
+            Parameters
+            -----------------
+            n_step : int
+                number of values
+
+            Returns
+            -----------------
+            path : array
+                n_step values starting at x0
+        """
+
+        self._check_steps(n_step)
+        if self.rng is None:
+            yi = np.random.choice([1,-1], size = n_step - 1)
+        else:
+            yi = self.rng.choice([1,-1], size = n_step - 1)
+        return self._walk(yi, n_step)
+
     def gen_normal(self, n_step=100):
+
+        """ gen_normal
+
+            Random walk of normal steps with variance 1/n_step
+
+            Parameters
+            -----------------
+            n_step : int
+                number of values
+
+            Returns
+            -----------------
+            path : array
+                n_step values starting at x0
+        """
+
+        self._check_steps(n_step)
+        return self._walk(self._normal(n_step - 1, np.float64), n_step)
+
+    def _walk(self, yi, n_step):
+        # Weiner process
+        w = np.empty(n_step)
+        w[0] = self.__x0
+        np.cumsum(yi / np.sqrt(n_step), out = w[1:])
+        w[1:] += self.__x0
+        return w
+
+    def _stream_walk(self, draw, n_step, n_paths, block_steps):
+        self._check_steps(n_step)
+        w = np.full(n_paths, self.__x0)
+        for t0 in range(0, n_step - 1, block_steps):
+            z = draw((min(block_steps, n_step - 1 - t0), n_paths)) / np.sqrt(n_step)
+            np.cumsum(z, axis = 0, out = z)
+            z += w
+            w = z[-1].copy()
+            yield self._start_block(z, t0, np.float64)
+
+    def _start_block(self, z, t0, dtype):
+        if t0 == 0:
+            return np.vstack((np.full((1, z.shape[1]), self.__x0), z)).astype(dtype, copy = False)
+        return z.astype(dtype, copy = False)
+
+    def _normal(self, size, dtype):
+        if self.rng is None:
+            return np.random.standard_normal(size).astype(dtype, copy = False)
+        return self.rng.standard_normal(size, dtype = dtype)
+
+    def _check_steps(self, n_step):
         if n_step < 30:
             print("WARNING! The number of steps is small. It may not generate a good stochastic process sequence!")
-        
-        w = np.ones(n_step)*self.x0
-        
-        for i in range(1,n_step):
-            # Sampling from the Normal distribution
-            yi = np.random.normal()
-            # Weiner process
-            w[i] = w[i-1]+(yi/np.sqrt(n_step))
-        
-        return w
-    
\ No newline at end of file
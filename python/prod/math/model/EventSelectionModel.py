@@ -18,15 +18,95 @@
 import numpy as np
 
 class EventSelectionModel():
+
+    """ Random selection between two or three events
+
+        Parameters
+        -----------------
+        rng : np.random.Generator
+            source of the draws; None draws from the global np.random
+    """
     
     FIRST = 0 
     SECOND = 1 
     THIRD = 1     
 
+    def __init__(self, rng = None):
+        self.__rng = np.random if rng is None else rng
+
     def bi_select(self, p):  
         p = max(min(p, 1), 0)
-        return np.random.choice(2, 1, p=[1-p,p])[0]
+        return int(self.__rng.random() < p)
     
     def tri_select(self, p1, p2):     
-        p3 = 1 - p1 - p2
-        return np.random.choice(3, 1, p=[p1, p2, p3])[0]    
\ No newline at end of file
+        u = self.__rng.random()
+        return 0 if u < p1 else (1 if u < p1 + p2 else 2)
+
+    def bi_select_n(self, p, n):
+
+        """ bi_select_n
+
+            n selections of the second event with probability p, in one draw
+
+            Parameters
+            -----------------
+            p : float
+                probability of the second event
+            n : int
+                number of selections
+
+            Returns
+            -----------------
+            events : array
+                n selections, 0 or 1
+        """
+
+        return (self.__rng.random(n) < p).astype(int)
+
+    def tri_select_n(self, p1, p2, n):
+
+        """ tri_select_n
+
+            n selections between three events, in one draw
+
+            Parameters
+            -----------------
+            p1 : float
+                probability of the first event
+            p2 : float
+                probability of the second event
+            n : int
+                number of selections
+
+            Returns
+            -----------------
+            events : array
+                n selections, 0, 1 or 2
+        """
+
+        return np.searchsorted([p1, p1 + p2], self.__rng.random(n), side = 'right')
+
+    def add_sub_n(self, p, n):
+
+        """ add_sub_n
+
+            n signs, +1 with probability p
+
+            Parameters
+            -----------------
+            p : float
+                probability of +1
+            n : int
+                number of signs
+
+            Returns
+            -----------------
+            signs : array
+                n signs, 1 or -1
+        """
+
+        if p >= 1:
+            return np.ones(n)
+        elif p <= 0:
+            return -np.ones(n)
+        return 2.0*self.bi_select_n(p, n) - 1
@@ -0,0 +1,156 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import numpy as np
+
+class JumpDiffusionModel():
+
+    """ Merton jump diffusion with Markov regime switching. Within regime r the log price
+        moves by (mu_r - sigma_r^2/2 - lambda_r k_r) dt + sigma_r dW plus Poisson(lambda_r dt)
+        jumps of N(jump_mean_r, jump_std_r^2) log size, k_r = E[e^J] - 1 keeping mu_r the
+        expected return; every step each path then switches regime by its row of trans_mat.
+        Paths are generated block by block along time, carrying prices and regimes between
+        blocks; scalar parameters give a single regime, and zero jump_rate plain GBM
+
+        Parameters
+        -----------------
+        x0 : float
+            starting price of every path
+        mu : float or array
+            drift of each regime
+        sigma : float or array
+            volatility of each regime
+        jump_rate : float or array
+            expected jumps per unit time of each regime
+        jump_mean : float or array
+            mean log jump size of each regime
+        jump_std : float or array
+            standard deviation of the log jump size of each regime
+        trans_mat : array
+            (R x R) per step regime transition probabilities, rows summing to 1
+        regime0 : int
+            starting regime of every path
+        rng : np.random.Generator
+            source of the draws; None draws from the global np.random
+    """
+
+    def __init__(self, x0, mu, sigma, jump_rate = 0, jump_mean = 0, jump_std = 0,
+                 trans_mat = None, regime0 = 0, rng = None):
+        self.x0 = float(x0)
+        (self.mu, self.sigma, self.jump_rate, self.jump_mean, self.jump_std) = np.broadcast_arrays(
+            *[np.atleast_1d(np.asarray(v, dtype = float)) for v in (mu, sigma, jump_rate, jump_mean, jump_std)])
+        n_regimes = len(self.mu)
+        self.trans_mat = np.eye(n_regimes) if trans_mat is None else np.asarray(trans_mat, dtype = float)
+        assert self.trans_mat.shape == (n_regimes, n_regimes), 'JumpDiffusionModel: TRANSITION MATRIX SHAPE'
+        assert np.allclose(self.trans_mat.sum(axis = 1), 1), 'JumpDiffusionModel: TRANSITION ROWS MUST SUM TO 1'
+        self.regime0 = regime0
+        self.rng = np.random if rng is None else rng
+        self.regimes = None
+
+    def gen_paths(self, n_step, n_paths = 1, T = 1, dtype = np.float64):
+
+        """ gen_paths
+
+            Whole paths, one per column
+
+            Parameters
+            -----------------
+            n_step : int
+                number of steps
+            n_paths : int
+                number of paths
+            T : float
+                time horizon
+            dtype : type
+                np.float64 or np.float32
+
+            Returns
+            -----------------
+            paths : array
+                (n_step + 1 x n_paths) prices starting at x0
+        """
+
+        paths = np.empty((n_step + 1, n_paths), dtype)
+        t = 0
+        for block in self.stream_paths(n_step, n_paths, T, dtype = dtype):
+            paths[t:t + len(block)] = block
+            t += len(block)
+        return paths
+
+    def stream_paths(self, n_step, n_paths = 1, T = 1, block_steps = 1024, dtype = np.float64):
+
+        """ stream_paths
+
+            Paths block by block along time, so horizons of any length take constant memory;
+            the regime of every path after the last block is kept in regimes
+
+            Parameters
+            -----------------
+            n_step : int
+                number of steps
+            n_paths : int
+                number of paths
+            T : float
+                time horizon
+            block_steps : int
+                steps per block
+            dtype : type
+                np.float64 or np.float32
+
+            Returns
+            -----------------
+            block : generator
+                (block_steps x n_paths) consecutive prices; the first block starts with x0,
+                so the blocks stack to n_step + 1 rows
+        """
+
+        dt = float(T) / n_step
+        kappa = np.exp(self.jump_mean + 0.5 * self.jump_std ** 2) - 1
+        drift = (self.mu - 0.5 * self.sigma ** 2 - self.jump_rate * kappa) * dt
+        vol = self.sigma * np.sqrt(dt)
+        x = np.full(n_paths, self.x0)
+        self.regimes = np.full(n_paths, self.regime0)
+        for t0 in range(0, n_step, block_steps):
+            n = min(block_steps, n_step - t0)
+            regimes = self._gen_regimes(n, n_paths)
+            n_jumps = self.rng.poisson(self.jump_rate[regimes] * dt)
+            z = self.rng.standard_normal((n, n_paths))
+            z *= vol[regimes]
+            z += drift[regimes]
+            z += self.jump_mean[regimes] * n_jumps
+            z += self.jump_std[regimes] * np.sqrt(n_jumps) * self.rng.standard_normal((n, n_paths))
+            np.cumsum(z, axis = 0, out = z)
+            np.exp(z, out = z)
+            z *= x
+            x = z[-1].copy()
+            if t0 == 0:
+                z = np.vstack((np.full((1, n_paths), self.x0), z))
+            yield z.astype(dtype, copy = False)
+
+    def _gen_regimes(self, n, n_paths):
+        # regime of each step and path; each step uses the regime the path is in as it starts
+        regimes = np.empty((n, n_paths), dtype = int)
+        if len(self.mu) == 1:
+            regimes.fill(0)
+            return regimes
+        cum_mat = np.cumsum(self.trans_mat, axis = 1)
+        u = self.rng.random((n, n_paths))
+        for t in range(n):
+            regimes[t] = self.regimes
+            self.regimes = np.minimum((u[t][:, None] > cum_mat[self.regimes]).sum(axis = 1), len(self.mu) - 1)
+        return regimes
@@ -18,26 +18,45 @@
 
 import numpy as np
 
+BUFFER_START = 8
+BUFFER_SIZE = 1024
+
 class TimeDeltaModel():   
+
+    """ Random time delays, negative binomial with one success and success probability p.
+        apply(n) draws n delays in one vectorized call; single delays read from a
+        prefetched buffer refilled in one call
+
+        Parameters
+        -----------------
+        no_time_delay : bool
+            always return zero delays
+        rng : np.random.Generator
+            source of the draws; None draws from the global np.random
+        buffer_size : int
+            largest number of draws prefetched at once
+    """
     
-    
-    def __init__(self, no_time_delay = False):
+    def __init__(self, no_time_delay = False, rng = None, buffer_size = BUFFER_SIZE):
         self.__no_time_delay = no_time_delay
+        self.__rng = np.random if rng is None else rng
+        self.__buffer_size = buffer_size
+        self.__buffer = np.empty(0, dtype = int)
+        self.__buffer_p = None
+        self.__pos = 0
 
     def apply(self, n = 1, p = 0.00001):  
         
         if(self.__no_time_delay):
             return [0] * n if n > 1 else 0
         elif(n == 1):
-            return np.random.negative_binomial(1, p)  
+            if self.__pos >= len(self.__buffer) or p != self.__buffer_p:
+                size = BUFFER_START if p != self.__buffer_p else min(max(2*len(self.__buffer), BUFFER_START), self.__buffer_size)
+                self.__buffer = self.__rng.negative_binomial(1, p, size)
+                self.__buffer_p = p
+                self.__pos = 0
+            rval = self.__buffer[self.__pos]
+            self.__pos += 1
+            return rval
         else:
-            
-            res = []
-            for k in range(n):
-                rval = np.random.negative_binomial(1, p)
-                res.append(rval)
-                
-            return np.array(res)              
-
-            
- 
\ No newline at end of file
+            return self.__rng.negative_binomial(1, p, n)
@@ -20,13 +20,40 @@ import numpy as np
 from .EventSelectionModel import EventSelectionModel
   
 MAX_TRADE = 10000    
+BUFFER_START = 8
+BUFFER_SIZE = 1024
     
 class TokenDeltaModel():
+
+    """ Random token amounts: Gamma distributed magnitudes with scale max_trade/5, signed +1
+        with probability p. Single delta() calls read from a prefetched buffer of draws that
+        is refilled in one vectorized call (growing from a few draws to buffer_size, since
+        processes such as Swap build a model per call), and sample() draws n amounts at once
+
+        Parameters
+        -----------------
+        max_trade : float
+            largest amount returned by apply and sample
+        shape : float
+            Gamma shape
+        scale : float
+            Gamma scale; delta uses max_trade/5
+        rng : np.random.Generator
+            source of the draws, may be shared across models; None draws from the global np.random
+        buffer_size : int
+            largest number of draws prefetched at once
+    """
     
-    def __init__(self, max_trade = 100, shape=1, scale=1):
+    def __init__(self, max_trade = 100, shape=1, scale=1, rng = None, buffer_size = BUFFER_SIZE):
         self.__shape = shape
         self.__scale = scale
         self.__max_trade = max_trade
+        self.__rng = np.random if rng is None else rng
+        self.__buffer_size = buffer_size
+        self.__buffer = np.empty(0)
+        self.__sign_buffer = np.empty(0)
+        self.__pos = 0
+        self.__sign_pos = 0
 
     def apply(self, n = 1):
         
@@ -34,22 +61,63 @@ class TokenDeltaModel():
             rval = self.delta(self.__max_trade)
             return min(rval, self.__max_trade)  
         else:
-    
-            res = []
-            for k in range(n):
-                rval = self.delta(self.__max_trade)
-                res.append(min(rval,self.__max_trade))
-                
-            return res  
+            return self.sample(n, self.__max_trade).tolist()
+
+    def sample(self, n, p = 1, clip = True):
+
+        """ sample
+
+            n signed amounts in single vectorized draws
+
+            Parameters
+            -----------------
+            n : int
+                number of amounts
+            p : float
+                probability of a positive amount
+            clip : bool
+                clip magnitudes at max_trade, as apply does; delta does not
+
+            Returns
+            -----------------
+            amounts : array
+                n token amounts
+        """
+
+        self.__scale = self.__max_trade/5
+        magnitudes = self.__scale*self.__rng.standard_gamma(self.__shape, n)
+        if clip:
+            np.minimum(magnitudes, self.__max_trade, out = magnitudes)
+        return EventSelectionModel(self.__rng).add_sub_n(p, n)*magnitudes
         
     def set_param(self, max_trade = 100, shape=1, scale=1):
+        if shape != self.__shape:
+            self.__buffer = np.empty(0)
+            self.__pos = 0
         self.__shape = shape
         self.__scale = scale
         self.__max_trade = max_trade        
         
     def delta(self, p=1):
         self.__scale = self.__max_trade/5
-        return self.add_sub(p)*np.random.gamma(self.__shape, self.__scale)   
+        if self.__pos >= len(self.__buffer):
+            self.__buffer = self.__rng.standard_gamma(self.__shape, self._refill_size(self.__buffer))
+            self.__pos = 0
+        magnitude = self.__buffer[self.__pos]
+        self.__pos += 1
+        return self.add_sub(p)*self.__scale*magnitude
     
     def add_sub(self, p):
-        return 1 if bool(EventSelectionModel().bi_select(p)) else -1     
\ No newline at end of file
+        if p >= 1:
+            return 1
+        elif p <= 0:
+            return -1
+        if self.__sign_pos >= len(self.__sign_buffer):
+            self.__sign_buffer = self.__rng.random(self._refill_size(self.__sign_buffer))
+            self.__sign_pos = 0
+        u = self.__sign_buffer[self.__sign_pos]
+        self.__sign_pos += 1
+        return 1 if u < p else -1
+
+    def _refill_size(self, buffer):
+        return min(max(2*len(buffer), BUFFER_START), self.__buffer_size)
@@ -3,3 +3,4 @@ from .TimeDeltaModel import *
 from .TokenDeltaModel import *
 from .BrownianModel import *
 from .ModelQueue import *
+from .JumpDiffusionModel import *
@@ -0,0 +1,153 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import numpy as np
+
+class DrawdownTracker():
+
+    """ Incremental maximum percentage drop of a series observed one value (or one block of
+        values) at a time; keeps the running peak and the largest drop so far, so each
+        observation costs O(1) and history is never re-scanned. Values may be scalars or
+        arrays holding one path each; the points match MaxDrop.apply on the whole series
+    """
+
+    def __init__(self):
+        self.__n = 0
+        self.__peak = None
+        self.__peak_idx = None
+        self.__drawdown = None
+        self.__drop = None
+        self.__pnt1 = None
+        self.__pnt2 = None
+        self.__scalar = True
+
+    def update(self, x):
+
+        """ update
+
+            Add the next observation
+
+            Parameters
+            ----------
+            x : float or numpy.array, shape (n_paths,)
+                Next value of the series, or of every path
+
+            Returns
+            -------
+            drawdown : float or numpy.array
+                Drop of the observation from the running peak
+        """
+
+        x = np.asarray(x, dtype = float)
+        if self.__n == 0:
+            self._init(x[None])
+        x = x.reshape(-1)
+        is_new = x > self.__peak
+        self.__peak = np.where(is_new, x, self.__peak)
+        self.__peak_idx = np.where(is_new, self.__n, self.__peak_idx)
+        self.__drawdown = (self.__peak - x)/self.__peak
+        worse = self.__drawdown > self.__drop
+        if worse.any():
+            self.__drop = np.where(worse, self.__drawdown, self.__drop)
+            self.__pnt1 = (np.where(worse, self.__peak_idx, self.__pnt1[0]), np.where(worse, self.__peak, self.__pnt1[1]))
+            self.__pnt2 = (np.where(worse, self.__n, self.__pnt2[0]), np.where(worse, x, self.__pnt2[1]))
+        self.__n += 1
+        return self._out(self.__drawdown)
+
+    def update_block(self, arr):
+
+        """ update_block
+
+            Add the next observations at once, e.g. a block of a price path stream
+
+            Parameters
+            ----------
+            arr : numpy.array, shape (n_samples,) or (n_samples, n_paths)
+                Next values of the series, or one path per column
+
+            Returns
+            -------
+            drawdown : float or numpy.array
+                Drop of the last observation from the running peak
+        """
+
+        arr = np.asarray(arr, dtype = float)
+        if self.__n == 0:
+            self._init(arr)
+        arr = arr.reshape(len(arr), -1)
+        n = len(arr)
+        idx = self.__n + np.arange(n)[:, None]
+
+        # running peak, carried in from the previous block; first occurrence on ties
+        running = np.maximum.accumulate(np.vstack((self.__peak, arr)), axis = 0)
+        is_new = arr > running[:-1]
+        peak_idx = np.maximum.accumulate(np.vstack((self.__peak_idx, np.where(is_new, idx, -1))), axis = 0)[1:]
+        peak = running[1:]
+
+        d_downs = (peak - arr)/peak
+        k = np.argmax(d_downs, axis = 0)
+        cols = np.arange(arr.shape[1])
+        worse = d_downs[k, cols] > self.__drop
+        self.__drop = np.where(worse, d_downs[k, cols], self.__drop)
+        self.__pnt1 = tuple(np.where(worse, v, p) for v, p in zip((peak_idx[k, cols], peak[k, cols]), self.__pnt1))
+        self.__pnt2 = tuple(np.where(worse, v, p) for v, p in zip((k + self.__n, arr[k, cols]), self.__pnt2))
+
+        self.__peak = peak[-1]
+        self.__peak_idx = peak_idx[-1]
+        self.__drawdown = d_downs[-1]
+        self.__n += n
+        return self._out(self.__drawdown)
+
+    def get_drawdown(self):
+        return self._out(self.__drawdown)
+
+    def get_drop(self):
+
+        """ get_drop
+
+            Maximum percentage drop so far
+
+            Returns
+            -------
+            drop : float or numpy.array
+                Maximum percentage drop
+        """
+
+        return self._out(self.__drop)
+
+    def get_pnt1(self):
+        return tuple(self._out(v) for v in self.__pnt1)
+
+    def get_pnt2(self):
+        return tuple(self._out(v) for v in self.__pnt2)
+
+    def get_peak(self):
+        return self._out(self.__peak)
+
+    def _init(self, arr):
+        self.__scalar = arr.ndim == 1
+        n_paths = 1 if arr.ndim == 1 else arr.shape[1]
+        self.__peak = np.full(n_paths, -np.inf)
+        self.__peak_idx = np.zeros(n_paths, dtype = int)
+        self.__drop = np.zeros(n_paths)
+        first = arr[0].reshape(n_paths)
+        self.__pnt1 = (np.zeros(n_paths, dtype = int), first.copy())
+        self.__pnt2 = (np.zeros(n_paths, dtype = int), first.copy())
+
+    def _out(self, v):
+        return v[0] if self.__scalar else v
@@ -21,7 +21,8 @@ import numpy as np
 class MaxDrop():
 
     """ Determine maximum percentage drop for any numerical array along with its
-        starting and end points
+        starting and end points; running maximums are accumulated in O(N), and 2-D
+        arrays hold one path per column
     """   
     
     def __init__(self):
@@ -37,22 +38,24 @@ class MaxDrop():
 
             Parameters
             ----------
-            arr : numpy.array, shape (n_samples, 1)
-                Numerical array 
+            arr : numpy.array, shape (n_samples,) or (n_samples, n_paths)
+                Numerical array, or one path per column 
 
             Returns
             -------
             x pnt, y pnt, drop : tuple, tuple, float
-                Array of optimized leverage values              
+                Start and end points of the maximum drop and the drop; arrays per path
+                for a 2-D input              
         """        
         
-        d_downs = self.calc_drawdowns(arr)
-        arg_maxis = self.calc_arg_maximums(arr)
+        arr = np.asarray(arr)
         maxis = self.calc_maximums(arr)
-        idx = np.argmax(d_downs)
-        self.__pnt1 = (arg_maxis[idx], maxis[idx])
-        self.__pnt2 = (idx, arr[idx])
-        self.__drop = self.calc_drop()
+        arg_maxis = self.calc_arg_maximums(arr)
+        idx = np.argmax((maxis - arr)/maxis, axis = 0)
+        cols = () if arr.ndim == 1 else (np.arange(arr.shape[1]),)
+        self.__pnt1 = (arg_maxis[(idx,) + cols], maxis[(idx,) + cols])
+        self.__pnt2 = (idx, arr[(idx,) + cols])
+        self.__drop = self.calc()
         return self.__pnt1, self.__pnt2, self.__drop  
  
     def calc(self):
@@ -128,19 +131,19 @@ class MaxDrop():
             
             Parameters
             ----------
-            arr_in : numpy.array, shape (n_samples, 1)
+            arr_in : numpy.array, shape (n_samples,) or (n_samples, n_paths)
                 Numerical array  
              
             Returns
             -------
-            maximums : numpy.array, shape (n_samples, 1)
+            maximums : numpy.array, shape (n_samples,) or (n_samples, n_paths)
                 Generate monotone increasing array representing max events at every increase            
         """         
         
-        N = len(arr_in)
-        m = lambda arr, k: max(arr[:k]) if k > 0 else arr[0]   
-        maximums = np.array([m(arr_in, k) for k in range(N)])
-        return maximums 
+        # maximum of the values before k, arr[0] at k = 0
+        arr_in = np.asarray(arr_in)
+        running = np.maximum.accumulate(arr_in, axis = 0)
+        return np.concatenate((arr_in[:1], running[:-1]), axis = 0)
 
     def calc_arg_maximums(self, arr_in):  
         
@@ -151,19 +154,22 @@ class MaxDrop():
             
             Parameters
             ----------
-            arr_in : numpy.array, shape (n_samples, 1)
+            arr_in : numpy.array, shape (n_samples,) or (n_samples, n_paths)
                 Numerical array  
              
             Returns
             -------
-            maximums : numpy.array, shape (n_samples, 1)
+            maximums : numpy.array, shape (n_samples,) or (n_samples, n_paths)
                 Monotone increasing array representing max events at every increase            
         """          
         
-        N = len(arr_in)
-        arg_m = lambda arr, k: np.argmax(arr[:k]) if k > 0 else 0  
-        arg_maximums = np.array([arg_m(arr_in, k) for k in range(N)])
-        return arg_maximums 
+        # index of the first maximum before k, 0 at k = 0
+        arr_in = np.asarray(arr_in)
+        running = np.maximum.accumulate(arr_in, axis = 0)
+        idx = np.arange(len(arr_in)).reshape((-1,) + (1,)*(arr_in.ndim - 1))
+        is_new = np.concatenate((np.ones_like(arr_in[:1], dtype = bool), arr_in[1:] > running[:-1]), axis = 0)
+        arg_running = np.maximum.accumulate(np.where(is_new, idx, 0), axis = 0)
+        return np.concatenate((np.zeros_like(arg_running[:1]), arg_running[:-1]), axis = 0)
     
     def calc_drawdowns(self, arr):
         
@@ -174,15 +180,16 @@ class MaxDrop():
             
             Parameters
             ----------
-            arr : numpy.array, shape (n_samples, 1)
+            arr : numpy.array, shape (n_samples,) or (n_samples, n_paths)
                 Numerical array  
              
             Returns
             -------
-            running drawdowns : numpy.array, shape (n_samples, 1)
+            running drawdowns : numpy.array, shape (n_samples,) or (n_samples, n_paths)
                 Running drawdowns from every max event of input array           
         """      
     
+        arr = np.asarray(arr)
         maxis = self.calc_maximums(arr)
         return (maxis - arr)/maxis
 
@@ -194,17 +201,14 @@ class MaxDrop():
             
             Parameters
             ----------
-            arr : numpy.array, shape (n_samples, 1)
+            arr : numpy.array, shape (n_samples,) or (n_samples, n_paths)
                 Numerical array  
              
             Returns
             -------
-            Maximum drawdown : float
+            Maximum drawdown : float or numpy.array
                 Maximum drawdown from input array           
         """         
         
-        maxis = self.calc_maximums(arr)
-        d_downs = (maxis - arr)/maxis
-        idx = np.argmax(d_downs) 
-        return d_downs[idx] 
+        return np.max(self.calc_drawdowns(arr), axis = 0)
         
\ No newline at end of file
@@ -1 +1,2 @@
-from .MaxDrop import *
\ No newline at end of file
+from .MaxDrop import *
+from .DrawdownTracker import *
\ No newline at end of file
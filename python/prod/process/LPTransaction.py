@@ -0,0 +1,95 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+from ..utils.tools import UndoLog
+
+class LPTransaction():
+    
+    """ Transaction over the pools of a factory and everything a block of processes touches 
+        with them (the pools, their pair tokens, IndexVault and Wallets accounts). The pools 
+        and tokens record the old value of each field on its first write, so rolling back 
+        costs O(mutations) instead of a snapshot of the whole state; the block is rolled back 
+        if it raises and kept otherwise. Pools of other factories are not recorded, and a 
+        block that trades on them as well is wrapped in a nested transaction for each factory. 
+        Transactions nest, and rollback() can be called inside the block to discard a 
+        speculative attempt and retry from the same state
+
+        Parameters
+        -----------------
+        factory : UniswapFactory
+            factory whose pools the block works on; the FactoryData of one of its pools 
+            (lp.factory) works as well
+    """  
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.log = None
+
+    def __enter__(self):
+        self.log = UndoLog.begin(self.factory)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type != None:
+            self.log.abort()
+        else:
+            self.log.commit()
+        self.log = None
+        return False
+
+    def rollback(self):
+        
+        """ rollback
+
+            Undo every write since the transaction began, or since the last rollback; the 
+            transaction stays open
+        """   
+
+        assert self.log != None, 'LPTransaction: NOT_OPEN'
+        self.log.rollback()
+
+    def get_n_mutations(self):
+        
+        """ get_n_mutations
+
+            Number of undo entries recorded so far
+        """   
+
+        return 0 if self.log == None else len(self.log)
+
+def lp_tx(factory):
+    
+    """ lp_tx
+
+        Transaction context for a block of processes on the pools of a factory, e.g. 
+        
+            with lp_tx(factory) as tx:
+                SwapDeposit().apply(lp, tkn, user_nm, amt)
+                
+        Parameters
+        -----------------
+        factory : UniswapFactory
+            factory whose pools the block works on
+                
+        Returns
+        -----------------
+        tx : LPTransaction
+            transaction context                  
+    """   
+
+    return LPTransaction(factory)
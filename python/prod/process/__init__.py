@@ -1 +1,2 @@
-from .Process import Process
\ No newline at end of file
+from .Process import Process
+from .LPTransaction import LPTransaction, lp_tx
@@ -16,15 +16,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License
 import math
-from scipy import optimize
+import numpy as np
 from ..Process import Process
 from ..liquidity import AddLiquidity
 from ..swap import Swap
+from ..swap import WithdrawSwap
 from ...math.model import TokenDeltaModel
 from ...math.model import EventSelectionModel
 from ...utils.data import UniswapExchangeData
 from ...utils.tools.v3 import UniV3Helper
-from ...utils.tools.v3 import TickMath
 from ...utils.tools.v3 import FullMath
 from ...utils.tools import SaferMath
 
@@ -118,6 +118,99 @@ class SwapDeposit(Process):
                             
         return deposited  
 
+    def apply_batch(self, lp, token_in, users, amounts, lwr_tick = None, upr_tick = None):
+
+        """ apply_batch
+
+            Swap deposit for many users at once. Negative amounts are withdrawals, as in
+            WithdrawSwap, netted against the deposits: the opposing tokens the withdrawals
+            release go to the depositors, and only the imbalance left is swapped, in one
+            aggregate swap. Everybody trades at the average price of that swap, and the
+            deposits are added pro rata to each user's amount. Amounts of a user listed more
+            than once are added first. Per user amounts agree with sequential apply calls to
+            within the price impact of the aggregate swap plus the fee saved on netted flows
+
+            Parameters
+            -------
+            lp : Exchange
+                LP exchange
+            token_in : ERC20
+                specified ERC20 token
+            users : list
+                account names
+            amounts : list
+                token amount to be deposited by each user; negative to withdraw
+            lwr_tick : int
+                lower tick of the position in which to add liquidity
+            upr_tick : int
+                upper tick of the position in which to add liquidity
+
+            Returns
+            -------
+            deposited : dictionary
+                amount deposited per user, negative for the amount withdrawn
+        """
+
+        withdrawSwap = WithdrawSwap(self.ev, self.tDel)
+        (names, amounts) = withdrawSwap.net_flows(users, amounts)
+        deposits = [max(amt, 0) for amt in amounts]
+        withdrawals = [max(-amt, 0) for amt in amounts]
+        total_in = sum(deposits)
+        if(total_in <= 0):
+            withdrawn = withdrawSwap.apply_batch(lp, token_in, names, withdrawals, lwr_tick, upr_tick)
+            return {user_nm: -amt for (user_nm, amt) in withdrawn.items()}
+
+        # Step 1: withdrawals, whose opposing tokens are held for the depositors
+        (out_amts, held_amts) = withdrawSwap.withdraw_batch(lp, token_in, names, withdrawals, lwr_tick, upr_tick)
+        total_held = sum(held_amts)
+
+        # Step 2: one swap for the imbalance; sold for bought is the price everybody gets
+        (swap_token, swap_amt, sold) = self._calc_batch_swap(lp, token_in, total_in, total_held, lwr_tick, upr_tick)
+        swap_out = abs(Swap().apply(lp, swap_token, names[0], swap_amt)) if swap_amt > 0 else 0
+        if(swap_out == 0):
+            bought = total_held
+        elif(swap_token.token_name == token_in.token_name):
+            bought = total_held + swap_out
+            sold = bought*swap_amt/swap_out
+        else:
+            bought = total_held - swap_amt
+            sold = bought*swap_out/swap_amt
+        paid_out = sold - swap_amt if swap_token.token_name == token_in.token_name else sold + swap_out
+
+        # Step 3: deposit pro rata
+        deposited = {}
+        if(lp.version == UniswapExchangeData.VERSION_V2):
+            for (user_nm, amt) in zip(names, deposits):
+                if(amt <= 0):
+                    continue
+                if(token_in.token_name == lp.token1):
+                    balance0 = bought*amt/total_in
+                    balance1 = lp.quote(balance0, lp.reserve0, lp.reserve1)
+                    deposited[user_nm] = balance1 + sold*amt/total_in
+                elif(token_in.token_name == lp.token0):
+                    balance1 = bought*amt/total_in
+                    balance0 = lp.quote(balance1, lp.reserve1, lp.reserve0)
+                    deposited[user_nm] = balance0 + sold*amt/total_in
+                lp.add_liquidity(user_nm, balance0, balance1, balance0, balance1)
+
+        elif(lp.version == UniswapExchangeData.VERSION_V3):
+            sqrt_P = lp.slot0.sqrtPriceX96/2**96
+            if(token_in.token_name == lp.token0):
+                liq = UniV3Helper().calc_Ly(sqrt_P, bought, lwr_tick, upr_tick)
+                total_deposited = liq/sqrt_P + sold
+            elif(token_in.token_name == lp.token1):
+                liq = UniV3Helper().calc_Lx(sqrt_P, bought, lwr_tick, upr_tick)
+                total_deposited = liq*sqrt_P + sold
+            for (user_nm, amt) in zip(names, deposits):
+                if(amt > 0):
+                    lp.mint(user_nm, lwr_tick, upr_tick, liq*amt/total_in)
+                    deposited[user_nm] = total_deposited*amt/total_in
+
+        for (user_nm, amt, out_amt, held_amt) in zip(names, withdrawals, out_amts, held_amts):
+            if(amt > 0):
+                deposited[user_nm] = -(out_amt + paid_out*held_amt/total_held)
+        return deposited
+
     def get_trading_token(self, lp, token):
         
         """ get_trading_token
@@ -142,20 +235,109 @@ class SwapDeposit(Process):
         return trading_token       
 
 
+    def calc_univ3_deposit_portions(self, lp, token_in, amounts, lwr_tick, upr_tick):
+
+        """ calc_univ3_deposit_portions
+
+            Portions of many single token V3 deposits to swap, solved at once in closed form
+            against the current pool state
+
+            Parameters
+            -------
+            lp : Exchange
+                LP exchange
+            token_in : ERC20
+                specified ERC20 token
+            amounts : array
+                token amounts to be deposited
+            lwr_tick : int
+                lower tick of the position in which to add liquidity
+            upr_tick : int
+                upper tick of the position in which to add liquidity
+
+            Returns
+            -------
+            alpha : array
+                portion of each amount to swap
+        """
+
+        amounts = np.asarray(amounts, dtype = float)
+        L = lp.get_liquidity()
+        (t0, lo, hi) = self._get_univ3_sqrt_prices(lp, token_in, lwr_tick, upr_tick)
+
+        # swapping d of amount A moves t0 to t = t0 + g*d/L and pays out g*d/(t0*t), which
+        # the position must pair with the A - d left: (A - d)*t0*(hi - t) = g*d*hi*(t - lo)
+        g = 997/1000
+        k = g/L
+        a = k*(t0 - g*hi)
+        b = -t0*amounts*k - t0*(hi - t0) - g*hi*(t0 - lo)
+        c = t0*amounts*(hi - t0)
+
+        # positive root d = 2c/(-b + sqrt(b^2 - 4ac)), which stays exact as a -> 0, over A
+        alpha = 2*t0*(hi - t0)/(-b + np.sqrt(b*b - 4*a*c))
+        return np.clip(alpha, 0, 1)
+
+    def _get_univ3_sqrt_prices(self, lp, token_in, lwr_tick, upr_tick):
+        sqrtp_cur = lp.slot0.sqrtPriceX96/2**96
+        sqrtp_pa = lp.sqrt_ratio_cache.getSqrtRatioAtTick(lwr_tick)/2**96
+        sqrtp_pb = lp.sqrt_ratio_cache.getSqrtRatioAtTick(upr_tick)/2**96
+
+        # in the sqrt price of the token put in, as UniV3Helper.quote prices it
+        if(token_in.token_name == lp.token0):
+            return (1/sqrtp_cur, 1/sqrtp_pb, 1/sqrtp_pa)
+        elif(token_in.token_name == lp.token1):
+            return (sqrtp_cur, sqrtp_pa, sqrtp_pb)
+
+    def _calc_batch_swap(self, lp, token_in, amt_in, amt_held, lwr_tick, upr_tick):
+
+        # Depositors of amt_in sell s of it for the amt_held opposing tokens of withdrawals
+        # plus the output of a swap of n into the pool (or the amt_held less a swap of m out
+        # of it), at the average price of that swap, and then deposit the rest in the ratio of
+        # the pool after it; both directions make n (or m) the root of a quadratic. Within
+        # the fee band neither has a root, and the flows clear with no swap at the pool ratio
+        g = 997/1000
+        (A, Yw) = (amt_in, amt_held)
+        trading_token = self.get_trading_token(lp, token_in)
+        if(lp.version == UniswapExchangeData.VERSION_V2):
+            x = lp.get_reserve(token_in)
+            y = lp.get_reserve(trading_token)
+            c_in = x*(Yw*x*(1 + g)/g - A*y)
+            if(c_in < 0):
+                return (token_in, self._calc_root(g*(Yw + y), x*(Yw + (1 + g)*(Yw + y)), c_in), A)
+            c_out = y*(A*y - (1 + g)*x*Yw)
+            if(c_out < 0):
+                return (trading_token, self._calc_root(g*(A + x), (1 + g)*y*(A + x) - g*x*Yw, c_out), 0)
+            return (token_in, 0, A - Yw*x/y)
+
+        elif(lp.version == UniswapExchangeData.VERSION_V3):
+            (t0, lo, hi) = self._get_univ3_sqrt_prices(lp, token_in, lwr_tick, upr_tick)
+            k = g/lp.get_liquidity()
+            (W0, W1) = (Yw*t0**2, Yw*t0*k + g)
+            (B0, B1) = (g*hi*(t0 - lo) + t0*(hi - t0), k*(g*hi - t0))
+            c_in = W0*B0 - A*t0*g*(hi - t0)
+            if(c_in < 0):
+                return (token_in, self._calc_root(W1*B1, W0*B1 + W1*B0 + A*t0*g*k, c_in), A)
+            u0 = 1/t0
+            (C0, C1) = (hi - g*t0 + hi*(g*t0 - lo)*u0, hi*(g*t0 - lo)*k)
+            c_out = A*u0*(hi*u0 - 1) - Yw*C0
+            if(c_out < 0):
+                return (trading_token, self._calc_root(A*hi*k**2 + C1, A*k*(2*hi*u0 - 1) - Yw*C1 + C0, c_out), 0)
+            return (token_in, 0, A - Yw*(t0 - lo)/(1/t0 - 1/hi))
+
+    def _calc_root(self, a, b, c):
+        # root of a*x^2 + b*x + c, c < 0, that tends to -c/b as a -> 0
+        radical = math.sqrt(b*b - 4*a*c)
+        return -2*c/(b + radical) if b >= 0 else (radical - b)/(2*a)
+
     def _calc_univ3_deposit_portion(self, lp, tkn, amt_tkn_in, lwr_tick, upr_tick):
-        bnds = [(0.35, 0.65)]
-        opt_tol = 1e-8
-        res = optimize.minimize(self._obj_func, x0 = 0.5, bounds=bnds, 
-                                args=(amt_tkn_in, lp, tkn, lwr_tick, upr_tick), 
-                                method='Nelder-Mead', tol=opt_tol)
-        return res.x[0]
+        return float(self.calc_univ3_deposit_portions(lp, tkn, amt_tkn_in, lwr_tick, upr_tick))
     
     def _obj_func(self, alpha, amt_tkn_in, lp, token_in, lwr_tick, upr_tick):
         opt_tol = 1e-8         
         swap_in = amt_tkn_in*alpha
         amt_tkn0, sqrtp_cur  = UniV3Helper().quote(lp, token_in, swap_in, lwr_tick, upr_tick)
-        sqrtp_pa = TickMath.getSqrtRatioAtTick(lwr_tick)/2**96
-        sqrtp_pb = TickMath.getSqrtRatioAtTick(upr_tick)/2**96    
+        sqrtp_pa = lp.sqrt_ratio_cache.getSqrtRatioAtTick(lwr_tick)/2**96
+        sqrtp_pb = lp.sqrt_ratio_cache.getSqrtRatioAtTick(upr_tick)/2**96    
         
         if(token_in.token_name == lp.token0):
             sqrtp_cur = 1/sqrtp_cur
@@ -100,6 +100,122 @@ class WithdrawSwap(Process):
         return withdrawn 
 
 
+    def apply_batch(self, lp, token_out, users, amounts, lwr_tick = None, upr_tick = None):
+
+        """ apply_batch
+
+            Withdraw for many users at once: liquidity is removed pro rata to one withdrawal
+            portion solved for the total, and the opposing tokens of all users are swapped in
+            one aggregate swap, whose output is shared pro rata to what each user put in.
+            Amounts of a user listed more than once are added first. Per user amounts agree
+            with sequential apply calls to within the price impact of the aggregate swap
+
+            Parameters
+            -------
+            lp : Exchange
+                LP exchange
+            token_out : ERC20
+                specified ERC20 token
+            users : list
+                account names
+            amounts : list
+                token amount to be withdrawn by each user
+            lwr_tick : int
+                lower tick of the position from which to remove liquidity
+            upr_tick : int
+                upper tick of the position from which to remove liquidity
+
+            Returns
+            -------
+            withdrawn : dictionary
+                amount of withdrawn token per user
+        """
+
+        (names, amounts) = self.net_flows(users, amounts)
+        (out_amts, trading_amts) = self.withdraw_batch(lp, token_out, names, amounts, lwr_tick, upr_tick)
+
+        # Step 2: one swap for everybody
+        trading_token = self.get_trading_token(lp, token_out)
+        total = sum(trading_amts)
+        out = abs(Swap().apply(lp, trading_token, names[0], total)) if total > 0 else 0
+        return {user_nm: out_amt + out*trading_amt/total if total > 0 else out_amt
+                for (user_nm, out_amt, trading_amt) in zip(names, out_amts, trading_amts)}
+
+    def withdraw_batch(self, lp, token_out, users, amounts, lwr_tick = None, upr_tick = None):
+
+        """ withdraw_batch
+
+            Step 1 of apply_batch: remove the liquidity of each user pro rata to the
+            withdrawal portion of the total amount, without swapping
+
+            Parameters
+            -------
+            lp : Exchange
+                LP exchange
+            token_out : ERC20
+                specified ERC20 token
+            users : list
+                account names, each listed once
+            amounts : list
+                token amount to be withdrawn by each user
+            lwr_tick : int
+                lower tick of the position from which to remove liquidity
+            upr_tick : int
+                upper tick of the position from which to remove liquidity
+
+            Returns
+            -------
+            (out_amts, trading_amts) : list, list
+                amounts of specified and opposing token removed for each user
+        """
+
+        total = sum(amounts)
+        if(total <= 0):
+            return ([0]*len(users), [0]*len(users))
+
+        if(lp.version == UniswapExchangeData.VERSION_V2):
+            p_out = self._calc_univ2_withdraw_portion(lp, token_out, total, lwr_tick, upr_tick)
+        elif(lp.version == UniswapExchangeData.VERSION_V3):
+            p_out = self._calc_univ3_withdraw_portion(lp, token_out, total, lwr_tick, upr_tick)
+
+        trading_token = self.get_trading_token(lp, token_out)
+        removeLiq = RemoveLiquidity()
+        out_amts = []
+        trading_amts = []
+        for (user_nm, amt) in zip(users, amounts):
+            if(amt <= 0):
+                out_amts.append(0)
+                trading_amts.append(0)
+                continue
+            res = removeLiq.apply(lp, token_out, user_nm, p_out*amt, lwr_tick, upr_tick)
+            out_amts.append(abs(res[token_out.token_name]))
+            trading_amts.append(abs(res[trading_token.token_name]))
+        return (out_amts, trading_amts)
+
+    def net_flows(self, users, amounts):
+
+        """ net_flows
+
+            Add up the amounts of users listed more than once
+
+            Parameters
+            -------
+            users : list
+                account names
+            amounts : list
+                token amounts
+
+            Returns
+            -------
+            (names, amounts) : list, list
+                each user once, in order of first appearance, with their total amount
+        """
+
+        totals = {}
+        for (user_nm, amt) in zip(users, amounts):
+            totals[user_nm] = totals.get(user_nm, 0) + amt
+        return (list(totals.keys()), list(totals.values()))
+
     def get_trading_token(self, lp, token):
         
         """ get_trading_token
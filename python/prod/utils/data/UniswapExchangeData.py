@@ -22,6 +22,9 @@ from ...erc import ERC20
 
 DEFAULT_VERSION = 'V2'
 DEFAULT_TYPE = 'DEC'
+DEFAULT_TICK_SEARCH = 'INDEX'
+DEFAULT_EXECUTION = 'CHECKED'
+DEFAULT_FEE_LEDGER = 'ARRAY'
 
 @dataclass
 class UniswapExchangeData(ExchangeData):
@@ -31,10 +34,27 @@ class UniswapExchangeData(ExchangeData):
 
     TYPE_DEC = DEFAULT_TYPE
     TYPE_GWEI = 'GWEI'    
+
+    TICK_SEARCH_INDEX = DEFAULT_TICK_SEARCH
+    TICK_SEARCH_BITMAP = 'BITMAP'
+
+    EXECUTION_CHECKED = DEFAULT_EXECUTION
+    EXECUTION_UNCHECKED = 'UNCHECKED'
+
+    FEE_LEDGER_AGGREGATE = 'AGGREGATE'
+    FEE_LEDGER_RING = 'RING'
+    FEE_LEDGER_ARRAY = DEFAULT_FEE_LEDGER
         
     tkn0: ERC20
     tkn1: ERC20 
     version: str = DEFAULT_VERSION
     precision: str = DEFAULT_TYPE
     tick_spacing: int = None   
-    fee: int = None
\ No newline at end of file
+    fee: int = None
+    tick_search: str = DEFAULT_TICK_SEARCH
+    execution: str = DEFAULT_EXECUTION
+    fee_ledger: str = DEFAULT_FEE_LEDGER
+    fee_ledger_size: int = None
+    fee_ledger_spill_dir: str = None
+    fee_ledger_dtype: object = object
+    journal: bool = False
@@ -2,4 +2,6 @@ from .ExchangeData import ExchangeData
 from .FactoryData import FactoryData
 from .UniswapExchangeData import UniswapExchangeData
 from .Chain0x import Chain0x
-from .LPType import LPType
\ No newline at end of file
+from .LPType import LPType
+from .PoolSnapshot import PoolSnapshot
+from .Route import Route
@@ -0,0 +1,124 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import copy
+from .UndoLog import MISSING
+
+class CopyOnWriteDict(dict):
+    
+    """ dict whose value objects can be shared with forks of it; a shared value is copied the 
+        first time it is fetched by key, so values mutated in place after a lookup (TickInfo, 
+        PositionInfo, sets) never leak between forks. Iterating values() or items() returns 
+        the shared objects and is meant for reading only. The same copy keeps a value recorded 
+        in an UndoLog (record_undo) intact while the pool mutates its own copy
+    """ 
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.owned = set(self.keys())
+
+    def fork(self):
+        
+        """ fork
+
+            Shallow copy of the mapping; from here on every value is shared between self and 
+            the fork until it is fetched by key from either of them
+                
+            Returns
+            -----------------
+            forked : CopyOnWriteDict
+                Copy of the mapping sharing all value objects        
+        """   
+
+        forked = CopyOnWriteDict()
+        dict.update(forked, self)
+        forked.owned = set()
+        self.owned = set()
+        return forked
+
+    def peek(self, key):
+        
+        """ peek
+
+            Read-only lookup that returns the value without taking a private copy of it
+                
+            Parameters
+            -----------------
+            key : hashable
+                key of the value        
+        """   
+
+        return dict.__getitem__(self, key)
+
+    def record_undo(self, log, key):
+        
+        """ record_undo
+
+            Record the value of key in an UndoLog before it is changed; the next fetch of the 
+            key takes a private copy, so the recorded value is left as it was
+                
+            Parameters
+            -----------------
+            log : UndoLog
+                log of the open transaction
+            key : hashable
+                key of the value        
+        """   
+
+        if log.record(self, key, self._undo_item, key, dict.get(self, key, MISSING)):
+            self.owned.discard(key)
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if key not in self.owned:
+            value = copy.copy(value)
+            dict.__setitem__(self, key, value)
+            self.owned.add(key)
+        return value
+
+    def get(self, key, default = None):
+        return self[key] if key in self else default
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self.owned.add(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self.owned.discard(key)
+
+    def pop(self, key, *default):
+        self.owned.discard(key)
+        return dict.pop(self, key, *default)
+
+    def __copy__(self):
+        return self.fork()
+
+    def __deepcopy__(self, memo):
+        return CopyOnWriteDict({key: copy.deepcopy(value, memo) for key, value in dict.items(self)})
+
+    def __reduce__(self):
+        return (CopyOnWriteDict, (dict(self),))
+
+    def _undo_item(self, key, value):
+        if value is MISSING:
+            dict.pop(self, key, None)
+        else:
+            dict.__setitem__(self, key, value)
+        ## a restored value may have been shared by a fork taken during the transaction
+        self.owned.discard(key)
@@ -0,0 +1,203 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import numpy as np
+import pandas as pd
+
+EVENT_SWAP = 0
+EVENT_MINT = 1
+EVENT_BURN = 2
+EVENT_COLLECT = 3
+EVENT_NAMES = ['swap', 'mint', 'burn', 'collect']
+DEFAULT_CHUNK_SIZE = 16_384
+
+# Column name -> dtype; amounts are pool deltas in human units (positive into the pool)
+COLUMNS = {
+    'step': np.int64,
+    'event': np.int8,
+    'user': np.int32,
+    'amount0': np.float64,
+    'amount1': np.float64,
+    'liquidity': np.float64,
+    'reserve0': np.float64,
+    'reserve1': np.float64,
+    'sqrt_price_x96': np.float64,
+    'tick': np.int32,
+    'fee0': np.float64,
+    'fee1': np.float64,
+}
+
+class EventJournal():
+    
+    """ Append-only columnar record of the swaps, mints, burns and collects of an exchange. 
+        Columns are preallocated NumPy arrays that grow by whole chunks, and exports are 
+        views of them rather than copies
+
+        Parameters
+        -----------------
+        chunk_size : int
+            Rows allocated at a time   
+    """ 
+
+    EVENT_SWAP = EVENT_SWAP
+    EVENT_MINT = EVENT_MINT
+    EVENT_BURN = EVENT_BURN
+    EVENT_COLLECT = EVENT_COLLECT
+
+    def __init__(self, chunk_size = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.n_rows = 0
+        self.step = 0
+        self.users = []
+        self.user_ids = {}
+        self.columns = {name: np.zeros(chunk_size, dtype = dtype) for name, dtype in COLUMNS.items()}
+
+    def __len__(self):
+        return self.n_rows
+
+    def advance(self, steps = 1):
+        
+        """ advance
+
+            Move the block/step index stamped on subsequent events
+                
+            Parameters
+            -----------------
+            steps : int
+                number of steps to advance        
+        """  
+        
+        self.step += steps
+
+    def record(self, event, user, amount0, amount1, liquidity, reserve0, reserve1, 
+               sqrt_price_x96 = np.nan, tick = 0, fee0 = 0, fee1 = 0):
+        
+        """ record
+
+            Append one event at the current step
+                
+            Parameters
+            -----------------
+            event : int
+                EVENT_SWAP, EVENT_MINT, EVENT_BURN or EVENT_COLLECT
+            user : str
+                account name
+            amount0 : float
+                token0 delta of the pool, positive into the pool
+            amount1 : float
+                token1 delta of the pool, positive into the pool
+            liquidity : float
+                liquidity minted or burned (in range liquidity after a V3 swap)
+            reserve0 : float
+                token0 reserve after the event
+            reserve1 : float
+                token1 reserve after the event
+            sqrt_price_x96 : float
+                Q64.96 sqrt price after the event (NaN for V2)
+            tick : int
+                tick after the event (0 for V2)
+            fee0 : float
+                fee paid in token0
+            fee1 : float
+                fee paid in token1
+        """  
+        
+        row = self.n_rows
+        if row == len(self.columns['step']):
+            self._grow()
+        user_id = self.user_ids.get(user)
+        if user_id == None:
+            user_id = self.user_ids[user] = len(self.users)
+            self.users.append(user)
+        columns = self.columns
+        columns['step'][row] = self.step
+        columns['event'][row] = event
+        columns['user'][row] = user_id
+        columns['amount0'][row] = amount0
+        columns['amount1'][row] = amount1
+        columns['liquidity'][row] = liquidity
+        columns['reserve0'][row] = reserve0
+        columns['reserve1'][row] = reserve1
+        columns['sqrt_price_x96'][row] = sqrt_price_x96
+        columns['tick'][row] = tick
+        columns['fee0'][row] = fee0
+        columns['fee1'][row] = fee1
+        self.n_rows = row + 1
+
+    def record_undo(self, log):
+        
+        """ record_undo
+
+            Record in an UndoLog the state that the next record changes, so that a rollback 
+            of the transaction drops the rows and the users it added
+                
+            Parameters
+            -----------------
+            log : UndoLog
+                log of the open transaction
+        """  
+        
+        log.record_attrs(self, 'n_rows')
+        log.record(self, 'users', self._forget_users, len(self.users))
+
+    def to_numpy(self):
+        
+        """ to_numpy
+
+            Zero-copy export of the recorded rows
+                
+            Returns
+            -----------------
+            columns : dict
+                column name -> NumPy view of the recorded rows; the user column holds indices 
+                into self.users and the event column indices into EVENT_NAMES
+        """  
+        
+        return {name: column[:self.n_rows] for name, column in self.columns.items()}
+
+    def to_pandas(self):
+        
+        """ to_pandas
+
+            Export of the recorded rows as a DataFrame backed by the journal columns; event 
+            and user become categoricals over the same integer codes
+                
+            Returns
+            -----------------
+            df : pandas.DataFrame
+                one row per recorded event
+        """  
+        
+        columns = self.to_numpy()
+        columns['event'] = pd.Categorical.from_codes(columns['event'], categories = EVENT_NAMES)
+        columns['user'] = pd.Categorical.from_codes(columns['user'], categories = self.users)
+        return pd.DataFrame(columns, copy = False)
+
+    def _forget_users(self, n_users):
+        for user in self.users[n_users:]:
+            del self.user_ids[user]
+        del self.users[n_users:]
+
+    def _grow(self):
+        ## grow by whole chunks, at least doubling so that appends stay amortized O(1)
+        n_chunks = max(1, self.n_rows // self.chunk_size)
+        capacity = self.n_rows + n_chunks * self.chunk_size
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype = column.dtype)
+            grown[:self.n_rows] = column
+            self.columns[name] = grown
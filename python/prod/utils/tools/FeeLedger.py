@@ -0,0 +1,312 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import os
+import uuid
+import weakref
+import numpy as np
+from .UndoLog import UndoLog
+
+MODE_AGGREGATE = 'AGGREGATE'
+MODE_RING = 'RING'
+MODE_ARRAY = 'ARRAY'
+DEFAULT_RING_SIZE = 10_000
+DEFAULT_CHUNK_SIZE = 65_536
+INITIAL_ROWS = 64
+
+def _remove_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+class SpilledChunk():
+    
+    """ Full FeeLedger chunk saved to a .npy file. Copies of a ledger share the chunk, and 
+        the file is deleted once none of them holds it any more; pickling carries the 
+        rows themselves, as the file belongs to this process
+
+        Parameters
+        -----------------
+        path : str
+            .npy file the chunk is saved to
+        chunk : numpy.ndarray
+            (size, 2) fees of the chunk
+    """ 
+
+    def __init__(self, path, chunk):
+        np.save(path, chunk)
+        self.path = path
+        ## object dtype chunks are pickled and cannot be memory mapped
+        self.mmap_mode = None if chunk.dtype == object else 'r'
+        weakref.finalize(self, _remove_file, path)
+
+    def load(self):
+        return np.load(self.path, mmap_mode = self.mmap_mode, allow_pickle = True)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (np.array, (self.load(),))
+
+class FeeLedger():
+    
+    """ Per-swap fee record of an exchange with bounded or compact storage. Running totals 
+        are kept exactly in every mode; the per-swap history is kept according to the mode
+
+        The ring or open chunk is allocated on the first swap with a few rows and doubled as
+        it fills, up to size rows, so idle pools and short runs hold little memory; copies 
+        share it until one of them writes
+
+        Parameters
+        -----------------
+        mode : str
+            AGGREGATE keeps totals only, RING keeps the last size fees, ARRAY keeps every fee 
+            in chunks of size rows
+        size : int
+            Ring capacity (RING) or chunk length (ARRAY)
+        spill_dir : str
+            ARRAY only: directory that full chunks are saved to (.npy) and released from memory; 
+            the files are deleted when the ledger is closed or garbage collected
+        dtype : numpy.dtype
+            Storage type of the per-swap history; object by default, which keeps the exact int 
+            fees of both GWEI and DEC pools, float64 for compact but rounded storage
+    """ 
+
+    MODE_AGGREGATE = MODE_AGGREGATE
+    MODE_RING = MODE_RING
+    MODE_ARRAY = MODE_ARRAY
+
+    def __init__(self, mode = MODE_ARRAY, size = None, spill_dir = None, dtype = object):
+        assert mode in (MODE_AGGREGATE, MODE_RING, MODE_ARRAY), 'FeeLedger: WRONG_MODE'
+        assert spill_dir == None or mode == MODE_ARRAY, 'FeeLedger: SPILL_REQUIRES_ARRAY'
+        self.mode = mode
+        self.size = size if size != None else (DEFAULT_RING_SIZE if mode == MODE_RING else DEFAULT_CHUNK_SIZE)
+        self.spill_dir = spill_dir
+        self.dtype = dtype
+        self.count = 0
+        self.closed = False
+        self.total0 = 0
+        self.total1 = 0
+        # Full chunks (arrays, or SpilledChunk files) are never written again
+        self.chunks = []
+        # Ring or open chunk, None until the first swap; shared with copies while not owned
+        self.buffer = None
+        self.owned = True
+
+    def append(self, fee0, fee1):
+        
+        """ append
+
+            Record the fees of one swap
+                
+            Parameters
+            -----------------
+            fee0 : float
+                fee from reserve0      
+            fee1 : float
+                fee from reserve1                  
+        """          
+        
+        assert not self.closed, 'FeeLedger: CLOSED'
+        self.total0 += fee0
+        self.total1 += fee1
+        if self.mode != MODE_AGGREGATE:
+            row = self.count % self.size
+            if not self.owned or self.buffer is None or row >= len(self.buffer):
+                self._own_buffer(row + 1)
+            self.buffer[row, 0] = fee0
+            self.buffer[row, 1] = fee1
+            if self.mode == MODE_ARRAY and row == self.size - 1:
+                self._seal_chunk()
+        self.count += 1
+
+    def record_undo(self, log):
+        
+        """ record_undo
+
+            Record in an UndoLog the state that the next append changes, so that a rollback 
+            of the transaction takes the append back
+                
+            Parameters
+            -----------------
+            log : UndoLog
+                log of the open transaction                 
+        """          
+        
+        log.record_attrs(self, 'count', 'total0', 'total1', 'chunks', 'buffer', 'owned')
+        ## a full ring overwrites its oldest row, which a rollback has to put back
+        if self.mode == MODE_RING and self.count >= self.size:
+            row = self.count % self.size
+            log.record(self.buffer, row, self.buffer.__setitem__, row, self.buffer[row].copy())
+
+    def window_sum(self, n = None):
+        
+        """ window_sum
+
+            Sum of the fees of the last n swaps; with n = None the running totals of all swaps
+                
+            Parameters
+            -----------------
+            n : int
+                number of most recent swaps             
+                
+            Returns
+            -----------------
+            (fee0, fee1) : tuple
+                summed fees            
+        """ 
+        
+        if n == None or n >= self.count:
+            return (self.total0, self.total1)
+        assert self.mode != MODE_AGGREGATE, 'FeeLedger: NO_HISTORY'
+        assert n <= self.retained(), 'FeeLedger: WINDOW_EXCEEDS_HISTORY'
+        totals = self.history(n).sum(axis = 0)
+        return (totals[0], totals[1])
+
+    def retained(self):
+        
+        """ retained
+
+            Number of swaps whose fees are held in the history
+        """ 
+        
+        if self.mode == MODE_AGGREGATE:
+            return 0
+        elif self.mode == MODE_RING:
+            return min(self.count, self.size)
+        return self.count
+
+    def history(self, n = None):
+        
+        """ history
+
+            Retained per-swap fees, oldest first
+                
+            Parameters
+            -----------------
+            n : int
+                only the last n swaps             
+                
+            Returns
+            -----------------
+            fees : numpy.ndarray
+                (swaps, 2) array of fee0 and fee1                  
+        """ 
+        
+        assert not self.closed, 'FeeLedger: CLOSED'
+        n = self.retained() if n == None else min(n, self.retained())
+        if self.mode == MODE_AGGREGATE or n == 0:
+            return np.zeros((0, 2), dtype = self.dtype)
+        if self.mode == MODE_RING:
+            head = self.count % self.size
+            ordered = self.buffer if self.count < self.size else np.roll(self.buffer, -head, axis = 0)
+            return ordered[:min(self.count, self.size)][-n:]
+
+        # ARRAY: walk back from the open chunk only as far as the window needs
+        parts = [np.zeros((0, 2), dtype = self.dtype) if self.buffer is None else self.buffer[:self.count % self.size]]
+        rows = len(parts[0])
+        for chunk in reversed(self.chunks):
+            if rows >= n:
+                break
+            if isinstance(chunk, SpilledChunk):
+                chunk = chunk.load()
+            parts.insert(0, chunk)
+            rows += len(chunk)
+        return np.concatenate(parts)[-n:]
+
+    def last(self):
+        
+        """ last
+
+            Fees of the most recent swap, read in O(1) rather than from the whole history
+                
+            Returns
+            -----------------
+            (fee0, fee1) : tuple
+                fees of the last swap            
+        """ 
+
+        assert self.mode != MODE_AGGREGATE, 'FeeLedger: NO_HISTORY'
+        assert not self.closed, 'FeeLedger: CLOSED'
+        assert self.count > 0, 'FeeLedger: NO_SWAPS'
+        row = (self.count - 1) % self.size
+        chunk = self.buffer
+        ## in ARRAY mode a filled open chunk has already been sealed
+        if self.mode == MODE_ARRAY and row == self.size - 1:
+            chunk = self.chunks[-1]
+            chunk = chunk.load() if isinstance(chunk, SpilledChunk) else chunk
+        return (chunk[row, 0], chunk[row, 1])
+
+    def close(self):
+        
+        """ close
+
+            Release the per-swap history; spilled chunk files are deleted as soon as no copy 
+            of the ledger shares them. Running totals stay readable
+        """ 
+
+        self.closed = True
+        self.chunks = []
+        self.buffer = None
+
+    def copy(self):
+        
+        """ copy
+
+            Independent copy of the ledger in O(1); full chunks are immutable and shared, the 
+            open chunk (or ring) is shared too and copied by whichever ledger next writes to it. 
+            Inside an LPTransaction the open chunk is copied at once
+        """ 
+
+        ledger = FeeLedger.__new__(FeeLedger)
+        ledger.__dict__.update(self.__dict__)
+        ledger.chunks = list(self.chunks)
+        if UndoLog.active != None and self.buffer is not None:
+            ## a rollback puts overwritten rows back in place, which must not reach the copy
+            ledger.buffer = self.buffer.copy()
+            ledger.owned = True
+        else:
+            self.owned = False
+            ledger.owned = False
+        return ledger
+
+    def _seal_chunk(self):
+        if self.spill_dir != None:
+            path = os.path.join(self.spill_dir, f"fees_{uuid.uuid4().hex}.npy")
+            chunk = SpilledChunk(path, self.buffer)
+        else:
+            chunk = self.buffer
+        ## a new list rather than an append, so that a list recorded by record_undo stays as it was
+        self.chunks = self.chunks + [chunk]
+        self.buffer = None
+        self.owned = True
+
+    def _own_buffer(self, rows):
+        ## a private buffer of at least rows rows, doubled from INITIAL_ROWS up to size; the old
+        ## one is left as it was, since a copy or an UndoLog may still hold it
+        n_rows = 0 if self.buffer is None else len(self.buffer)
+        capacity = max(n_rows, min(INITIAL_ROWS, self.size))
+        while capacity < rows:
+            capacity = min(2*capacity, self.size)
+        buffer = np.zeros((capacity, 2), dtype = self.dtype)
+        buffer[:n_rows] = self.buffer
+        self.buffer = buffer
+        self.owned = True
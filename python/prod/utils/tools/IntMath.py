@@ -0,0 +1,64 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+from .SaferMath import SaferMath, MAX_UINT256
+
+class IntMath():
+
+    """ Integer-native counterpart of SaferMath for GWEI precision amounts
+
+        Same rounding as SaferMath (div_round rounds up, mul_div/div truncate) but computed 
+        directly on Python ints, without the Decimal(str(x)) round-trips. Products are exact, 
+        where SaferMath rounds them to its 50 digit context. Non-int operands are passed 
+        on to SaferMath.
+    """       
+
+    def __init__(self):
+        pass
+
+    def mul_div(self, x, y, z):
+        if type(x) is not int or type(y) is not int or type(z) is not int:
+            return SaferMath().mul_div(x, y, z)
+        return self._trunc_div(x * y, z)
+
+    def div(self, x, y):
+        if type(x) is not int or type(y) is not int:
+            return SaferMath().div(x, y)
+        y = y if y != 0 else 1
+        return self._trunc_div(x, y)
+
+    def div_round(self, x, y):
+        if type(x) is not int or type(y) is not int:
+            return SaferMath().div_round(x, y)
+        y = y if y != 0 else 1
+        result = self._trunc_div(x, y)
+        # Remainder takes the sign of x, as with Decimal
+        if x - result * y > 0:
+            result += 1
+        if result < 0 or result > MAX_UINT256:
+            result = self._trunc_div(x, y)
+        return result
+
+    def mul_div_round(self, x, y, z):
+        if type(x) is not int or type(y) is not int or type(z) is not int:
+            return SaferMath().mul_div_round(x, y, z)
+        return self.div_round(x * y, z)
+
+    def _trunc_div(self, x, y):
+        result = abs(x) // abs(y)
+        return result if (x < 0) == (y < 0) else -result
@@ -0,0 +1,80 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+from .UndoLog import UndoLog, MISSING
+
+class UndoDict(dict):
+    
+    """ dict whose writes are recorded in the active UndoLog, so that an open transaction can 
+        restore them; outside of a transaction it behaves as a plain dict
+    """ 
+
+    def __setitem__(self, key, value):
+        if UndoLog.active != None:
+            UndoLog.active.record(self, key, self._undo_item, key, dict.get(self, key, MISSING))
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if UndoLog.active != None:
+            UndoLog.active.record(self, key, self._undo_item, key, dict.get(self, key, MISSING))
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        if UndoLog.active != None and key in self:
+            UndoLog.active.record(self, key, self._undo_item, key, dict.__getitem__(self, key))
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        (key, value) = dict.popitem(self)
+        if UndoLog.active != None:
+            UndoLog.active.record(self, key, self._undo_item, key, value)
+        return (key, value)
+
+    def setdefault(self, key, default = None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        if UndoLog.active == None:
+            dict.update(self, *args, **kwargs)
+            return
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        if UndoLog.active != None:
+            UndoLog.active.record_call(self._undo_clear, dict(self))
+        dict.clear(self)
+
+    def copy(self):
+        return UndoDict(self)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def _undo_item(self, key, value):
+        if value is MISSING:
+            dict.pop(self, key, None)
+        else:
+            dict.__setitem__(self, key, value)
+
+    def _undo_clear(self, items):
+        dict.clear(self)
+        dict.update(self, items)
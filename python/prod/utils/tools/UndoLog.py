@@ -0,0 +1,284 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+## marks a key or attribute that did not exist before the write
+MISSING = object()
+
+def _restore_attr(obj, name, value):
+    if value is MISSING:
+        obj.__dict__.pop(name, None)
+    else:
+        obj.__dict__[name] = value
+
+def _restore_item(mapping, key, value):
+    if value is MISSING:
+        dict.pop(mapping, key, None)
+    else:
+        dict.__setitem__(mapping, key, value)
+
+class UndoLog():
+    
+    """ Undo log of an open transaction, scoped to the pools of one or more factories. The 
+        pools write an undo entry at each of their mutation points (reserves, supply, provider 
+        maps, fee tally, Slot0, ticks and positions) and the pair tokens at each change of their 
+        totals, recording the old value of a field before its first write; UndoDict containers 
+        (IndexVault, Wallets) record their own writes. Rolling back therefore costs O(mutations) 
+        rather than a copy of the whole state, and outside of a transaction a mutation point 
+        costs a single check. Logs nest: committing a log hands its entries and its scope to 
+        the enclosing one, which can still roll them back
+
+        Parameters
+        -----------------
+        parent : UndoLog
+            enclosing log, None for an outermost transaction
+        factory : UniswapFactory
+            factory whose pools and pair tokens are recorded, in addition to the scope of the 
+            enclosing log; any FactoryData of its pools works as well, as they share its 
+            token_from_exchange map
+    """ 
+
+    MISSING = MISSING
+    
+    ## log of the innermost open transaction, None outside of one
+    active = None
+
+    def __init__(self, parent = None, factory = None):
+        self.parent = parent
+        self.entries = []
+        self.seen = set()
+        ## token_from_exchange maps of the scoped factories, and their pair tokens, by id
+        self.factories = {} if parent == None else dict(parent.factories)
+        self.tokens = {} if parent == None else dict(parent.tokens)
+        if factory != None:
+            self.add_factory(factory)
+
+    @classmethod
+    def begin(cls, factory = None):
+        
+        """ begin
+
+            Open a transaction log nested in the active one, and make it active
+                
+            Parameters
+            -----------------
+            factory : UniswapFactory
+                factory whose pools the log records
+                
+            Returns
+            -----------------
+            log : UndoLog
+                Newly active log        
+        """   
+
+        cls.active = UndoLog(cls.active, factory)
+        return cls.active
+
+    def add_factory(self, factory):
+        
+        """ add_factory
+
+            Extend the scope of the log to the pools of a factory and their pair tokens
+                
+            Parameters
+            -----------------
+            factory : UniswapFactory
+                factory, or FactoryData of one of its pools     
+        """   
+
+        pairs = factory.token_from_exchange
+        self.factories[id(pairs)] = pairs
+        for tokens in pairs.values():
+            self.add_tokens(tokens.values())
+
+    def add_tokens(self, tokens):
+        
+        """ add_tokens
+
+            Extend the scope of the log to tokens, e.g. the pair of a pool deployed during the 
+            transaction
+                
+            Parameters
+            -----------------
+            tokens : iterable
+                ERC20 tokens     
+        """   
+
+        for token in tokens:
+            self.tokens[id(token)] = token
+
+    def covers(self, factory):
+        
+        """ covers
+
+            Whether the pools of a factory are in the scope of the log
+                
+            Parameters
+            -----------------
+            factory : UniswapFactory
+                factory, or FactoryData of a pool     
+                
+            Returns
+            -----------------
+            covered : bool
+                True if writes to the pools have to be recorded                 
+        """   
+
+        return id(factory.token_from_exchange) in self.factories
+
+    def record(self, obj, key, undo, *args):
+        
+        """ record
+
+            Record how to undo a write to field key of obj; only the first write of each field 
+            is kept, as it holds the value from before the transaction
+                
+            Parameters
+            -----------------
+            obj : object
+                owner of the field 
+            key : hashable
+                attribute name or container key 
+            undo : function
+                called with args to restore the field     
+                
+            Returns
+            -----------------
+            recorded : bool
+                False if the field was already recorded                 
+        """   
+
+        field = (id(obj), key)
+        if field in self.seen:
+            return False
+        self.seen.add(field)
+        ## obj is kept alive so that its id is not reused within the transaction
+        self.entries.append((obj, undo, args))
+        return True
+
+    def record_attrs(self, obj, *names):
+        
+        """ record_attrs
+
+            Record the current values of attributes of obj before they are written
+                
+            Parameters
+            -----------------
+            obj : object
+                owner of the attributes 
+            names : str
+                attribute names     
+        """   
+
+        for name in names:
+            self.record(obj, name, _restore_attr, obj, name, obj.__dict__.get(name, MISSING))
+
+    def record_item(self, mapping, key):
+        
+        """ record_item
+
+            Record the current value of a dict item before it is written or deleted
+                
+            Parameters
+            -----------------
+            mapping : dict
+                owner of the item 
+            key : hashable
+                key of the item     
+        """   
+
+        self.record(mapping, key, _restore_item, mapping, key, dict.get(mapping, key, MISSING))
+
+    def record_token(self, token):
+        
+        """ record_token
+
+            Record the total of a token before it changes, if the token is in the scope of the 
+            log
+                
+            Parameters
+            -----------------
+            token : ERC20
+                token whose total is written     
+        """   
+
+        if id(token) in self.tokens:
+            self.record(token, 'token_total', _restore_attr, token, 'token_total', token.token_total)
+
+    def record_call(self, undo, *args):
+        
+        """ record_call
+
+            Record an inverse operation that is always replayed, e.g. the removal of an 
+            inserted list item
+                
+            Parameters
+            -----------------
+            undo : function
+                called with args on rollback     
+        """   
+
+        self.entries.append((None, undo, args))
+
+    def commit(self):
+        
+        """ commit
+
+            Close the log keeping its writes; inside an enclosing transaction the entries 
+            and the scope move to the enclosing log
+        """   
+
+        assert UndoLog.active is self, 'UndoLog: NOT_ACTIVE'
+        UndoLog.active = self.parent
+        if self.parent != None:
+            self.parent.entries.extend(self.entries)
+            self.parent.seen.update(self.seen)
+            self.parent.factories.update(self.factories)
+            self.parent.tokens.update(self.tokens)
+        self.entries = []
+        self.seen = set()
+
+    def rollback(self):
+        
+        """ rollback
+
+            Undo every write recorded since the log began (or last rolled back), newest first; 
+            the log stays open
+        """   
+
+        assert UndoLog.active is self, 'UndoLog: NOT_ACTIVE'
+        UndoLog.active = None
+        try:
+            for (_, undo, args) in reversed(self.entries):
+                undo(*args)
+        finally:
+            UndoLog.active = self
+        self.entries = []
+        self.seen = set()
+
+    def abort(self):
+        
+        """ abort
+
+            Roll back and close the log
+        """   
+
+        self.rollback()
+        UndoLog.active = self.parent
+
+    def __len__(self):
+        return len(self.entries)
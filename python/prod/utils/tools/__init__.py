@@ -1,3 +1,8 @@
 from .MockAddress import MockAddress
 from .SaferMath import SaferMath
-
+from .IntMath import IntMath
+from .UndoLog import UndoLog
+from .UndoDict import UndoDict
+from .CopyOnWriteDict import CopyOnWriteDict
+from .FeeLedger import FeeLedger
+from .EventJournal import EventJournal
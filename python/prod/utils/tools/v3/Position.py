@@ -42,6 +42,15 @@ class PositionInfo:
     tokensOwed1: int
 
 
+### @notice Returns the key of a position in the positions mapping
+### @param owner The address of the position owner
+### @param tickLower The lower tick boundary of the position
+### @param tickUpper The upper tick boundary of the position
+### @return key The key of the position
+def key(owner, tickLower, tickUpper):
+    return hash((owner, tickLower, tickUpper))
+
+
 ### @notice Returns the Info struct of a position, given an owner and position boundaries
 ### @param self The mapping containing all user positions
 ### @param owner The address of the position owner
@@ -52,14 +61,14 @@ def get(self, owner, tickLower, tickUpper):
     checkInputTypes(account=owner, int24=(tickLower, tickUpper))
 
     # Need to handle non-existing positions in Python
-    key = hash((owner, tickLower, tickUpper))
-    if not self.__contains__(key):
+    positionKey = key(owner, tickLower, tickUpper)
+    if not self.__contains__(positionKey):
         # We don't want to create a new position if it doesn't exist!
         # In the case of collect we add an assert after that so it reverts.
         # For mint there is an amount > 0 check so it is OK to initialize
         # In burn if the position is not initialized, when calling Position.update it will revert with "NP"
-        self[key] = PositionInfo(0, 0, 0, 0, 0)
-    return self[key]
+        self[positionKey] = PositionInfo(0, 0, 0, 0, 0)
+    return self[positionKey]
 
 
 def assertPositionExists(self, owner, tickLower, tickUpper):
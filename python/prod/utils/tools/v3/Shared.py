@@ -25,6 +25,7 @@
 
 from decimal import *
 from dataclasses import dataclass
+from contextlib import contextmanager
 
 # ------------------ Constants ------------------ #
 
@@ -123,7 +124,7 @@ def checkDecimal(input):
 
 
 def checkDict(input):
-    assert type(input) == dict
+    assert isinstance(input, dict)
 
 
 def checkAccount(address):
@@ -149,8 +150,26 @@ def toUint128(number):
     return number
 
 
+# Unchecked execution - when set, checkInputTypes skips its type and range checks. Only meant to be
+# enabled through uncheckedInputs around hot loops whose inputs were validated at the API boundary.
+_uncheckedInputs = False
+
+
+@contextmanager
+def uncheckedInputs(enabled=True):
+    global _uncheckedInputs
+    previous = _uncheckedInputs
+    _uncheckedInputs = enabled
+    try:
+        yield
+    finally:
+        _uncheckedInputs = previous
+
+
 # General checkInput function for all functions that take input parameters
 def checkInputTypes(**kwargs):
+    if _uncheckedInputs:
+        return
     if "string" in kwargs:
         loopChecking(kwargs.get("string"), checkString)
     if "decimal" in kwargs:
@@ -25,6 +25,7 @@
 
 from . import TickMath, LiquidityMath, SafeMath
 import math
+import bisect
 from .Shared import *
 
 
@@ -102,6 +103,7 @@ def getFeeGrowthInside(
 ### @param time The current block timestamp cast to a uint32
 ### @param upper true for updating a position's upper tick, or false for updating a position's lower tick
 ### @param maxLiquidity The maximum liquidity allocation for a single tick
+### @param tickIndex Optional sorted list of initialized ticks, kept in sync when the tick is created
 ### @return flipped Whether the tick was flipped from initialized to uninitialized, or vice versa
 def update(
     self,
@@ -112,6 +114,7 @@ def update(
     feeGrowthGlobal1X128,
     upper,
     maxLiquidity,
+    tickIndex=None,
 ):
     checkInputTypes(
         dict=self,
@@ -125,6 +128,8 @@ def update(
     if not self.__contains__(tick):
         assert liquidityDelta > 0, "Avoid creating empty tick"
         insertUninitializedTickstoMapping(self, [tick])
+        if tickIndex is not None:
+            bisect.insort(tickIndex, tick)
 
     info = self[tick]
 
@@ -158,10 +163,38 @@ def update(
 ### @notice Clears tick data
 ### @param self The mapping containing all initialized tick information for initialized ticks
 ### @param tick The tick that will be cleared
-def clear(self, tick):
+### @param tickIndex Optional sorted list of initialized ticks, kept in sync when the tick is removed
+def clear(self, tick, tickIndex=None):
     checkInputTypes(dict=self, int24=tick)
     # Assumption that the key (tick) exists (it should)
     del self[tick]
+    if tickIndex is not None:
+        i = bisect.bisect_left(tickIndex, tick)
+        assert i < len(tickIndex) and tickIndex[i] == tick, "Tick not indexed"
+        del tickIndex[i]
+
+
+### @notice Finds the next initialized tick in the sorted tick index
+### @dev Bisects the sorted list of initialized ticks, so the search is O(log n) in the number of ticks.
+### If there is no initialized tick in the search direction, the boundary tick is returned as uninitialized.
+### @param tickIndex The sorted list of initialized ticks
+### @param tick The starting tick
+### @param lte Whether to search to the left (less than or equal to the starting tick)
+### @return next The next initialized tick, or MIN_TICK / MAX_TICK if there is none
+### @return initialized Whether the returned tick is initialized
+def nextInitializedTick(tickIndex, tick, lte):
+    checkInputTypes(int24=tick)
+    i = bisect.bisect_right(tickIndex, tick)
+    if lte:
+        if i == 0:
+            # No tick to the left
+            return TickMath.MIN_TICK, False
+        return tickIndex[i - 1], True
+    else:
+        if i == len(tickIndex):
+            # No tick to the right
+            return TickMath.MAX_TICK, False
+        return tickIndex[i], True
 
 
 ### @notice Transitions to next tick as needed by price movement
@@ -24,6 +24,10 @@
 # Original copyright (c) 2022 chainflip-io contributors.
 
 from .Shared import *
+from collections import OrderedDict
+import math
+
+DEFAULT_SQRT_RATIO_CACHE_SIZE = 4096
 
 ### @notice Calculates sqrt(1.0001^tick) * 2^96
 ### @dev Throws if |tick| > max tick
@@ -176,3 +180,79 @@ def add_fractional_bit(r, log_2, bit):
     if bit != 50:
         r = r >> f
     return (r, log_2)
+
+
+### @notice Memoized getSqrtRatioAtTick for the usable tick grid of a given tick spacing
+### @dev Values are computed by getSqrtRatioAtTick, so cached results are bit-identical. Lookups hit an optional
+### precomputed table for ticks on the grid, then a bounded LRU map for any other tick (e.g. MIN_TICK, MAX_TICK).
+### Caches are shared per tick spacing through getSqrtRatioCache, and copies or pickles re-attach to that shared cache.
+class SqrtRatioCache:
+
+    def __init__(self, tickSpacing=1, maxsize=DEFAULT_SQRT_RATIO_CACHE_SIZE):
+        checkInt24(tickSpacing)
+        assert tickSpacing > 0 and maxsize > 0
+        self.tickSpacing = tickSpacing
+        self.maxsize = maxsize
+        self.minTick = math.ceil(MIN_TICK / tickSpacing) * tickSpacing
+        self.maxTick = math.floor(MAX_TICK / tickSpacing) * tickSpacing
+        self.table = None
+        self.lru = OrderedDict()
+
+    ### @notice Calculates sqrt(1.0001^tick) * 2^96, see getSqrtRatioAtTick
+    ### @param tick The input tick for the above formula
+    ### @return sqrtPriceX96 A Fixed point Q64.96 number representing the sqrt of the ratio of the two assets
+    def getSqrtRatioAtTick(self, tick):
+        if self.table is not None and tick % self.tickSpacing == 0 and self.minTick <= tick <= self.maxTick:
+            return self.table[(tick - self.minTick) // self.tickSpacing]
+
+        lru = self.lru
+        if tick in lru:
+            lru.move_to_end(tick)
+            return lru[tick]
+
+        ratio = getSqrtRatioAtTick(tick)
+        lru[tick] = ratio
+        if len(lru) > self.maxsize:
+            lru.popitem(last=False)
+        return ratio
+
+    ### @notice Precomputes the sqrt ratio of every usable tick, i.e. every multiple of tickSpacing in [MIN_TICK, MAX_TICK]
+    ### @dev Memory grows with the grid size: ~30k entries for a tick spacing of 60, ~1.8M for a tick spacing of 1
+    def precompute(self):
+        if self.table is None:
+            self.table = [
+                getSqrtRatioAtTick(tick)
+                for tick in range(self.minTick, self.maxTick + 1, self.tickSpacing)
+            ]
+        return self
+
+    ### @notice Drops the precomputed table and the LRU entries
+    def clear(self):
+        self.table = None
+        self.lru.clear()
+
+    def __len__(self):
+        return len(self.lru) + (len(self.table) if self.table is not None else 0)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (getSqrtRatioCache, (self.tickSpacing,))
+
+
+_sqrtRatioCaches = {}
+
+
+### @notice Returns the SqrtRatioCache shared by all pools with the given tick spacing
+### @param tickSpacing The spacing between usable ticks
+### @return cache The shared SqrtRatioCache, created on first use
+def getSqrtRatioCache(tickSpacing=1):
+    cache = _sqrtRatioCaches.get(tickSpacing)
+    if cache is None:
+        cache = SqrtRatioCache(tickSpacing)
+        _sqrtRatioCaches[tickSpacing] = cache
+    return cache
@@ -35,12 +35,12 @@ class UniV3Helper():
         L = lp.get_liquidity()
         if(token_in.token_name == lp.token0):
             sqrtp_cur = Q96/lp.slot0.sqrtPriceX96
-            sqrtp_pa = Q96/TickMath.getSqrtRatioAtTick(lwr_tick)
-            sqrtp_pb = Q96/TickMath.getSqrtRatioAtTick(upr_tick)       
+            sqrtp_pa = Q96/lp.sqrt_ratio_cache.getSqrtRatioAtTick(lwr_tick)
+            sqrtp_pb = Q96/lp.sqrt_ratio_cache.getSqrtRatioAtTick(upr_tick)       
         elif(token_in.token_name == lp.token1):
             sqrtp_cur = lp.slot0.sqrtPriceX96/Q96
-            sqrtp_pa = TickMath.getSqrtRatioAtTick(lwr_tick)/Q96
-            sqrtp_pb = TickMath.getSqrtRatioAtTick(upr_tick)/Q96 
+            sqrtp_pa = lp.sqrt_ratio_cache.getSqrtRatioAtTick(lwr_tick)/Q96
+            sqrtp_pb = lp.sqrt_ratio_cache.getSqrtRatioAtTick(upr_tick)/Q96 
      
         sqrtp_next = sqrtp_cur + (fee*amt_tkn) / (L*1000)
         return L * (1/sqrtp_cur - 1/sqrtp_next), sqrtp_next    
@@ -96,15 +96,15 @@ class UniV3Helper():
 
     # see https://atiselsts.github.io/pdfs/uniswap-v3-liquidity-math.pdf
     def calc_Lx(self, p_sqrt_human, dx, lwr_tick, upr_tick):
-        pa_sqrt_human = TickMath.getSqrtRatioAtTick(lwr_tick)/Q96
-        pb_sqrt_human = TickMath.getSqrtRatioAtTick(upr_tick)/Q96
+        pa_sqrt_human = TickMath.getSqrtRatioCache().getSqrtRatioAtTick(lwr_tick)/Q96
+        pb_sqrt_human = TickMath.getSqrtRatioCache().getSqrtRatioAtTick(upr_tick)/Q96
         assert p_sqrt_human <= pb_sqrt_human, "OOP"
         Lx = dx/(1/max(p_sqrt_human, pa_sqrt_human) - 1/pb_sqrt_human)
         return Lx
     
     def calc_Ly(self, p_sqrt_human, dy, lwr_tick, upr_tick, price_tick=None):
-        pa_sqrt_human = TickMath.getSqrtRatioAtTick(lwr_tick)/Q96
-        pb_sqrt_human = TickMath.getSqrtRatioAtTick(upr_tick)/Q96
+        pa_sqrt_human = TickMath.getSqrtRatioCache().getSqrtRatioAtTick(lwr_tick)/Q96
+        pb_sqrt_human = TickMath.getSqrtRatioCache().getSqrtRatioAtTick(upr_tick)/Q96
         assert p_sqrt_human >= pa_sqrt_human, "OOP"
         Ly = dy/(min(p_sqrt_human, pb_sqrt_human) - pa_sqrt_human)
         return Ly
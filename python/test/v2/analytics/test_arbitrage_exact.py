@@ -0,0 +1,138 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, math
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.erc import ERC20
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.analytics.simulate import Arbitrage, MarkovState
+
+USER = 'user0'
+E18 = 10**18
+
+
+def setup_v2_lp(precision=UniswapExchangeData.TYPE_GWEI):
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("ETH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011", precision=precision)
+    lp = factory.deploy(exch_data)
+    scale = E18 if precision == UniswapExchangeData.TYPE_GWEI else 1
+    lp.add_liquidity(USER, 1000*scale, 100000*scale, 1000*scale, 100000*scale)
+    return lp, eth, dai
+
+
+def setup_v3_lp(precision=UniswapExchangeData.TYPE_GWEI, depth=1):
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("ETH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011",
+                                    version=UniswapExchangeData.VERSION_V3,
+                                    precision=precision,
+                                    tick_spacing=60, fee=3000)
+    lp = factory.deploy(exch_data)
+    lp.initialize(int(math.sqrt(100) * 2**96))
+    scale = depth*E18 if precision == UniswapExchangeData.TYPE_GWEI else depth
+    lp.mint(USER, -887220, 887220, 1000*scale)
+    # a concentrated position between prices ~90.5 and ~98.5 is crossed on the way down
+    lp.mint(USER, 45060, 45900, 5000*scale)
+    return lp, eth, dai
+
+
+def setup_mstate(held):
+    # deterministic transitions, so the held amount the buy side may spend is fixed
+    mstate = MarkovState(stochastic=False)
+    for _ in range(5):
+        mstate.next_state(held)
+    return mstate
+
+
+class TestArbitrageExact(unittest.TestCase):
+
+    def test_v2_sell_hitsBenchmark(self):
+        for precision in [UniswapExchangeData.TYPE_GWEI, UniswapExchangeData.TYPE_DEC]:
+            lp, eth, dai = setup_v2_lp(precision)
+            arb = Arbitrage(lp, setup_mstate(10**30), mode=Arbitrage.MODE_EXACT)
+            arb.apply(90, USER)
+            self.assertAlmostEqual(lp.get_price(eth), 90, places=6)
+            self.assertLess(arb.net_x, 0)
+            self.assertGreater(arb.net_y, 0)
+            self.assertEqual(arb.get_x_tot(), abs(arb.net_x))
+
+    def test_v2_buy_hitsBenchmark(self):
+        lp, eth, dai = setup_v2_lp()
+        arb = Arbitrage(lp, setup_mstate(10**30), mode=Arbitrage.MODE_EXACT)
+        arb.apply(110, USER)
+        self.assertAlmostEqual(lp.get_price(eth), 110, places=6)
+        self.assertGreater(arb.net_x, 0)
+        self.assertLess(arb.net_y, 0)
+
+    def test_v2_buy_cappedByHeld(self):
+        lp, eth, dai = setup_v2_lp()
+        mstate = setup_mstate(10**21)
+        held_y_amt = mstate.get_current_state('dHeld')
+        arb = Arbitrage(lp, mstate, mode=Arbitrage.MODE_EXACT)
+        arb.apply(110, USER)
+        self.assertEqual(-arb.net_y, int(arb.threshold*held_y_amt))
+        self.assertLess(lp.get_price(eth), 110)
+
+    def test_v2_oneSwapPerCall(self):
+        lp, eth, dai = setup_v2_lp()
+        arb = Arbitrage(lp, setup_mstate(10**30), mode=Arbitrage.MODE_EXACT)
+        arb.apply(90, USER)
+        self.assertEqual(lp.fee_ledger.count, 1)
+        # already at the benchmark, so nothing is traded
+        arb.apply(lp.get_price(eth), USER)
+        self.assertEqual(lp.fee_ledger.count, 1)
+
+    def test_v3_sell_crossesRanges(self):
+        lp, eth, dai = setup_v3_lp()
+        arb = Arbitrage(lp, setup_mstate(10**30), mode=Arbitrage.MODE_EXACT)
+        quote_in = arb.calc_exact_amount(eth, 85)
+        arb.apply(85, USER)
+        self.assertEqual(-arb.net_x, quote_in)
+        self.assertAlmostEqual(lp.get_price(eth), 85, places=6)
+        self.assertLess(lp.slot0.tick, 45060)
+
+    def test_v3_dec_sell_hitsBenchmark(self):
+        lp, eth, dai = setup_v3_lp()
+        gwei_in = Arbitrage(lp, setup_mstate(10**30), mode=Arbitrage.MODE_EXACT).calc_exact_amount(eth, 90)
+        lp, eth, dai = setup_v3_lp(UniswapExchangeData.TYPE_DEC)
+        arb = Arbitrage(lp, setup_mstate(10**30), mode=Arbitrage.MODE_EXACT)
+        self.assertAlmostEqual(arb.calc_exact_amount(eth, 90), gwei_in/E18, places=9)
+        # a tenth of the liquidity takes a tenth of the input from 100 down to 90
+        lp, eth, dai = setup_v3_lp(UniswapExchangeData.TYPE_DEC, 0.1)
+        arb = Arbitrage(lp, setup_mstate(10**30), mode=Arbitrage.MODE_EXACT)
+        quote_in = arb.calc_exact_amount(eth, 90)
+        self.assertAlmostEqual(quote_in, 5.42, places=2)
+        arb.apply(90, USER)
+        self.assertAlmostEqual(-arb.net_x, quote_in, places=12)
+        self.assertAlmostEqual(lp.get_price(eth), 90, places=6)
+
+    def test_v3_buy_hitsBenchmark(self):
+        lp, eth, dai = setup_v3_lp()
+        arb = Arbitrage(lp, setup_mstate(10**30), mode=Arbitrage.MODE_EXACT)
+        arb.apply(120, USER)
+        self.assertAlmostEqual(lp.get_price(eth), 120, places=6)
+        self.assertGreater(arb.net_x, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, math
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.erc import ERC20
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.analytics.simulate import CyclicArbitrage
+
+USER = 'user0'
+E18 = 10**18
+
+
+def deploy_v2(factory, name0, name1, amt0, amt1, precision=UniswapExchangeData.TYPE_GWEI):
+    tkn0 = ERC20(name0, "0x09")
+    tkn1 = ERC20(name1, "0x111")
+    exch_data = UniswapExchangeData(tkn0=tkn0, tkn1=tkn1, symbol=name0+name1, address="0x011",
+                                    precision=precision)
+    lp = factory.deploy(exch_data)
+    lp.add_liquidity(USER, amt0, amt1, amt0, amt1)
+    return lp
+
+
+def deploy_v3(factory, name0, name1, price, liquidity, precision=UniswapExchangeData.TYPE_GWEI):
+    tkn0 = ERC20(name0, "0x09")
+    tkn1 = ERC20(name1, "0x111")
+    exch_data = UniswapExchangeData(tkn0=tkn0, tkn1=tkn1, symbol=name0+name1, address="0x012",
+                                    version=UniswapExchangeData.VERSION_V3,
+                                    precision=precision,
+                                    tick_spacing=60, fee=3000)
+    lp = factory.deploy(exch_data)
+    lp.initialize(int(math.sqrt(price) * 2**96))
+    lp.mint(USER, -887220, 887220, liquidity)
+    return lp
+
+
+def setup_triangle(eth_usdc_price):
+    # ETH/DAI at 100 and DAI/USDC at 1; ETH/USDC away from 100 opens a cycle
+    factory = UniswapFactory("V2 factory", "0x2")
+    deploy_v2(factory, "ETH", "DAI", 1000*E18, 100000*E18)
+    deploy_v2(factory, "DAI", "USDC", 100000*E18, 100000*E18)
+    deploy_v2(factory, "ETH", "USDC", 1000*E18, eth_usdc_price*1000*E18)
+    return factory
+
+
+def cycle_profit(arb, cycle, x):
+    amounts = arb._quote_cycle(cycle, x)
+    return amounts[-1] - amounts[0]
+
+
+class TestCyclicArbitrage(unittest.TestCase):
+
+    def test_no_cycle_whenConsistent(self):
+        arb = CyclicArbitrage(setup_triangle(100))
+        self.assertIsNone(arb.update())
+        self.assertEqual(arb.apply(), [])
+
+    def test_detect_cycle(self):
+        arb = CyclicArbitrage(setup_triangle(110))
+        self.assertIsNotNone(arb.update())
+        cycles = arb.find_cycles()
+        self.assertEqual(len(cycles), 1)
+        tokens = cycles[0].tokens
+        self.assertEqual(tokens[0], tokens[-1])
+        # cheap ETH is bought with DAI and sold for USDC
+        start = tokens.index('DAI')
+        self.assertEqual(tokens[start:] + tokens[1:start+1], ['DAI', 'ETH', 'USDC', 'DAI'])
+
+    def test_closed_form_sizeIsOptimal(self):
+        arb = CyclicArbitrage(setup_triangle(110))
+        arb.update()
+        route = arb.size_cycle(arb.find_cycles()[0])
+        x = route.amount_in
+        best = cycle_profit(arb, route, x)
+        self.assertEqual(best, route.amount_out - route.amount_in)
+        self.assertGreater(best, 0)
+        for dx in [10**12, 10**15, 10**18]:
+            self.assertLessEqual(cycle_profit(arb, route, x + dx), best)
+            self.assertLessEqual(cycle_profit(arb, route, x - dx), best)
+
+    def test_execute_closesCycle(self):
+        factory = setup_triangle(110)
+        arb = CyclicArbitrage(factory)
+        routes = arb.apply(USER)
+        self.assertEqual(len(routes), 1)
+        # the traded pools now price the cycle below the fees
+        self.assertEqual(arb.apply(), [])
+
+    def test_incremental_matchesFresh(self):
+        factory = setup_triangle(100)
+        arb = CyclicArbitrage(factory)
+        self.assertIsNone(arb.update())
+        # a large swap moves ETH/USDC and opens a cycle, seen by the kept and a fresh detector
+        lp = factory.exchanges['ETH-USDC']
+        lp.swap_exact_tokens_for_tokens(100*E18, 0, lp.factory.token_from_exchange[lp.name]['ETH'], USER)
+        self.assertIsNotNone(arb.update())
+        fresh = CyclicArbitrage(factory)
+        self.assertIsNotNone(fresh.update())
+        self.assertEqual(arb.size_cycle(arb.find_cycles()[0]).amount_in,
+                         fresh.size_cycle(fresh.find_cycles()[0]).amount_in)
+        # once traded, both see no cycle again
+        arb.apply(USER)
+        self.assertIsNone(arb.update())
+        self.assertIsNone(CyclicArbitrage(factory).update())
+
+    def test_v3_tickWalkSize(self):
+        factory = UniswapFactory("V2 factory", "0x2")
+        deploy_v2(factory, "ETH", "DAI", 1000*E18, 100000*E18)
+        deploy_v2(factory, "DAI", "USDC", 100000*E18, 100000*E18)
+        factory_v3 = UniswapFactory("V3 factory", "0x3")
+        deploy_v3(factory_v3, "ETH", "USDC", 110, 10000*E18)
+        arb = CyclicArbitrage([factory, factory_v3])
+        self.assertIsNotNone(arb.update())
+        route = arb.size_cycle(arb.find_cycles()[0])
+        x = route.amount_in
+        best = route.amount_out - route.amount_in
+        self.assertGreater(best, 0)
+        for dx in [10**15, 10**17]:
+            self.assertLessEqual(cycle_profit(arb, route, x + dx), best)
+            self.assertLessEqual(cycle_profit(arb, route, x - dx), best)
+        self.assertGreater(arb.execute(route, USER), 0)
+
+    def test_v3_dec_tickWalkSize(self):
+        # DEC pools size and quote the cycle in human units
+        dec = UniswapExchangeData.TYPE_DEC
+        factory = UniswapFactory("V2 factory", "0x2")
+        deploy_v2(factory, "ETH", "DAI", 1000, 100000, dec)
+        deploy_v2(factory, "DAI", "USDC", 100000, 100000, dec)
+        factory_v3 = UniswapFactory("V3 factory", "0x3")
+        deploy_v3(factory_v3, "ETH", "USDC", 110, 10000, dec)
+        arb = CyclicArbitrage([factory, factory_v3])
+        self.assertIsNotNone(arb.update())
+        route = arb.size_cycle(arb.find_cycles()[0])
+        x = route.amount_in
+        self.assertAlmostEqual(x, 13.654, places=2)
+        best = route.amount_out - route.amount_in
+        self.assertGreater(best, 0)
+        for dx in [1e-3, 1e-1]:
+            self.assertLessEqual(cycle_profit(arb, route, x + dx), best)
+            self.assertLessEqual(cycle_profit(arb, route, x - dx), best)
+        self.assertAlmostEqual(arb.execute(route, USER), best, places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
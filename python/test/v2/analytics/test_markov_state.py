@@ -0,0 +1,99 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.analytics.simulate import MarkovState, TokenSupplyState, StateHistory
+
+
+def loop_states(P, minted):
+    # the former np.append history
+    states = np.zeros((1, 4))
+    for k in range(len(minted)):
+        states = np.append(states, np.dot(states[-1:], P[k]) + np.array([[minted[k], 0, 0, 0]]), axis=0)
+    return states
+
+
+class TestMarkovState(unittest.TestCase):
+
+    def test_next_state_history(self):
+        mstate = MarkovState(stochastic=False)
+        for minted in [10, 20, 30]:
+            mstate.next_state(minted)
+        mstate.update_current_state(5)
+        mstate.next_state(40)
+        mstate.update_current_state(2)
+
+        P = mstate.gen_trans_matrix(False)
+        s = np.zeros((1, 4))
+        expected = [s]
+        for (minted, amt) in [(10, 0), (20, 0), (30, 5), (40, 2)]:
+            # update_current_state moves the recorded state, not the one next_state steps from
+            s = np.dot(s, P) + np.array([[minted, 0, 0, 0]])
+            expected.append(s + amt*np.array([[0, 1, -1, 0]]))
+        expected = np.vstack(expected)
+        np.testing.assert_allclose(mstate.states, expected)
+
+        df = mstate.get_state_df()
+        self.assertEqual(list(df.columns), ['Mint', 'Held', 'Vault', 'Burned', 'dHeld', 'dVault', 'dBurned'])
+        np.testing.assert_allclose(df['dHeld'], np.insert(np.diff(expected[1:, 1]), 0, 0))
+        np.testing.assert_allclose(df['dVault'], np.insert(np.diff(expected[1:, 2]), 0, 0))
+        self.assertAlmostEqual(mstate.get_current_state('dHeld'), expected[-1, 1] - expected[-2, 1])
+        self.assertAlmostEqual(mstate.get_current_state('Vault'), expected[-1, 2])
+        np.testing.assert_allclose(mstate.get_current_state().values, df.iloc[-1].values)
+
+    def test_gen_states_matchLoop(self):
+        mstate = MarkovState(stochastic=False)
+        np.random.seed(3)
+        df = mstate.gen_states(300)
+        np.random.seed(3)
+        P = np.broadcast_to(mstate.gen_trans_matrix(False), (300, 4, 4))
+        minted = mstate.tDel.sample(300, clip=False)
+        expected = loop_states(P, minted)
+        np.testing.assert_allclose(mstate.states, expected, rtol=1e-9)
+        self.assertEqual(len(df), 300)
+        # states keep the minted tokens; gen_states then continues from the last one
+        self.assertAlmostEqual(expected[-1, 1:].sum(), minted[:-1].sum(), delta=1e-6*minted.sum())
+        mstate.gen_states(5)
+        self.assertEqual(len(mstate.states), 306)
+
+    def test_stochastic_batch(self):
+        np.random.seed(4)
+        tstate = TokenSupplyState()
+        P = tstate.gen_trans_matrices(1000)
+        np.testing.assert_allclose(P.sum(axis=2), 1)
+        self.assertTrue(np.all((P[:, 2, 1] >= 0.2/1.1) & (P[:, 2, 2] <= 0.8/0.9)))
+        df = tstate.gen_states(1000)
+        self.assertEqual(list(df.columns[:4]), ['Mint', 'Held', 'LP', 'Burn'])
+        self.assertAlmostEqual(df.iloc[-1, 1:4].sum(), df.iloc[:-1, 0].sum(), places=6)
+
+    def test_history_grows(self):
+        history = StateHistory(['Mint', 'Held'], chunk=4)
+        for k in range(1, 11):
+            history.append([k, 2*k])
+        history.extend(np.array([[11, 22], [12, 24]]))
+        self.assertEqual(len(history), 13)
+        np.testing.assert_allclose(history.get_states()[:, 1], 2*np.arange(13))
+        self.assertEqual(history.get_current('dHeld'), 2)
+        self.assertEqual(history.get_df()['dHeld'].iloc[0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
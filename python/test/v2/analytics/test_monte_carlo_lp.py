@@ -0,0 +1,91 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.erc import ERC20
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.analytics.simulate import MonteCarloLPSimulation, SolveDeltasAnalytic
+from python.prod.math.model import BrownianModel
+
+USER = 'user0'
+
+
+def setup_lp():
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("ETH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011",
+                                    precision=UniswapExchangeData.TYPE_DEC)
+    lp = factory.deploy(exch_data)
+    lp.add_liquidity(USER, 1000, 100000, 1000, 100000)
+    return lp, eth, dai
+
+
+class TestMonteCarloLPSimulation(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(42)
+        self.p_paths = BrownianModel(100).gen_gbms(0.1, 0.5, 50, n_paths=20)
+
+    def test_matchesExchange(self):
+        # the same path traded swap by swap on a UniswapExchange
+        p_arr = self.p_paths[:, 3]
+        lp, eth, dai = setup_lp()
+        sDel = SolveDeltasAnalytic(lp)
+        for p in p_arr:
+            (dx, dy) = sDel.calc_swap(p)
+            if dx > 0:
+                lp.swap_exact_tokens_for_tokens(dx, 0, eth, USER)
+            elif dy > 0:
+                lp.swap_exact_tokens_for_tokens(dy, 0, dai, USER)
+        sim = MonteCarloLPSimulation(1000, 100000)
+        sim.run(p_arr)
+        self.assertAlmostEqual(sim.get_x_amt()[0], lp.get_reserve(eth), places=6)
+        self.assertAlmostEqual(sim.get_y_amt()[0], lp.get_reserve(dai), places=4)
+
+    def test_pathsIndependent(self):
+        sim = MonteCarloLPSimulation(1000, 100000)
+        sim.run(self.p_paths, record=True)
+        self.assertEqual(sim.get_x_amt_sim().shape, self.p_paths.shape)
+        np.testing.assert_allclose(sim.get_y_amt_sim()/sim.get_x_amt_sim(), self.p_paths)
+        single = MonteCarloLPSimulation(1000, 100000)
+        single.run(self.p_paths[:, 7])
+        self.assertEqual(single.get_x_amt()[0], sim.get_x_amt()[7])
+        self.assertEqual(single.get_fees()[0], sim.get_fees()[7])
+
+    def test_iloss_andFees(self):
+        sim = MonteCarloLPSimulation(1000, 100000, lp_amt=1000)
+        sim.run(self.p_paths)
+        iloss = sim.get_iloss()
+        self.assertTrue(np.all(iloss <= 0))
+        self.assertTrue(np.all(sim.get_fees() > 0))
+        # fees stay in the reserves, so they lift the position above the price ratio loss
+        self.assertTrue(np.all(sim.get_iloss(fees=True) > iloss))
+        np.testing.assert_allclose(sim.get_lp_value(), sim.get_hold_value()*(1 + sim.get_iloss(fees=True)))
+        # the position is a tenth of the pool
+        full = MonteCarloLPSimulation(1000, 100000)
+        full.run(self.p_paths)
+        np.testing.assert_allclose(10*sim.get_fees(), full.get_fees())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, random, tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+import numpy as np
+import pandas as pd
+from python.prod.erc import ERC20
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.analytics.simulate import ReplayEngine
+
+USERS = ['user0', 'user1', 'user2']
+N_OPS = 500
+
+
+def setup_v2_lp():
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("ETH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011",
+                                    precision=UniswapExchangeData.TYPE_GWEI)
+    lp = factory.deploy(exch_data)
+    lp.add_liquidity(USERS[0], 1000*10**18, 100000*10**18, 1000*10**18, 100000*10**18)
+    return lp, eth, dai
+
+
+def gen_log(seed, n_ops=N_OPS):
+    # Mostly swaps in both directions, with some deposits and small withdrawals
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n_ops):
+        kind = rng.choice(['swap']*8 + ['mint', 'burn'])
+        user = rng.choice(USERS)
+        if kind == 'swap':
+            if rng.random() < 0.5:
+                rows.append((kind, user, rng.randint(1, 10**18), 0, 0))
+            else:
+                rows.append((kind, user, 0, rng.randint(1, 100*10**18), 0))
+        elif kind == 'mint':
+            rows.append((kind, user, 10**18, 100*10**18, 0))
+        else:
+            rows.append((kind, USERS[0], 0, 0, 10**18))
+    return pd.DataFrame(rows, columns=['event', 'user', 'amount0', 'amount1', 'liquidity'])
+
+
+def apply_log(lp, eth, dai, log):
+    # Reference: the same operations through the exchange API one by one
+    for row in log.itertuples():
+        if row.event == 'swap' and row.amount0 > 0:
+            lp.swap_exact_tokens_for_tokens(row.amount0, 0, eth, row.user)
+        elif row.event == 'swap':
+            lp.swap_exact_tokens_for_tokens(row.amount1, 0, dai, row.user)
+        elif row.event == 'mint':
+            lp.add_liquidity(row.user, row.amount0, row.amount1, 0, 0)
+        else:
+            lp.remove_liquidity(row.user, row.liquidity, 0, 0)
+
+
+def pool_state(lp):
+    return (lp.reserve0, lp.reserve1, lp.total_supply, lp.liquidity_providers,
+            lp.collected_fee0, lp.collected_fee1)
+
+
+class TestReplayEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = gen_log(0)
+        self.lp_ref, eth, dai = setup_v2_lp()
+        apply_log(self.lp_ref, eth, dai, self.log)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_dataframe_matchesExchangeApi(self):
+        lp, _, _ = setup_v2_lp()
+        n_applied = ReplayEngine(lp, chunk_size=64).replay(self.log)
+        self.assertEqual(n_applied, N_OPS)
+        self.assertEqual(pool_state(lp), pool_state(self.lp_ref))
+
+    def test_csv_matchesExchangeApi(self):
+        path = os.path.join(self.tmp.name, 'ops.csv')
+        self.log.to_csv(path, index=False)
+        lp, _, _ = setup_v2_lp()
+        ReplayEngine(lp, chunk_size=64).replay(path)
+        self.assertEqual(pool_state(lp), pool_state(self.lp_ref))
+
+    def test_binary_matchesExchangeApi(self):
+        # Event codes and int64 (gwei scaled) amounts; one .npz archive and one memory mapped .npy directory
+        cols = {'event': self.log.event.map({'swap': 0, 'mint': 1, 'burn': 2}).to_numpy(np.int8),
+                'user': self.log.user.to_numpy(str)}
+        cols.update({name: (self.log[name] // 10**9).to_numpy(np.int64) for name in ['amount0', 'amount1', 'liquidity']})
+        npz_path = os.path.join(self.tmp.name, 'ops.npz')
+        np.savez(npz_path, **cols)
+        for name, col in cols.items():
+            np.save(os.path.join(self.tmp.name, name + '.npy'), col)
+
+        lp_npz, _, _ = setup_v2_lp()
+        lp_dir, _, _ = setup_v2_lp()
+        ReplayEngine(lp_npz, chunk_size=64).replay(npz_path)
+        ReplayEngine(lp_dir, chunk_size=64).replay(self.tmp.name)
+
+        lp_ref, eth, dai = setup_v2_lp()
+        scaled = pd.DataFrame({name: cols[name] for name in ['amount0', 'amount1', 'liquidity']})
+        apply_log(lp_ref, eth, dai, scaled.assign(event=self.log.event, user=self.log.user))
+        self.assertEqual(pool_state(lp_npz), pool_state(lp_ref))
+        self.assertEqual(pool_state(lp_dir), pool_state(lp_ref))
+
+    def test_resume_afterCrash_matchesUninterrupted(self):
+        path = os.path.join(self.tmp.name, 'ops.csv')
+        checkpoint_path = os.path.join(self.tmp.name, 'replay.ckpt')
+        self.log.to_csv(path, index=False)
+
+        lp, _, _ = setup_v2_lp()
+        engine = ReplayEngine(lp, checkpoint_path, checkpoint_every=100, chunk_size=64)
+        dispatch = engine._dispatch_v2
+        calls = []
+        def crash_on_fourth(chunk):
+            calls.append(len(chunk['event']))
+            if len(calls) == 4: raise RuntimeError('crash')
+            dispatch(chunk)
+        engine._dispatch_v2 = crash_on_fourth
+        with self.assertRaises(RuntimeError):
+            engine.replay(path)
+
+        # A fresh process: new pool, restored from the checkpoint, log skipped to its offset
+        lp_resumed, _, _ = setup_v2_lp()
+        engine = ReplayEngine(lp_resumed, checkpoint_path, checkpoint_every=100, chunk_size=64)
+        self.assertEqual(engine.load_checkpoint(), 100)
+        self.assertEqual(engine.resume(path), N_OPS)
+        self.assertEqual(pool_state(lp_resumed), pool_state(self.lp_ref))
+
+    def test_skip_errors(self):
+        # The middle swap has no input amount, which the pool rejects
+        log = pd.DataFrame({'event': ['swap', 'swap', 'swap'], 'user': ['user1']*3,
+                            'amount0': [10**18, 0, 10**18], 'amount1': [0, 0, 0]})
+        lp, _, _ = setup_v2_lp()
+        with self.assertRaises(AssertionError):
+            ReplayEngine(lp).replay(log)
+        lp, _, _ = setup_v2_lp()
+        engine = ReplayEngine(lp, skip_errors=True)
+        self.assertEqual(engine.replay(log), 3)
+        self.assertEqual(engine.n_failed, 1)
+        self.assertEqual(lp.reserve0, 1002*10**18)
+
+    def test_skip_errors_rollsBack(self):
+        # a swap sent to the ETH token address is rejected after the ETH has been deposited
+        log = pd.DataFrame({'event': ['swap', 'swap'], 'user': ['0x09', 'user1'],
+                            'amount0': [10**18, 10**18], 'amount1': [0, 0]})
+        lp, eth, _ = setup_v2_lp()
+        engine = ReplayEngine(lp, skip_errors=True)
+        self.assertEqual(engine.replay(log), 2)
+        self.assertEqual(engine.n_failed, 1)
+        self.assertEqual(lp.reserve0, 1001*10**18)
+        self.assertEqual(eth.token_total, lp.reserve0)
+
+
+if __name__ == '__main__':
+    unittest.main()
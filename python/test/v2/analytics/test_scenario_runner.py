@@ -0,0 +1,101 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, tempfile
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.analytics.simulate import ScenarioRunner
+
+
+def draw_scenario(scenario, rng):
+    if scenario['kind'] == 'crash':
+        os._exit(1)
+    if scenario['kind'] == 'raise':
+        raise ValueError('bad scenario')
+    return {'draws': rng.standard_normal(4), 'legacy': np.random.standard_normal(4)}
+
+
+def never_called(scenario, rng):
+    raise AssertionError('scenario recomputed')
+
+
+class TestScenarioRunner(unittest.TestCase):
+
+    def test_lp_sweep(self):
+        runner = ScenarioRunner(seed=7, max_workers=2)
+        scenarios = runner.grid(x_amt=[1000, 5000], sigma=[0.2, 0.5], n_step=[50])
+        self.assertEqual(len(scenarios), 4)
+        results = runner.run(scenarios)
+        self.assertEqual(runner.errors, {})
+        for scenario, result in zip(scenarios, results):
+            self.assertEqual(result['price'].shape, (50,))
+            # every step is corrected back to the scenario's price path
+            np.testing.assert_allclose(result['y_amt']/result['x_amt'], result['price'], rtol=1e-6)
+            self.assertEqual(result['x_amt'][0] > 2000, scenario['x_amt'] == 5000)
+
+    def test_streams_independentOfWorkers(self):
+        scenarios = [{'kind': 'ok'}]*4
+        one = ScenarioRunner(draw_scenario, max_workers=1, seed=3).run(scenarios)
+        two = ScenarioRunner(draw_scenario, max_workers=2, seed=3).run(scenarios)
+        for a, b in zip(one, two):
+            np.testing.assert_array_equal(a['draws'], b['draws'])
+            np.testing.assert_array_equal(a['legacy'], b['legacy'])
+        self.assertFalse(np.array_equal(one[0]['draws'], one[1]['draws']))
+        self.assertFalse(np.array_equal(one[0]['legacy'], one[1]['legacy']))
+
+    def test_failures_keepPartialResults(self):
+        scenarios = [{'kind': 'ok'}, {'kind': 'crash'}, {'kind': 'raise'}, {'kind': 'ok'}]
+        runner = ScenarioRunner(draw_scenario, max_workers=2, seed=3)
+        results = runner.run(scenarios)
+        self.assertIsNone(results[1])
+        self.assertIsNone(results[2])
+        self.assertEqual(runner.errors[1], 'ScenarioRunner: WORKER CRASHED')
+        self.assertIsInstance(runner.errors[2], ValueError)
+        expected = ScenarioRunner(draw_scenario, max_workers=1, seed=3).run([{'kind': 'ok'}]*4)
+        np.testing.assert_array_equal(results[0]['draws'], expected[0]['draws'])
+        np.testing.assert_array_equal(results[3]['draws'], expected[3]['draws'])
+
+    def test_resume_fromResultsDir(self):
+        scenarios = [{'kind': 'ok'}, {'kind': 'raise'}, {'kind': 'ok'}]
+        with tempfile.TemporaryDirectory() as tmp:
+            first = ScenarioRunner(draw_scenario, max_workers=1, seed=3, results_dir=tmp).run(scenarios)
+            self.assertEqual(sorted(os.listdir(tmp)), ['scenario_0.npz', 'scenario_2.npz'])
+            resumed = ScenarioRunner(never_called, max_workers=1, seed=3, results_dir=tmp)
+            results = resumed.run(scenarios)
+            np.testing.assert_array_equal(results[2]['draws'], first[2]['draws'])
+            self.assertIsNone(results[1])
+            self.assertIsInstance(resumed.errors[1], AssertionError)
+
+    def test_resume_checksScenarioAndSeed(self):
+        scenarios = [{'kind': 'ok'}, {'kind': 'ok'}]
+        with tempfile.TemporaryDirectory() as tmp:
+            first = ScenarioRunner(draw_scenario, max_workers=1, seed=3, results_dir=tmp).run(scenarios)
+            self.assertEqual(set(first[0]), {'draws', 'legacy'})
+            # another root seed, or another scenario at the same position, is run again
+            reseeded = ScenarioRunner(draw_scenario, max_workers=1, seed=4, results_dir=tmp).run(scenarios)
+            self.assertFalse(np.array_equal(reseeded[0]['draws'], first[0]['draws']))
+            changed = ScenarioRunner(never_called, max_workers=1, seed=4, results_dir=tmp)
+            results = changed.run([{'kind': 'ok'}, {'kind': 'ok', 'n': 1}])
+            np.testing.assert_array_equal(results[0]['draws'], reseeded[0]['draws'])
+            self.assertIsNone(results[1])
+            self.assertIsInstance(changed.errors[1], AssertionError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, math
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.erc import ERC20
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.analytics.simulate import SolveDeltas, SolveDeltasAnalytic, CorrectReserves
+
+USER = 'user0'
+E18 = 10**18
+
+
+def setup_v2_lp():
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("ETH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011",
+                                    precision=UniswapExchangeData.TYPE_DEC)
+    lp = factory.deploy(exch_data)
+    lp.add_liquidity(USER, 1000, 100000, 1000, 100000)
+    return lp, eth, dai
+
+
+def setup_v3_lp():
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("ETH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011",
+                                    version=UniswapExchangeData.VERSION_V3,
+                                    precision=UniswapExchangeData.TYPE_GWEI,
+                                    tick_spacing=60, fee=3000)
+    lp = factory.deploy(exch_data)
+    lp.initialize(int(math.sqrt(100) * 2**96))
+    lp.mint(USER, -887220, 887220, 1000*E18)
+    # concentrated positions below and above the price, crossed by larger moves
+    lp.mint(USER, 45060, 45900, 5000*E18)
+    lp.mint(USER, 46260, 47100, 3000*E18)
+    return lp, eth, dai
+
+
+class TestSolveDeltasAnalytic(unittest.TestCase):
+
+    def test_calc_matchesFsolve(self):
+        lp, eth, dai = setup_v2_lp()
+        for p in [80, 99.5, 100.5, 125]:
+            (dx, dy) = SolveDeltasAnalytic(lp).calc(p)
+            (dx_num, dy_num) = SolveDeltas(lp).calc(p)
+            # the fsolve system is written in |dx|, |dy|, so its root may come back with either sign
+            self.assertAlmostEqual(abs(dx), abs(dx_num), places=4)
+            self.assertAlmostEqual(abs(dy), abs(dy_num), places=2)
+            self.assertEqual(dx < 0, p > 100)
+            self.assertAlmostEqual(dy/dx, -p)
+
+    def test_calc_array(self):
+        lp, eth, dai = setup_v2_lp()
+        p_arr = np.array([80, 99.5, 100, 100.5, 125])
+        (dx, dy) = SolveDeltasAnalytic(lp).calc(p_arr)
+        expected = [SolveDeltasAnalytic(lp).calc(p) for p in p_arr]
+        np.testing.assert_allclose(dx, [e[0] for e in expected])
+        np.testing.assert_allclose(dy, [e[1] for e in expected])
+
+    def test_calc_path_matchesSequential(self):
+        lp, eth, dai = setup_v2_lp()
+        p_arr = np.array([101, 97, 97, 110, 90])
+        (dx, dy) = SolveDeltasAnalytic(lp).calc_path(p_arr)
+        # each correction leaves the reserves at the target price
+        (x, y) = (lp.get_reserve(eth), lp.get_reserve(dai))
+        for k, p in enumerate(p_arr):
+            u = abs(p*x - y)/(2*p)
+            (ex, ey) = (-u, p*u) if p >= y/x else (u, -p*u)
+            self.assertAlmostEqual(dx[k], ex, places=6)
+            self.assertAlmostEqual(dy[k], ey, places=4)
+            (x, y) = (x + ex, y + ey)
+            self.assertAlmostEqual(y/x, p)
+
+    def test_v2_swap_reachesPrice(self):
+        for p in [85, 120]:
+            lp, eth, dai = setup_v2_lp()
+            (dx, dy) = SolveDeltasAnalytic(lp).calc_swap(p)
+            if dx > 0:
+                amount_out = lp.swap_exact_tokens_for_tokens(dx, 0, eth, USER)
+                self.assertAlmostEqual(amount_out, -dy, places=6)
+            else:
+                amount_out = lp.swap_exact_tokens_for_tokens(dy, 0, dai, USER)
+                self.assertAlmostEqual(amount_out, -dx, places=6)
+            self.assertAlmostEqual(lp.get_price(eth), p, places=6)
+
+    def test_v3_swap_matchesQuote(self):
+        lp, eth, dai = setup_v3_lp()
+        p_arr = np.array([85, 95, 99, 100.5, 105, 120])
+        (dx, dy) = SolveDeltasAnalytic(lp).calc_swap(p_arr)
+        for k, p in enumerate(p_arr):
+            limit = int(math.sqrt(p) * 2**96)
+            if p < lp.get_price(eth):
+                quote = lp.quote_exact_input(eth, lp.convert_to_human(2**120), limit)
+                (amt_in, amt_out) = (dx[k], -dy[k])
+            else:
+                quote = lp.quote_exact_input(dai, lp.convert_to_human(2**120), limit)
+                (amt_in, amt_out) = (dy[k], -dx[k])
+            self.assertAlmostEqual(amt_in/lp.convert_to_human(quote.amountIn), 1, places=6)
+            self.assertAlmostEqual(amt_out/lp.convert_to_human(quote.amountOut), 1, places=6)
+
+    def test_correct_reserves(self):
+        lp, eth, dai = setup_v2_lp()
+        CorrectReserves(lp).apply(110)
+        self.assertAlmostEqual(lp.get_price(eth), 110, delta=0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.erc import ERC20
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.utils.tools import EventJournal
+from python.prod.process.swap import Swap
+
+USER = 'user0'
+ETH_AMT = 1000
+DAI_AMT = 100000
+
+
+def setup_v2_lp(journal = True):
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("ETH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011", journal=journal)
+    lp = factory.deploy(exch_data)
+    lp.add_liquidity(USER, ETH_AMT, DAI_AMT, ETH_AMT, DAI_AMT)
+    return lp, eth, dai
+
+
+class TestEventJournal(unittest.TestCase):
+
+    def test_journal_off_by_default(self):
+        lp, eth, dai = setup_v2_lp(journal = False)
+        self.assertIsNone(lp.journal)
+        Swap().apply(lp, dai, USER, 1000)
+
+    def test_records_swaps_mints_burns(self):
+        lp, eth, dai = setup_v2_lp()
+        lp.journal.advance()
+        out = Swap().apply(lp, dai, USER, 1000)
+        reserves = (lp.get_reserve(eth), lp.get_reserve(dai))
+        lp.journal.advance()
+        lp.add_liquidity('user1', 10, 1000, 10, 1000)
+        lp.remove_liquidity('user1', lp.get_liquidity_from_provider('user1'), 0, 0)
+
+        cols = lp.journal.to_numpy()
+        self.assertEqual(len(lp.journal), 4)
+        self.assertEqual(cols['event'].tolist(), [EventJournal.EVENT_MINT, EventJournal.EVENT_SWAP,
+                                                  EventJournal.EVENT_MINT, EventJournal.EVENT_BURN])
+        self.assertEqual(cols['step'].tolist(), [0, 1, 2, 2])
+        self.assertEqual([lp.journal.users[k] for k in cols['user']], [USER, USER, 'user1', 'user1'])
+        self.assertAlmostEqual(cols['amount0'][1], -out, places=9)
+        self.assertAlmostEqual(cols['amount1'][1], 1000, places=9)
+        self.assertAlmostEqual(cols['fee1'][1], 3, places=9)
+        self.assertEqual((cols['reserve0'][1], cols['reserve1'][1]), reserves)
+        self.assertAlmostEqual(cols['amount0'][2], -cols['amount0'][3], places=9)
+        self.assertEqual(cols['reserve1'][-1], lp.get_reserve(dai))
+
+    def test_growth_and_zero_copy_export(self):
+        lp, eth, dai = setup_v2_lp()
+        lp.journal = EventJournal(chunk_size = 8)
+        for k in range(50):
+            Swap().apply(lp, dai if k % 2 else eth, USER, 1)
+        cols = lp.journal.to_numpy()
+        self.assertEqual(len(cols['step']), 50)
+        self.assertTrue(np.shares_memory(cols['reserve0'], lp.journal.columns['reserve0']))
+        df = lp.journal.to_pandas()
+        self.assertEqual(len(df), 50)
+        self.assertEqual(set(df['event']), {'swap'})
+        self.assertEqual(df['reserve1'].iloc[-1], lp.get_reserve(dai))
+
+    def test_fork_has_own_journal(self):
+        lp, eth, dai = setup_v2_lp()
+        forked = lp.fork()
+        Swap().apply(forked, dai, USER, 1000)
+        self.assertEqual(len(lp.journal), 1)
+        self.assertEqual(len(forked.journal), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.erc import ERC20
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.process.swap import Swap
+
+USER = 'user0'
+ETH_AMT = 1000
+DAI_AMT = 100000
+
+
+def setup_v2_lp():
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("ETH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011")
+    lp = factory.deploy(exch_data)
+    lp.add_liquidity(USER, ETH_AMT, DAI_AMT, ETH_AMT, DAI_AMT)
+    return lp, eth, dai
+
+
+def pool_state(lp, eth, dai):
+    return (lp.reserve0, lp.reserve1, lp.total_supply, lp.token_total, dict(lp.liquidity_providers),
+            list(lp.fee0_arr), list(lp.fee1_arr), eth.token_total, dai.token_total)
+
+
+def trade(lp, eth, dai):
+    Swap().apply(lp, dai, USER, 1000)
+    Swap().apply(lp, eth, USER, 3)
+    lp.add_liquidity('user1', 10, 1000, 10, 1000)
+
+
+class TestPoolSnapshot(unittest.TestCase):
+
+    def test_restore(self):
+        lp, eth, dai = setup_v2_lp()
+        Swap().apply(lp, eth, USER, 1)
+        before = pool_state(lp, eth, dai)
+        snap = lp.snapshot()
+        trade(lp, eth, dai)
+        self.assertNotEqual(pool_state(lp, eth, dai), before)
+        lp.restore(snap)
+        self.assertEqual(pool_state(lp, eth, dai), before)
+        # The snapshot survives a restore and can be restored again
+        trade(lp, eth, dai)
+        lp.restore(snap)
+        self.assertEqual(pool_state(lp, eth, dai), before)
+
+    def test_restore_replays_identically(self):
+        lp, eth, dai = setup_v2_lp()
+        snap = lp.snapshot()
+        trade(lp, eth, dai)
+        after = pool_state(lp, eth, dai)
+        lp.restore(snap)
+        trade(lp, eth, dai)
+        self.assertEqual(pool_state(lp, eth, dai), after)
+
+    def test_fork_is_independent(self):
+        lp, eth, dai = setup_v2_lp()
+        before = pool_state(lp, eth, dai)
+        forked = lp.fork()
+        tokens = forked.factory.token_from_exchange[forked.name]
+        trade(forked, tokens[lp.token0], tokens[lp.token1])
+        self.assertEqual(pool_state(lp, eth, dai), before)
+        trade(lp, eth, dai)
+        self.assertEqual(pool_state(forked, tokens[lp.token0], tokens[lp.token1]), pool_state(lp, eth, dai))
+
+
+if __name__ == '__main__':
+    unittest.main()
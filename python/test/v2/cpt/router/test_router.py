@@ -0,0 +1,154 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.erc import ERC20
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.cpt.router import Router
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.utils.tools.v3 import TickMath
+
+USER = 'user0'
+E18 = 10**18
+
+
+def deploy_v2(factory, name0, name1, amt0, amt1):
+    # Each pool holds its own ERC20 objects, whose totals are the pool balances
+    tkn0 = ERC20(name0, "0x09")
+    tkn1 = ERC20(name1, "0x111")
+    exch_data = UniswapExchangeData(tkn0=tkn0, tkn1=tkn1, symbol=name0+name1, address="0x011",
+                                    precision=UniswapExchangeData.TYPE_GWEI)
+    lp = factory.deploy(exch_data)
+    lp.add_liquidity(USER, amt0, amt1, amt0, amt1)
+    return lp
+
+
+def deploy_v3(factory, name0, name1, liquidity, precision=UniswapExchangeData.TYPE_GWEI):
+    tkn0 = ERC20(name0, "0x09")
+    tkn1 = ERC20(name1, "0x111")
+    exch_data = UniswapExchangeData(tkn0=tkn0, tkn1=tkn1, symbol=name0+name1, address="0x012",
+                                    version=UniswapExchangeData.VERSION_V3,
+                                    precision=precision,
+                                    tick_spacing=60, fee=3000)
+    lp = factory.deploy(exch_data)
+    lp.initialize(TickMath.getSqrtRatioAtTick(0))
+    lp.mint(USER, -887220, 887220, liquidity)
+    return lp
+
+
+def pool_states(pools):
+    return [(lp.reserve0, lp.reserve1, lp.total_supply,
+             tuple(tkn.token_total for tkn in lp.factory.token_from_exchange[lp.name].values())) for lp in pools]
+
+
+class TestRouter(unittest.TestCase):
+
+    def setUp(self):
+        # ETH-USDC is thin, so ETH -> DAI -> USDC beats the direct pool
+        self.factory = UniswapFactory("V2 factory", "0x2")
+        self.eth_dai = deploy_v2(self.factory, "ETH", "DAI", 1000*E18, 100000*E18)
+        self.dai_usdc = deploy_v2(self.factory, "DAI", "USDC", 100000*E18, 100000*E18)
+        self.eth_usdc = deploy_v2(self.factory, "ETH", "USDC", 10*E18, 1000*E18)
+        self.pools = [self.eth_dai, self.dai_usdc, self.eth_usdc]
+        self.eth = ERC20("ETH", "0x09")
+        self.dai = ERC20("DAI", "0x111")
+        self.usdc = ERC20("USDC", "0x111")
+        self.router = Router(self.factory)
+
+    def test_best_route_multiHop(self):
+        route = self.router.get_best_route(self.eth, self.usdc, E18)
+        self.assertEqual(route.tokens, ['ETH', 'DAI', 'USDC'])
+        self.assertEqual(route.pools, [self.eth_dai, self.dai_usdc])
+        dai_out = self.eth_dai.get_amount_out(E18, self.eth_dai.factory.token_from_exchange[self.eth_dai.name]['ETH'])
+        self.assertEqual(route.amounts[1], dai_out)
+        routes = self.router.get_routes(self.eth, self.usdc, E18)
+        self.assertEqual(len(routes), 2)
+        self.assertEqual(route.amount_out, max(r.amount_out for r in routes))
+
+    def test_max_hops(self):
+        route = self.router.get_best_route(self.eth, self.usdc, E18, max_hops=1)
+        self.assertEqual(route.pools, [self.eth_usdc])
+        self.assertIsNone(self.router.get_best_route(self.eth, ERC20("WBTC", "0x1"), E18))
+
+    def test_search_doesNotMutatePools(self):
+        before = pool_states(self.pools)
+        self.router.get_routes(self.eth, self.usdc, 50*E18)
+        self.assertEqual(pool_states(self.pools), before)
+
+    def test_sync_incremental(self):
+        self.assertEqual(self.router.sync(), 3)
+        self.assertEqual(self.router.sync(), 0)
+        # A second factory with a V3 pool joins the graph on the next search
+        factory_v3 = UniswapFactory("V3 factory", "0x3")
+        router = Router([self.factory, factory_v3])
+        router.sync()
+        usdc_wbtc = deploy_v3(factory_v3, "USDC", "WBTC", 1000*E18)
+        route = router.get_best_route(self.eth, ERC20("WBTC", "0x1"), E18)
+        self.assertEqual(route.tokens, ['ETH', 'DAI', 'USDC', 'WBTC'])
+        self.assertEqual(route.pools[-1], usdc_wbtc)
+
+    def test_sync_redeploy(self):
+        self.router.sync()
+        # redeploying the pair replaces the thin ETH-USDC pool under the same exchange name
+        deep = deploy_v2(self.factory, "ETH", "USDC", 1000*E18, 100000*E18)
+        self.assertEqual(len(self.factory.exchanges), 3)
+        self.assertEqual(self.router.sync(), 1)
+        self.assertEqual(sum(lp is self.eth_usdc for lp, _ in self.router.graph['ETH']), 0)
+        route = self.router.get_best_route(self.eth, self.usdc, E18)
+        self.assertEqual(route.pools, [deep])
+        # pools gone from the factory leave the graph
+        del self.factory.exchanges[deep.name]
+        self.assertEqual(self.router.sync(), 0)
+        self.assertEqual(self.router.get_best_route(self.eth, self.usdc, E18, max_hops=1), None)
+
+    def test_swap_matchesQuote(self):
+        factory_v3 = UniswapFactory("V3 factory", "0x3")
+        usdc_wbtc = deploy_v3(factory_v3, "USDC", "WBTC", 1000*E18)
+        router = Router([self.factory, factory_v3])
+        wbtc = ERC20("WBTC", "0x1")
+        route = router.get_best_route(self.eth, wbtc, E18)
+        amount_out = router.swap(self.eth, wbtc, E18, USER)
+        self.assertEqual(amount_out, route.amount_out)
+        self.assertEqual(usdc_wbtc.factory.token_from_exchange[usdc_wbtc.name]['USDC'].token_total,
+                         usdc_wbtc.reserve0)
+
+    def test_route_dec_v3(self):
+        # DEC pools quote and swap in human units
+        factory_v3 = UniswapFactory("V3 factory", "0x3")
+        eth_dai = deploy_v3(factory_v3, "ETH", "DAI", 1000, UniswapExchangeData.TYPE_DEC)
+        dai_usdc = deploy_v3(factory_v3, "DAI", "USDC", 1000, UniswapExchangeData.TYPE_DEC)
+        router = Router(factory_v3)
+        route = router.get_best_route(self.eth, self.usdc, 1.5)
+        self.assertEqual(route.pools, [eth_dai, dai_usdc])
+        self.assertEqual(route.amounts[0], 1.5)
+        self.assertAlmostEqual(route.amounts[1], 1.4932668, places=6)
+        amount_out = router.swap(self.eth, self.usdc, 1.5, USER)
+        self.assertAlmostEqual(amount_out, route.amount_out, places=12)
+
+    def test_swap_atomic(self):
+        before = pool_states(self.pools)
+        route = self.router.get_best_route(self.eth, self.usdc, E18)
+        with self.assertRaises(AssertionError):
+            self.router.execute(route, USER, amount_out_min=route.amount_out + 1)
+        self.assertEqual(pool_states(self.pools), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -77,6 +77,33 @@ class TestSwapDeposit(unittest.TestCase):
         self.assertAlmostEqual(self.lp.get_reserve(self.eth), 1010.0, places=6)
         self.assertAlmostEqual(self.lp.get_reserve(self.dai), 100000.0, places=6)
 
+    def test_apply_batch_matches_sequential(self):
+        users = ['user1', 'user2', 'user3']
+        amounts = [5, 10, 20]
+        seq_lp, eth, dai = setup_v2_lp()
+        expected = {user: SwapDeposit().apply(seq_lp, eth, user, amt) for (user, amt) in zip(users, amounts)}
+        deposited = SwapDeposit().apply_batch(self.lp, self.eth, users, amounts)
+        for user in users:
+            self.assertAlmostEqual(deposited[user], expected[user], places=6)
+            # sequential deposits later in line get a worse price; the batch shares it
+            self.assertAlmostEqual(self.lp.get_liquidity_from_provider(user),
+                                   seq_lp.get_liquidity_from_provider(user),
+                                   delta=0.01*seq_lp.get_liquidity_from_provider(user))
+        self.assertAlmostEqual(self.lp.get_reserve(self.eth), seq_lp.get_reserve(eth), places=6)
+        self.assertAlmostEqual(self.lp.get_reserve(self.dai), seq_lp.get_reserve(dai), places=6)
+
+    def test_apply_batch_nets_withdrawals(self):
+        for user in ['user1', 'user2']:
+            self.lp.add_liquidity(user, 50, 5000, 50, 5000)
+        (eth_before, dai_before) = (self.lp.get_reserve(self.eth), self.lp.get_reserve(self.dai))
+        deposited = SwapDeposit().apply_batch(self.lp, self.eth, ['user1', 'user2', 'user1'], [4, -8, 6])
+        self.assertAlmostEqual(deposited['user1'], 10, places=6)
+        # the withdrawal skips the fee on the part netted against the deposit
+        self.assertGreater(-deposited['user2'], 8)
+        self.assertLess(-deposited['user2'], 8.1)
+        self.assertAlmostEqual(self.lp.get_reserve(self.eth) - eth_before, sum(deposited.values()), places=6)
+        self.assertAlmostEqual(self.lp.get_reserve(self.dai), dai_before, places=6)
+
 
 if __name__ == '__main__':
     unittest.main()
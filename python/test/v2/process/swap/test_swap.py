@@ -76,6 +76,14 @@ class TestSwap(unittest.TestCase):
         # Rate = output / input; larger trade gets worse rate
         self.assertGreater(out_small / 100, out_large / 10000)
 
+    def test_get_amounts_out_matches_get_amount_out(self):
+        amounts = [0.5, 1, 10, 250.25, 1000, 50000]
+        for token in (self.eth, self.dai):
+            amounts_out = self.lp.get_amounts_out(amounts, token)
+            self.assertEqual(len(amounts_out), len(amounts))
+            for amount, amount_out in zip(amounts, amounts_out):
+                self.assertAlmostEqual(amount_out, self.lp.get_amount_out(amount, token), places=9)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -75,6 +75,28 @@ class TestSwapRevenue(unittest.TestCase):
         self.assertAlmostEqual(pre_dai_amt, post_dai_amt, places=8)
         # LP amount stays the same
         self.assertAlmostEqual(pre_lp_amt, post_lp_amt, places=8)
+        # Fee ledger holds one entry per swap and its totals match the collected fees
+        ledger = self.lp.fee_ledger
+        self.assertEqual(ledger.count, 2*N_RUNS)
+        self.assertEqual(ledger.window_sum(), (self.lp.collected_fee0, self.lp.collected_fee1))
+        self.assertGreater(ledger.window_sum(2)[0], 0)
+
+    def test_swap_revenue_bounded_ledger(self):
+        """A ring ledger keeps only the most recent swaps but the same running totals."""
+        eth = ERC20("ETH", "0x09")
+        dai = ERC20("DAI", "0x111")
+        factory = UniswapFactory("ETH pool factory", "0x2")
+        exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011",
+                                        fee_ledger=UniswapExchangeData.FEE_LEDGER_RING,
+                                        fee_ledger_size=10)
+        lp = factory.deploy(exch_data)
+        lp.add_liquidity(USER, ETH_AMT, DAI_AMT, ETH_AMT, DAI_AMT)
+        for _ in range(25):
+            SwapDeposit().apply(lp, eth, USER, 100)
+            SwapDeposit().apply(self.lp, self.eth, USER, 100)
+        self.assertEqual(len(lp.fee0_arr), 10)
+        self.assertEqual(lp.fee0_arr.tolist(), self.lp.fee0_arr[-10:].tolist())
+        self.assertEqual(lp.fee_ledger.window_sum(), self.lp.fee_ledger.window_sum())
 
 
 if __name__ == '__main__':
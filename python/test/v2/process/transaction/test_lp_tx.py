@@ -0,0 +1,193 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.erc import ERC20, IndexERC20
+from python.prod.cpt.exchg import ChildUniswapExchange
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.cpt.wallet import Wallets
+from python.prod.cpt.vault import IndexVault
+from python.prod.utils.data import UniswapExchangeData, FactoryData
+from python.prod.utils.tools import FeeLedger, UndoLog
+from python.prod.process import lp_tx
+from python.prod.process.swap import Swap, WithdrawSwap
+from python.prod.process.deposit import SwapDeposit
+
+USER = 'user0'
+
+
+def setup_v2_lp():
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("ETH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011", journal=True,
+                                    fee_ledger=FeeLedger.MODE_RING, fee_ledger_size=4)
+    lp = factory.deploy(exch_data)
+    lp.add_liquidity(USER, 1000, 100000, 1000, 100000)
+    return factory, lp, eth, dai
+
+
+def pool_state(lp, eth, dai):
+    return (lp.reserve0, lp.reserve1, lp.total_supply, lp.collected_fee0, lp.collected_fee1,
+            eth.token_total, dai.token_total, dict(lp.liquidity_providers), lp.fee_ledger.count,
+            lp.fee_ledger.window_sum(), lp.fee_ledger.history().tolist(), len(lp.journal), 
+            list(lp.journal.users))
+
+
+class TestLPTransaction(unittest.TestCase):
+
+    def setUp(self):
+        (self.factory, self.lp, self.eth, self.dai) = setup_v2_lp()
+        for k in range(6):
+            Swap().apply(self.lp, self.eth if k % 2 else self.dai, USER, 1 + k)
+
+    def state(self):
+        return pool_state(self.lp, self.eth, self.dai)
+
+    def test_exception_rollsBack(self):
+        before = self.state()
+        with self.assertRaises(RuntimeError):
+            with lp_tx(self.factory):
+                SwapDeposit().apply(self.lp, self.eth, 'user1', 10)
+                WithdrawSwap().apply(self.lp, self.dai, 'user1', 50)
+                Swap().apply(self.lp, self.eth, 'user2', 5)
+                raise RuntimeError
+        self.assertEqual(self.state(), before)
+        self.assertEqual(UndoLog.active, None)
+
+    def test_speculative_retry(self):
+        with lp_tx(self.factory) as tx:
+            before = self.state()
+            out = Swap().apply(self.lp, self.eth, 'user1', 10)
+            self.assertGreater(tx.get_n_mutations(), 0)
+            tx.rollback()
+            self.assertEqual(self.state(), before)
+            self.assertEqual(Swap().apply(self.lp, self.eth, 'user1', 10), out)
+            after = self.state()
+        # without an exception the block is kept
+        self.assertEqual(self.state(), after)
+        self.assertNotEqual(after, before)
+
+    def test_nested(self):
+        before = self.state()
+        with lp_tx(self.factory) as tx:
+            Swap().apply(self.lp, self.dai, 'user1', 100)
+            outer = self.state()
+            try:
+                with lp_tx(self.factory):
+                    SwapDeposit().apply(self.lp, self.eth, 'user2', 10)
+                    raise ValueError
+            except ValueError:
+                pass
+            self.assertEqual(self.state(), outer)
+            with lp_tx(self.factory):
+                SwapDeposit().apply(self.lp, self.eth, 'user2', 10)
+            # the committed inner block is still undone with the outer one
+            tx.rollback()
+        self.assertEqual(self.state(), before)
+
+    def test_deploy_wallets_and_vault(self):
+        wallet = Wallets()
+        wallet.deposit(USER, self.eth, 10)
+        exchanges = list(self.factory.exchanges)
+        vault = IndexVault('iVault', '0x7')
+        vault.deposit_lp_tkn(USER, self.lp, 10)
+        providers = {nm: dict(acct[self.lp.token_name]) for nm, acct in vault.lp_providers.items()}
+        (accounts, tokens) = ({nm: dict(acct['ETH']) for nm, acct in wallet.accounts.items()}, dict(wallet.tokens['ETH']))
+        with self.assertRaises(RuntimeError):
+            with lp_tx(self.factory):
+                wallet.deposit(USER, self.eth, 5)
+                wallet.deposit('user1', self.eth, 5)
+                wallet.remove(USER, self.eth, 12)
+                wallet.deposit(USER, self.dai, 1)
+                vault.deposit_lp_tkn(USER, self.lp, 5)
+                vault.deposit_lp_tkn('user1', self.lp, 5)
+                tkn = ERC20("TKN", "0x3")
+                self.factory.deploy(UniswapExchangeData(tkn0=tkn, tkn1=self.dai, symbol="LP2", address="0x012"))
+                raise RuntimeError
+        self.assertEqual({nm: dict(acct['ETH']) for nm, acct in wallet.accounts.items()}, accounts)
+        self.assertEqual(dict(wallet.tokens['ETH']), tokens)
+        self.assertEqual(list(wallet.tokens), ['ETH'])
+        self.assertEqual({nm: dict(acct[self.lp.token_name]) for nm, acct in vault.lp_providers.items()}, providers)
+        self.assertEqual(vault.lp_tokens[self.lp.token_name]['total_amount'], 10)
+        self.assertEqual(list(self.factory.exchanges), exchanges)
+        self.assertEqual(list(self.factory.token_from_exchange), exchanges)
+
+    def test_snapshot_in_tx(self):
+        with lp_tx(self.factory) as tx:
+            Swap().apply(self.lp, self.eth, 'user1', 10)
+            snap = self.lp.snapshot()
+            mid = self.state()
+            Swap().apply(self.lp, self.dai, 'user1', 500)
+            tx.rollback()
+        self.lp.restore(snap)
+        self.assertEqual(self.state()[:11], mid[:11])
+
+    def test_child_hybrid_mint(self):
+        i_eth = IndexERC20("iETH", "0x12", self.eth, self.lp)
+        i_dai = IndexERC20("iDAI", "0x13", self.dai, self.lp)
+        child = ChildUniswapExchange(FactoryData({"iETH-iDAI": {"iETH": i_eth, "iDAI": i_dai}}, self.lp),
+                                     UniswapExchangeData(tkn0=i_eth, tkn1=i_dai, symbol="iLP", address="0x14"))
+        i_eth.deposit(USER, 10)
+        i_dai.deposit(USER, 1000)
+        child.mint(USER, 10, 1000)
+        before = (child.reserve0, child.reserve1, child.total_supply, child.hybrid_supply,
+                  dict(child.liquidity_providers), dict(child.hybrid_liquidity_providers), i_eth.token_total)
+        with lp_tx(child.factory) as tx:
+            i_eth.deposit('user1', 5)
+            i_dai.deposit('user1', 500)
+            child.mint('user1', 5, 500)
+            self.assertIn('user1', child.hybrid_liquidity_providers)
+            tx.rollback()
+        self.assertEqual((child.reserve0, child.reserve1, child.total_supply, child.hybrid_supply,
+                          dict(child.liquidity_providers), dict(child.hybrid_liquidity_providers), 
+                          i_eth.token_total), before)
+
+    def test_scoped_to_factory(self):
+        (factory, lp, eth, dai) = setup_v2_lp()
+        (before, other) = (self.state(), pool_state(lp, eth, dai))
+        with lp_tx(self.factory) as tx:
+            Swap().apply(self.lp, self.eth, 'user1', 10)
+            Swap().apply(lp, dai, 'user1', 100)
+            traded = pool_state(lp, eth, dai)
+            tx.rollback()
+        # the pool of the other factory is not recorded, and keeps its swap
+        self.assertEqual(self.state(), before)
+        self.assertEqual(pool_state(lp, eth, dai), traded)
+        self.assertNotEqual(traded, other)
+        # nesting a transaction for each factory records both
+        with lp_tx(self.factory) as tx:
+            with lp_tx(factory):
+                Swap().apply(self.lp, self.eth, 'user1', 10)
+                Swap().apply(lp, dai, 'user1', 100)
+            tx.rollback()
+        self.assertEqual(self.state(), before)
+        self.assertEqual(pool_state(lp, eth, dai), traded)
+
+    def test_plain_state_outside_tx(self):
+        # pools and tokens write undo entries at their mutation points, rather than hooking 
+        # every attribute write
+        self.assertEqual(type(self.lp.liquidity_providers), dict)
+        for obj in (self.lp, self.eth, self.lp.fee_ledger, self.lp.journal):
+            self.assertEqual(type(obj).__setattr__, object.__setattr__)
+
+
+if __name__ == '__main__':
+    unittest.main()
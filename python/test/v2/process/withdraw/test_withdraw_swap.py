@@ -77,6 +77,22 @@ class TestWithdrawSwap(unittest.TestCase):
         result = WithdrawSwap().apply(self.lp, self.dai, USER, 100)
         self.assertAlmostEqual(result, 100.0, places=6)
 
+    def test_apply_batch_matches_sequential(self):
+        users = ['user1', 'user2', 'user3']
+        for user in users:
+            self.lp.add_liquidity(user, 50, 5000, 50, 5000)
+        seq_lp, eth, dai = setup_v2_lp()
+        for user in users:
+            seq_lp.add_liquidity(user, 50, 5000, 50, 5000)
+        expected = {user: WithdrawSwap().apply(seq_lp, eth, user, amt) for (user, amt) in zip(users, [5, 2, 10])}
+        # user1 listed twice withdraws the sum
+        withdrawn = WithdrawSwap().apply_batch(self.lp, self.eth, ['user1', 'user2', 'user3', 'user1'], [3, 2, 10, 2])
+        self.assertEqual(list(withdrawn), users)
+        for user in users:
+            self.assertAlmostEqual(withdrawn[user], expected[user], delta=expected[user]*0.01)
+        self.assertAlmostEqual(self.lp.get_reserve(self.eth), seq_lp.get_reserve(eth), places=6)
+        self.assertAlmostEqual(self.lp.get_reserve(self.dai), seq_lp.get_reserve(dai), places=6)
+
 
 if __name__ == '__main__':
     unittest.main()
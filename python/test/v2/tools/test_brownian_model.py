@@ -0,0 +1,99 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.math.model import BrownianModel
+
+
+def loop_gbm(x0, mu, sigma, n_step, T=1):
+    # the former per-step generator
+    dt = float(T) / n_step
+    path = np.zeros(n_step + 1)
+    path[0] = x0
+    for t in range(1, n_step + 1):
+        rand = np.random.standard_normal()
+        path[t] = path[t - 1] * np.exp((mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rand)
+    return path
+
+
+class TestBrownianModel(unittest.TestCase):
+
+    def test_gbms_matchLoop(self):
+        np.random.seed(5)
+        expected = np.column_stack([loop_gbm(100, 0.1, 0.5, 50) for _ in range(6)])
+        np.random.seed(5)
+        np.testing.assert_allclose(BrownianModel(100).gen_gbms(0.1, 0.5, 50, n_paths=6), expected, rtol=1e-12)
+        np.random.seed(5)
+        chunked = BrownianModel(100).gen_gbms(0.1, 0.5, 50, n_paths=6, chunk_paths=4)
+        np.testing.assert_allclose(chunked, expected, rtol=1e-12)
+
+    def test_walks_matchLoop(self):
+        np.random.seed(5)
+        steps = [np.random.normal() for _ in range(99)]
+        np.random.seed(5)
+        w = BrownianModel(2).gen_normal(100)
+        np.testing.assert_allclose(w, 2 + np.concatenate(([0], np.cumsum(steps)/10)))
+        w = BrownianModel(2).gen_random_walk(100)
+        np.testing.assert_allclose(np.abs(np.diff(w)), 0.1)
+        self.assertEqual(w[0], 2)
+
+    def test_generator_andFloat32(self):
+        model = BrownianModel(100, rng=np.random.default_rng(9))
+        paths = model.gen_gbms(0.0, 0.4, 100, n_paths=20000, dtype=np.float32, chunk_paths=3000)
+        self.assertEqual(paths.dtype, np.float32)
+        self.assertEqual(paths.shape, (101, 20000))
+        # log returns over T = 1 are N(-sigma^2/2, sigma^2)
+        log_ret = np.log(paths[-1].astype(np.float64)/100)
+        self.assertAlmostEqual(log_ret.mean(), -0.08, delta=0.01)
+        self.assertAlmostEqual(log_ret.std(), 0.4, delta=0.01)
+        again = BrownianModel(100, rng=np.random.default_rng(9)).gen_gbms(0.0, 0.4, 100, n_paths=20000,
+                                                                          dtype=np.float32, chunk_paths=3000)
+        np.testing.assert_array_equal(paths, again)
+
+    def test_iter_gbms(self):
+        model = BrownianModel(100, rng=np.random.default_rng(1))
+        blocks = list(model.iter_gbms(0.1, 0.5, 40, n_paths=10, chunk_paths=4))
+        self.assertEqual([k0 for (k0, _) in blocks], [0, 4, 8])
+        self.assertEqual([b.shape for (_, b) in blocks], [(41, 4), (41, 4), (41, 2)])
+        self.assertTrue(all(np.all(b[0] == 100) for (_, b) in blocks))
+
+    def test_stream_gbms(self):
+        # with a Generator, the blocks draw the same normals as one (n_step x n_paths) matrix
+        blocks = list(BrownianModel(100, rng=np.random.default_rng(2)).stream_gbms(0.1, 0.5, 100, n_paths=3, block_steps=30))
+        self.assertEqual([len(b) for b in blocks], [31, 30, 30, 10])
+        z = np.random.default_rng(2).standard_normal((100, 3))
+        dt = 1/100
+        log_ret = (0.1 - 0.5*0.5**2)*dt + 0.5*np.sqrt(dt)*z
+        expected = 100*np.exp(np.vstack((np.zeros((1, 3)), np.cumsum(log_ret, axis=0))))
+        np.testing.assert_allclose(np.vstack(blocks), expected, rtol=1e-12)
+
+    def test_stream_walks(self):
+        blocks = list(BrownianModel(1, rng=np.random.default_rng(4)).stream_random_walk(100, n_paths=2, block_steps=40))
+        path = np.vstack(blocks)
+        self.assertEqual(path.shape, (100, 2))
+        np.testing.assert_allclose(np.abs(np.diff(path, axis=0)), 0.1)
+        path = np.vstack(list(BrownianModel(1, rng=np.random.default_rng(4)).stream_normal(100, n_paths=2, block_steps=40)))
+        z = np.random.default_rng(4).standard_normal((99, 2))
+        np.testing.assert_allclose(path[1:], 1 + np.cumsum(z/10, axis=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, random, tempfile
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.erc import ERC20
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.utils.tools import FeeLedger
+from python.prod.utils.tools.FeeLedger import SpilledChunk, INITIAL_ROWS
+
+N_FEES = 1000
+
+
+def gen_fees(seed = 3):
+    rng = random.Random(seed)
+    return [(rng.randint(0, 10**15), rng.randint(0, 10**15)) for _ in range(N_FEES)]
+
+
+def fill(ledger, fees):
+    for fee0, fee1 in fees:
+        ledger.append(fee0, fee1)
+    return ledger
+
+
+class TestFeeLedger(unittest.TestCase):
+
+    def test_aggregate(self):
+        fees = gen_fees()
+        ledger = fill(FeeLedger(FeeLedger.MODE_AGGREGATE), fees)
+        self.assertEqual(ledger.count, N_FEES)
+        self.assertEqual(ledger.window_sum(), (sum(f[0] for f in fees), sum(f[1] for f in fees)))
+        self.assertEqual(len(ledger.history()), 0)
+        with self.assertRaises(AssertionError):
+            ledger.window_sum(10)
+
+    def test_ring(self):
+        fees = gen_fees()
+        ledger = fill(FeeLedger(FeeLedger.MODE_RING, size = 64), fees)
+        self.assertEqual(ledger.history().tolist(), [list(f) for f in fees[-64:]])
+        self.assertEqual(ledger.history(5).tolist(), [list(f) for f in fees[-5:]])
+        self.assertEqual(ledger.window_sum(64)[0], sum(f[0] for f in fees[-64:]))
+        self.assertEqual(ledger.window_sum()[1], sum(f[1] for f in fees))
+        # float64 history: windowed sums are exact to float precision, running totals exactly
+        ledger = fill(FeeLedger(FeeLedger.MODE_RING, size = 64, dtype = np.float64), fees)
+        window = sum(f[0] for f in fees[-64:])
+        self.assertAlmostEqual(ledger.window_sum(64)[0], window, delta = 1e-12 * window)
+        self.assertEqual(ledger.window_sum()[1], sum(f[1] for f in fees))
+        with self.assertRaises(AssertionError):
+            ledger.window_sum(65)
+
+    def test_array_chunks(self):
+        fees = gen_fees()
+        ledger = fill(FeeLedger(FeeLedger.MODE_ARRAY, size = 100, dtype = object), fees[:-7])
+        self.assertEqual(len(ledger.chunks), 9)
+        copied = ledger.copy()
+        fill(ledger, fees[-7:])
+        self.assertEqual(ledger.history().tolist(), [list(f) for f in fees])
+        self.assertEqual(ledger.window_sum(250)[0], sum(f[0] for f in fees[-250:]))
+        # The copy shares the sealed chunks but not the open one
+        self.assertEqual(copied.history().tolist(), [list(f) for f in fees[:-7]])
+
+    def test_array_spill(self):
+        fees = gen_fees()
+        with tempfile.TemporaryDirectory() as spill_dir:
+            ledger = fill(FeeLedger(FeeLedger.MODE_ARRAY, size = 128, spill_dir = spill_dir), fees)
+            self.assertEqual(len(os.listdir(spill_dir)), N_FEES // 128)
+            self.assertTrue(all(isinstance(chunk, SpilledChunk) for chunk in ledger.chunks))
+            self.assertEqual(ledger.history().tolist(), [list(f) for f in fees])
+            # a copy shares the files, which go once neither ledger holds them
+            copied = ledger.copy()
+            ledger.close()
+            self.assertEqual(len(os.listdir(spill_dir)), N_FEES // 128)
+            self.assertEqual(copied.window_sum(N_FEES), ledger.window_sum())
+            with self.assertRaises(AssertionError):
+                ledger.history()
+            del copied
+            self.assertEqual(os.listdir(spill_dir), [])
+
+    def test_buffer_growsLazily(self):
+        fees = gen_fees()
+        for mode in (FeeLedger.MODE_RING, FeeLedger.MODE_ARRAY):
+            ledger = FeeLedger(mode, size = 512)
+            self.assertIsNone(ledger.buffer)
+            fill(ledger, fees[:3])
+            self.assertEqual(len(ledger.buffer), INITIAL_ROWS)
+            fill(ledger, fees[3:300])
+            self.assertEqual(len(ledger.buffer), 512)
+            self.assertEqual(ledger.history().tolist(), [list(f) for f in fees[:300]])
+        # a full ring wraps in place, a sealed ARRAY chunk starts the next one small again
+        ring = fill(FeeLedger(FeeLedger.MODE_RING, size = 100), fees)
+        self.assertEqual(ring.history().tolist(), [list(f) for f in fees[-100:]])
+        array = fill(FeeLedger(FeeLedger.MODE_ARRAY, size = 100), fees[:205])
+        self.assertEqual([len(chunk) for chunk in array.chunks], [100, 100])
+        self.assertEqual(len(array.buffer), INITIAL_ROWS)
+
+    def test_copy_sharesBuffer(self):
+        fees = gen_fees()
+        for mode in (FeeLedger.MODE_RING, FeeLedger.MODE_ARRAY):
+            ledger = fill(FeeLedger(mode, size = 128), fees[:500])
+            copied = ledger.copy()
+            self.assertIs(copied.buffer, ledger.buffer)
+            # the first write on either side takes a private buffer
+            fill(ledger, fees[500:510])
+            self.assertIsNot(copied.buffer, ledger.buffer)
+            fill(copied, fees[600:610])
+            n = ledger.retained()
+            self.assertEqual(ledger.history().tolist(), [list(f) for f in fees[:510]][-n:])
+            self.assertEqual(copied.history().tolist(), [list(f) for f in fees[:500] + fees[600:610]][-n:])
+
+    def test_pool_dtype(self):
+        eth = ERC20("ETH", "0x09")
+        dai = ERC20("DAI", "0x111")
+        factory = UniswapFactory("ETH pool factory", "0x2")
+        lp = factory.deploy(UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011",
+                                                fee_ledger_dtype=np.float64))
+        lp.add_liquidity('user0', 1000, 100000, 1000, 100000)
+        lp.swap_exact_tokens_for_tokens(10, 0, eth, 'user0')
+        self.assertEqual(lp.fee_ledger.dtype, np.float64)
+        self.assertEqual(lp.fee0_arr.dtype, np.float64)
+
+    def test_last(self):
+        fees = gen_fees()
+        for ledger in (FeeLedger(FeeLedger.MODE_RING, size = 64), FeeLedger(FeeLedger.MODE_ARRAY, size = 100)):
+            with self.assertRaises(AssertionError):
+                ledger.last()
+            for fee0, fee1 in fees[:300]:
+                ledger.append(fee0, fee1)
+                self.assertEqual(ledger.last(), (fee0, fee1))
+        with tempfile.TemporaryDirectory() as spill_dir:
+            ledger = fill(FeeLedger(FeeLedger.MODE_ARRAY, size = 100, spill_dir = spill_dir), fees[:200])
+            self.assertEqual(ledger.last(), fees[199])
+
+    def test_pool_spill(self):
+        eth = ERC20("ETH", "0x09")
+        dai = ERC20("DAI", "0x111")
+        factory = UniswapFactory("ETH pool factory", "0x2")
+        with tempfile.TemporaryDirectory() as spill_dir:
+            lp = factory.deploy(UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011",
+                                                    fee_ledger_size=4, fee_ledger_spill_dir=spill_dir))
+            lp.add_liquidity('user0', 1000, 100000, 1000, 100000)
+            for k in range(10):
+                lp.swap_exact_tokens_for_tokens(1 + k, 0, eth, 'user0')
+            self.assertEqual(len(os.listdir(spill_dir)), 2)
+            self.assertEqual(len(lp.fee0_arr), 10)
+            self.assertEqual(lp.fee_ledger.last()[0], lp.fee0_arr[-1])
+            lp.fee_ledger.close()
+            self.assertEqual(os.listdir(spill_dir), [])
+
+    def test_gwei_pool_exact(self):
+        eth = ERC20("ETH", "0x09")
+        dai = ERC20("DAI", "0x111")
+        factory = UniswapFactory("ETH pool factory", "0x2")
+        lp = factory.deploy(UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011",
+                                                precision=UniswapExchangeData.TYPE_GWEI))
+        lp.add_liquidity('user0', 10**21, 10**23, 10**21, 10**23)
+        lp.swap_exact_tokens_for_tokens(10**19 + 12345679, 0, eth, 'user0')
+        lp.swap_exact_tokens_for_tokens(10**21 + 7, 0, dai, 'user0')
+        # fees round up, as in the pool
+        self.assertEqual(lp.fee0_arr.tolist(), [-(-(10**19 + 12345679)*3//1000), 0])
+        self.assertEqual(lp.fee1_arr.tolist(), [0, -(-(10**21 + 7)*3//1000)])
+        self.assertTrue(all(type(fee) == int for fee in lp.fee0_arr))
+        self.assertEqual(lp.fee_ledger.window_sum(2), lp.fee_ledger.window_sum())
+        self.assertEqual(lp.fee_ledger.window_sum(1), (0, -(-(10**21 + 7)*3//1000)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, random
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.erc import ERC20
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.utils.tools import SaferMath, IntMath
+
+USER = 'user0'
+ETH_AMT = 1000*10**18
+DAI_AMT = 100000*10**18
+
+
+def setup_v2_lp():
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("ETH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011",
+                                    precision=UniswapExchangeData.TYPE_GWEI)
+    lp = factory.deploy(exch_data)
+    lp.add_liquidity(USER, ETH_AMT, DAI_AMT, ETH_AMT, DAI_AMT)
+    return lp, eth, dai
+
+
+class TestIntMath(unittest.TestCase):
+
+    def test_matches_safer_math(self):
+        rng = random.Random(7)
+        # Operands whose products stay within SaferMath's 50 digit Decimal context
+        operands = [0, 1, 2, 3, 997, 1000, -1, -7] + [rng.randint(-10**24, 10**24) for _ in range(300)]
+        for _ in range(2000):
+            x, y, z = rng.choice(operands), rng.choice(operands), rng.choice(operands)
+            self.assertEqual(IntMath().mul_div_round(x, y, z), SaferMath().mul_div_round(x, y, z))
+            self.assertEqual(IntMath().div_round(x, z), SaferMath().div_round(x, z))
+            self.assertEqual(IntMath().mul_div(x, y, z or 1), SaferMath().mul_div(x, y, z or 1))
+            self.assertEqual(IntMath().div(x, z), SaferMath().div(x, z))
+
+    def test_non_int_falls_back(self):
+        self.assertEqual(IntMath().mul_div_round(1.5, 3, 2), SaferMath().mul_div_round(1.5, 3, 2))
+
+    def test_gwei_pool_matches_safer_math(self):
+        lp_int, eth_int, dai_int = setup_v2_lp()
+        lp_dec, eth_dec, dai_dec = setup_v2_lp()
+        lp_dec.math = SaferMath()
+        self.assertIsInstance(lp_int.math, IntMath)
+        rng = random.Random(11)
+        for _ in range(200):
+            amt = rng.randint(1, 10**20)
+            if rng.random() < 0.5:
+                out_int = lp_int.swap_exact_tokens_for_tokens(amt, 0, eth_int, USER)
+                out_dec = lp_dec.swap_exact_tokens_for_tokens(amt, 0, eth_dec, USER)
+            else:
+                out_int = lp_int.swap_exact_tokens_for_tokens(100*amt, 0, dai_int, USER)
+                out_dec = lp_dec.swap_exact_tokens_for_tokens(100*amt, 0, dai_dec, USER)
+            self.assertEqual(out_int, out_dec)
+        lp_int.add_liquidity(USER, 10**18, 10**20, 0, 0)
+        lp_dec.add_liquidity(USER, 10**18, 10**20, 0, 0)
+        self.assertEqual((lp_int.reserve0, lp_int.reserve1), (lp_dec.reserve0, lp_dec.reserve1))
+        self.assertEqual(lp_int.total_supply, lp_dec.total_supply)
+        self.assertEqual(lp_int.fee_ledger.window_sum(), lp_dec.fee_ledger.window_sum())
+        self.assertEqual(lp_int.fee0_arr.tolist(), lp_dec.fee0_arr.tolist())
+        self.assertEqual(lp_int.fee1_arr.tolist(), lp_dec.fee1_arr.tolist())
+
+    def test_gwei_pool_get_amounts_out(self):
+        lp, eth, dai = setup_v2_lp()
+        amounts = [1, 997, 10**15, 3*10**18 + 1, 10**21, 10**24]
+        for token in (eth, dai):
+            amounts_out = lp.get_amounts_out(amounts, token)
+            self.assertEqual(list(amounts_out), [lp.get_amount_out(amount, token) for amount in amounts])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.erc import ERC20
+from python.prod.math.model import JumpDiffusionModel, BrownianModel
+from python.prod.analytics.simulate import SimpleLPSimulation
+
+
+class TestJumpDiffusionModel(unittest.TestCase):
+
+    def test_jumps_keepExpectedReturn(self):
+        model = JumpDiffusionModel(100, 0.1, 0.2, jump_rate=5, jump_mean=-0.05, jump_std=0.1,
+                                   rng=np.random.default_rng(0))
+        paths = model.gen_paths(50, n_paths=40000)
+        self.assertEqual(paths.shape, (51, 40000))
+        # the jump compensator keeps E[S_T] = x0 e^mu
+        self.assertAlmostEqual(paths[-1].mean()/100, np.exp(0.1), delta=0.01)
+        # jumps fatten the tails of the log returns
+        log_ret = np.diff(np.log(paths), axis=0).ravel()
+        kurt = np.mean((log_ret - log_ret.mean())**4)/np.var(log_ret)**2
+        self.assertGreater(kurt, 4)
+
+    def test_regimes(self):
+        trans_mat = [[0.9, 0.1], [0.0, 1.0]]
+        model = JumpDiffusionModel(100, [0.0, 0.0], [0.1, 0.8], trans_mat=trans_mat,
+                                   rng=np.random.default_rng(1))
+        blocks = list(model.stream_paths(200, n_paths=500, block_steps=64))
+        self.assertEqual(sum(len(b) for b in blocks), 201)
+        # the second regime absorbs every path well before the horizon
+        self.assertTrue(np.all(model.regimes == 1))
+        late = np.diff(np.log(np.vstack(blocks)[150:]), axis=0)
+        self.assertAlmostEqual(late.std(), 0.8*np.sqrt(1/200), delta=0.005)
+
+    def test_stream_intoSimulation(self):
+        stream = lambda: BrownianModel(100, rng=np.random.default_rng(3)).stream_gbms(0.1, 0.3, 500, block_steps=64)
+        sim = SimpleLPSimulation()
+        sim.init_amts(1000, 100)
+        sim.create_lp(ERC20("TKN", "0x111"), ERC20("DAI", "0x09"))
+        sim.run((p for block in stream() for p in block[:, 0]), record=False)
+        self.assertEqual(sim.get_tkn_price_sim(), [])
+        lp = sim.get_lp()
+        p_last = np.vstack(list(stream()))[-1, 0]
+        self.assertAlmostEqual(lp.get_price(lp.factory.token_from_exchange[lp.name]['TKN']), p_last, places=6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.math.risk import MaxDrop, DrawdownTracker
+
+
+def scan_maximums(arr):
+    # the former O(N^2) scans
+    return (np.array([max(arr[:k]) if k > 0 else arr[0] for k in range(len(arr))]),
+            np.array([np.argmax(arr[:k]) if k > 0 else 0 for k in range(len(arr))]))
+
+
+class TestMaxDrop(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # integer steps force ties between peaks
+        self.paths = 50 + np.cumsum(rng.integers(-3, 4, (200, 6)), axis=0).astype(float)
+
+    def test_matchesScan(self):
+        md = MaxDrop()
+        for j in range(self.paths.shape[1]):
+            arr = self.paths[:, j]
+            (maxis, arg_maxis) = scan_maximums(arr)
+            np.testing.assert_array_equal(md.calc_maximums(arr), maxis)
+            np.testing.assert_array_equal(md.calc_arg_maximums(arr), arg_maxis)
+        np.testing.assert_array_equal(md.calc_arg_maximums(self.paths)[:, 2], scan_maximums(self.paths[:, 2])[1])
+
+    def test_apply_batched(self):
+        (pnt1, pnt2, drop) = MaxDrop().apply(self.paths)
+        np.testing.assert_array_equal(drop, MaxDrop().m_drawdown(self.paths))
+        for j in range(self.paths.shape[1]):
+            (p1, p2, d) = MaxDrop().apply(self.paths[:, j])
+            self.assertEqual((p1, p2, d), ((pnt1[0][j], pnt1[1][j]), (pnt2[0][j], pnt2[1][j]), drop[j]))
+            self.assertAlmostEqual(d, (p1[1] - p2[1])/p1[1])
+
+    def test_tracker_matchesMaxDrop(self):
+        arr = self.paths[:, 0]
+        tracker = DrawdownTracker()
+        for x in arr:
+            tracker.update(x)
+        (p1, p2, d) = MaxDrop().apply(arr)
+        self.assertEqual((tracker.get_pnt1(), tracker.get_pnt2(), tracker.get_drop()), (p1, p2, d))
+        self.assertEqual(tracker.get_peak(), arr.max())
+
+    def test_tracker_blocks(self):
+        tracker = DrawdownTracker()
+        for k0 in range(0, 200, 64):
+            tracker.update_block(self.paths[k0:k0 + 64])
+        (pnt1, pnt2, drop) = MaxDrop().apply(self.paths)
+        np.testing.assert_array_equal(tracker.get_drop(), drop)
+        np.testing.assert_array_equal(tracker.get_pnt1()[0], pnt1[0])
+        np.testing.assert_array_equal(tracker.get_pnt2()[0], pnt2[0])
+        last = self.paths[-1]
+        np.testing.assert_allclose(tracker.get_drawdown(), (self.paths.max(axis=0) - last)/self.paths.max(axis=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
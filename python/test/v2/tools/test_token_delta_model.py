@@ -0,0 +1,68 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.math.model import TokenDeltaModel, EventSelectionModel, TimeDeltaModel
+
+
+class TestTokenDeltaModel(unittest.TestCase):
+
+    def test_sample(self):
+        model = TokenDeltaModel(50, shape=2, rng=np.random.default_rng(0))
+        amounts = model.sample(200000, p=0.3)
+        self.assertEqual(amounts.shape, (200000,))
+        self.assertLessEqual(np.abs(amounts).max(), 50)
+        self.assertAlmostEqual(np.mean(amounts > 0), 0.3, delta=0.005)
+        # Gamma(2, 50/5) has mean 20, barely touched by the clip at 50
+        self.assertAlmostEqual(np.abs(amounts).mean(), 20, delta=0.5)
+        self.assertEqual(len(model.apply(10)), 10)
+        self.assertTrue(all(0 < a <= 50 for a in model.apply(10)))
+
+    def test_delta_readsBuffer(self):
+        model = TokenDeltaModel(50, rng=np.random.default_rng(1), buffer_size=64)
+        deltas = [model.delta() for _ in range(200)]
+        # the buffer refills with 8, 16, 32, 64, 64 ... draws of the same stream
+        rng = np.random.default_rng(1)
+        expected = np.concatenate([10*rng.standard_gamma(1, k) for k in (8, 16, 32, 64, 64, 64)])
+        np.testing.assert_allclose(deltas, expected[:200])
+
+    def test_shared_rng_reproducible(self):
+        def draw(seed):
+            rng = np.random.default_rng(seed)
+            (tDel, tm, ev) = (TokenDeltaModel(50, rng=rng), TimeDeltaModel(rng=rng), EventSelectionModel(rng))
+            return [tDel.delta(0.5), tm.apply(p=0.01), ev.tri_select(0.2, 0.3), tDel.delta(0.5)]
+        self.assertEqual(draw(7), draw(7))
+        self.assertNotEqual(draw(7), draw(8))
+
+    def test_event_and_time_batches(self):
+        ev = EventSelectionModel(np.random.default_rng(2))
+        events = ev.tri_select_n(0.2, 0.3, 100000)
+        np.testing.assert_allclose(np.bincount(events)/100000, [0.2, 0.3, 0.5], atol=0.01)
+        self.assertAlmostEqual(ev.bi_select_n(0.25, 100000).mean(), 0.25, delta=0.01)
+        tm = TimeDeltaModel(rng=np.random.default_rng(3))
+        # one failure count per success at p = 0.01 has mean 99
+        self.assertAlmostEqual(tm.apply(100000, p=0.01).mean(), 99, delta=2)
+        self.assertAlmostEqual(np.mean([tm.apply(p=0.01) for _ in range(20000)]), 99, delta=3)
+        self.assertEqual(TimeDeltaModel(no_time_delay=True).apply(3), [0, 0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, copy, pickle, random
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.utils.tools.v3 import TickMath
+from python.prod.utils.tools.v3.Shared import MIN_TICK, MAX_TICK
+
+
+class TestSqrtRatioCache(unittest.TestCase):
+
+    def test_lru_matchesTickMath(self):
+        cache = TickMath.SqrtRatioCache(60, maxsize = 64)
+        ticks = [random.randint(MIN_TICK, MAX_TICK) for _ in range(500)] + [MIN_TICK, MAX_TICK, 0]
+        for tick in ticks + ticks:
+            self.assertEqual(cache.getSqrtRatioAtTick(tick), TickMath.getSqrtRatioAtTick(tick))
+
+    def test_lru_evictsLeastRecent(self):
+        cache = TickMath.SqrtRatioCache(1, maxsize = 3)
+        for tick in (1, 2, 3):
+            cache.getSqrtRatioAtTick(tick)
+        cache.getSqrtRatioAtTick(1)
+        cache.getSqrtRatioAtTick(4)
+        self.assertEqual(list(cache.lru.keys()), [3, 1, 4])
+        self.assertEqual(len(cache), 3)
+
+    def test_precompute_matchesTickMath(self):
+        cache = TickMath.SqrtRatioCache(200).precompute()
+        self.assertEqual(len(cache.table), (cache.maxTick - cache.minTick) // 200 + 1)
+        for tick in range(cache.minTick, cache.maxTick + 1, 200*97):
+            self.assertEqual(cache.getSqrtRatioAtTick(tick), TickMath.getSqrtRatioAtTick(tick))
+        # Off-grid ticks fall back to the LRU map
+        self.assertEqual(cache.getSqrtRatioAtTick(MAX_TICK), TickMath.getSqrtRatioAtTick(MAX_TICK))
+        self.assertEqual(list(cache.lru.keys()), [MAX_TICK])
+
+    def test_shared_perTickSpacing(self):
+        cache = TickMath.getSqrtRatioCache(60)
+        self.assertIs(cache, TickMath.getSqrtRatioCache(60))
+        self.assertIsNot(cache, TickMath.getSqrtRatioCache(10))
+        self.assertIs(copy.deepcopy(cache), cache)
+        self.assertIs(pickle.loads(pickle.dumps(cache)), cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
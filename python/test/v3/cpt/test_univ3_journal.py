@@ -0,0 +1,73 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.test.v3.utilities import *
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.erc import ERC20
+from python.prod.utils.data import UniswapExchangeData
+
+USER = 'user0'
+
+
+def setup_v3_lp():
+    tick_spacing = TICK_SPACINGS[FeeAmount.MEDIUM]
+    usdc = ERC20("USDC", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("TEST pool factory", "0x2")
+    exch_data = UniswapExchangeData(
+        tkn0=usdc, tkn1=dai, symbol="LP", address="0x011",
+        version=UniswapExchangeData.VERSION_V3,
+        precision=UniswapExchangeData.TYPE_GWEI,
+        tick_spacing=tick_spacing, fee=FeeAmount.MEDIUM, journal=True
+    )
+    lp = factory.deploy(exch_data)
+    lp.initialize(encodePriceSqrt(1, 1))
+    return lp
+
+
+class Test_UniV3Journal(unittest.TestCase):
+
+    def test_records_events(self):
+        lp = setup_v3_lp()
+        (amt0, amt1) = lp.mint(USER, -600, 600, expandTo18Decimals(10))
+        usdc = lp.factory.token_from_exchange[lp.name][lp.token0]
+        quote = lp.quote_exact_input(usdc, expandTo18Decimals(1))
+        (_, amount0, amount1, sqrtPriceX96, liquidity, tick) = lp.swapExact0For1(USER, expandTo18Decimals(1), None)
+        (_, _, _, _, burned0, burned1) = lp.burn(USER, -600, 600, expandTo18Decimals(5))
+        (_, _, _, collected0, collected1) = lp.collect(USER, -600, 600, MAX_UINT128, MAX_UINT128)
+
+        df = lp.journal.to_pandas()
+        self.assertEqual(list(df['event']), ['mint', 'swap', 'burn', 'collect'])
+        self.assertEqual((df['amount0'][0], df['amount1'][0]), (amt0, amt1))
+        self.assertEqual(df['liquidity'][0], expandTo18Decimals(10))
+        self.assertEqual((df['amount0'][1], df['amount1'][1]), (amount0, amount1))
+        self.assertEqual(df['sqrt_price_x96'][1], float(sqrtPriceX96))
+        self.assertEqual(df['tick'][1], tick)
+        self.assertEqual(df['liquidity'][1], liquidity)
+        self.assertEqual(df['fee0'][1], quote.feeAmount)
+        self.assertEqual(df['fee1'][1], 0)
+        self.assertEqual((df['amount0'][2], df['amount1'][2]), (-burned0, -burned1))
+        self.assertEqual((df['amount0'][3], df['amount1'][3]), (-collected0, -collected1))
+        self.assertEqual(df['reserve0'].iloc[-1], lp.reserve0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, copy
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.test.v3.utilities import *
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.erc import ERC20
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.utils.tools.v3 import TickMath
+
+USER = 'user0'
+
+
+def setup_v3_lp():
+    tick_spacing = TICK_SPACINGS[FeeAmount.MEDIUM]
+    usdc = ERC20("USDC", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("TEST pool factory", "0x2")
+    exch_data = UniswapExchangeData(
+        tkn0=usdc, tkn1=dai, symbol="LP", address="0x011",
+        version=UniswapExchangeData.VERSION_V3,
+        precision=UniswapExchangeData.TYPE_GWEI,
+        tick_spacing=tick_spacing, fee=FeeAmount.MEDIUM
+    )
+    lp = factory.deploy(exch_data)
+    lp.initialize(encodePriceSqrt(1, 1))
+    lp.setFeeProtocol(6, 6)
+    lp.mint(USER, getMinTick(tick_spacing), getMaxTick(tick_spacing), expandTo18Decimals(10))
+    for k in range(1, 6):
+        lp.mint(USER, -k*120, k*180, expandTo18Decimals(5))
+    return lp, usdc, dai
+
+
+def pool_state(lp):
+    return (lp.slot0.sqrtPriceX96, lp.slot0.tick, lp.total_supply, lp.feeGrowthGlobal0X128,
+            lp.feeGrowthGlobal1X128, lp.protocolFees.token0, lp.protocolFees.token1,
+            lp.reserve0, lp.reserve1, copy.deepcopy(lp.ticks))
+
+
+class Test_UniV3Quote(unittest.TestCase):
+
+    def check_quote(self, exact_input, zero_for_one, amount):
+        lp, usdc, dai = setup_v3_lp()
+        token_in = usdc if zero_for_one else dai
+        state_before = pool_state(lp)
+        tick_before = lp.slot0.tick
+
+        if exact_input:
+            quote = lp.quote_exact_input(token_in, amount)
+        else:
+            quote = lp.quote_exact_output(token_in, amount)
+        self.assertEqual(pool_state(lp), state_before)
+
+        limit = TickMath.MIN_SQRT_RATIO + 1 if zero_for_one else TickMath.MAX_SQRT_RATIO - 1
+        (_, amount0, amount1, sqrtPriceX96, _, tick) = lp.swap(
+            USER, zero_for_one, amount if exact_input else -amount, limit)
+        (amount_in, amount_out) = (amount0, -amount1) if zero_for_one else (amount1, -amount0)
+
+        self.assertEqual(quote.amountIn, amount_in)
+        self.assertEqual(quote.amountOut, amount_out)
+        self.assertEqual(quote.sqrtPriceX96After, sqrtPriceX96)
+        self.assertEqual(quote.tickAfter, tick)
+        self.assertGreater(quote.feeAmount, 0)
+        self.assertLess(quote.feeAmount, quote.amountIn)
+
+        # Every initialized tick between the start and end price is crossed, in swap order
+        if zero_for_one:
+            expected = sorted([t for t in lp.ticks if tick < t <= tick_before], reverse = True)
+        else:
+            expected = sorted([t for t in lp.ticks if tick_before < t <= tick])
+        self.assertEqual(quote.ticksCrossed, expected)
+        self.assertGreater(len(quote.ticksCrossed), 0)
+
+    def test_quoteExactInput_zeroForOne(self):
+        self.check_quote(True, True, expandTo18Decimals(3))
+
+    def test_quoteExactInput_oneForZero(self):
+        self.check_quote(True, False, expandTo18Decimals(3))
+
+    def test_quoteExactOutput_zeroForOne(self):
+        self.check_quote(False, True, expandTo18Decimals(3))
+
+    def test_quoteExactOutput_oneForZero(self):
+        self.check_quote(False, False, expandTo18Decimals(3))
+
+    def test_quote_priceLimit(self):
+        lp, usdc, dai = setup_v3_lp()
+        limit = TickMath.getSqrtRatioAtTick(-150)
+        quote = lp.quote_exact_input(usdc, expandTo18Decimals(100), limit)
+        self.assertEqual(quote.sqrtPriceX96After, limit)
+        self.assertEqual(quote.ticksCrossed, [-120])
+
+    def test_quote_wrongToken(self):
+        lp, usdc, dai = setup_v3_lp()
+        with self.assertRaises(AssertionError):
+            lp.quote_exact_input(ERC20("ETH", "0x12"), 1000)
+
+    def check_curve(self, lp, token_in, amounts):
+        curve = lp.quote_exact_input_curve(token_in, amounts)
+        for k, amount in enumerate(amounts):
+            quote = lp.quote_exact_input(token_in, amount)
+            self.assertEqual(curve.amountIn[k], quote.amountIn)
+            self.assertEqual(curve.amountOut[k], quote.amountOut)
+            self.assertEqual(curve.sqrtPriceX96After[k], quote.sqrtPriceX96After)
+            self.assertEqual(curve.feeAmount[k], quote.feeAmount)
+
+    def test_quoteExactInputCurve_matchesQuotes(self):
+        lp, usdc, dai = setup_v3_lp()
+        amounts = [1, 10**6] + [expandTo18Decimals(1) * k // 4 for k in range(1, 40)]
+        self.check_curve(lp, usdc, amounts)
+        self.check_curve(lp, dai, amounts)
+
+    def test_quoteExactInputCurve_beyondLiquidity(self):
+        # Only a narrow position: large sizes run the price out to the limit
+        tick_spacing = TICK_SPACINGS[FeeAmount.MEDIUM]
+        usdc = ERC20("USDC", "0x09")
+        dai = ERC20("DAI", "0x111")
+        factory = UniswapFactory("TEST pool factory", "0x2")
+        lp = factory.deploy(UniswapExchangeData(
+            tkn0=usdc, tkn1=dai, symbol="LP", address="0x011",
+            version=UniswapExchangeData.VERSION_V3,
+            precision=UniswapExchangeData.TYPE_GWEI,
+            tick_spacing=tick_spacing, fee=FeeAmount.MEDIUM))
+        lp.initialize(encodePriceSqrt(1, 1))
+        lp.mint(USER, -tick_spacing, tick_spacing, expandTo18Decimals(1))
+        amounts = [10**12, 10**15, expandTo18Decimals(1), expandTo18Decimals(5)]
+        self.check_curve(lp, usdc, amounts)
+        curve = lp.quote_exact_input_curve(usdc, amounts)
+        self.assertEqual(curve.sqrtPriceX96After[-1], TickMath.MIN_SQRT_RATIO + 1)
+        self.assertLess(curve.amountIn[-1], amounts[-1])
+
+    def test_quotePriceCurve_matchesQuotes(self):
+        lp, usdc, dai = setup_v3_lp()
+        for token, sign in ((usdc, -1), (dai, 1)):
+            prices = [TickMath.getSqrtRatioAtTick(sign*t) for t in (0, 7, 120, 121, 300, 615, 1000)]
+            curve = lp.quote_price_curve(token, prices)
+            for k, price in enumerate(prices[1:], start = 1):
+                quote = lp.quote_exact_input(token, expandTo18Decimals(1000), price)
+                self.assertEqual(curve.amountIn[k], quote.amountIn)
+                self.assertEqual(curve.amountOut[k], quote.amountOut)
+                self.assertEqual(curve.sqrtPriceX96After[k], price)
+            self.assertEqual(curve.amountIn[0], 0)
+
+    def test_quoteCurve_unsorted(self):
+        lp, usdc, dai = setup_v3_lp()
+        with self.assertRaises(AssertionError):
+            lp.quote_exact_input_curve(usdc, [10, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, random, copy, tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+import pandas as pd
+from python.test.v3.utilities import *
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.erc import ERC20
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.analytics.simulate import ReplayEngine
+from python.prod.utils.tools.v3.Shared import MAX_UINT128
+
+USERS = ['user0', 'user1', 'user2']
+N_OPS = 200
+
+
+def setup_v3_lp(precision=UniswapExchangeData.TYPE_GWEI):
+    tick_spacing = TICK_SPACINGS[FeeAmount.MEDIUM]
+    usdc = ERC20("USDC", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("TEST pool factory", "0x2")
+    exch_data = UniswapExchangeData(
+        tkn0=usdc, tkn1=dai, symbol="LP", address="0x011",
+        version=UniswapExchangeData.VERSION_V3,
+        precision=precision,
+        tick_spacing=tick_spacing, fee=FeeAmount.MEDIUM
+    )
+    lp = factory.deploy(exch_data)
+    lp.initialize(encodePriceSqrt(1, 1))
+    liquidity = expandTo18Decimals(10) if precision == UniswapExchangeData.TYPE_GWEI else 100
+    lp.mint(USERS[0], getMinTick(tick_spacing), getMaxTick(tick_spacing), liquidity)
+    return lp
+
+
+def gen_log(seed):
+    # Positions are minted before they are burned or collected, so every row is valid
+    rng = random.Random(seed)
+    rows = []
+    positions = []
+    for _ in range(N_OPS):
+        kind = rng.choice(['swap']*6 + ['mint', 'burn', 'collect'])
+        user = rng.choice(USERS)
+        if kind == 'mint' or (kind != 'swap' and not positions):
+            lwr = rng.randint(-20, 19) * 60
+            upr = lwr + rng.randint(1, 10) * 60
+            positions.append((user, lwr, upr))
+            rows.append(('mint', user, 0, 0, expandTo18Decimals(1), lwr, upr))
+        elif kind == 'swap':
+            amount = rng.randint(1, expandTo18Decimals(1) // 10)
+            rows.append(('swap', user, amount, 0, 0, 0, 0) if rng.random() < 0.5 else ('swap', user, 0, amount, 0, 0, 0))
+        elif kind == 'burn':
+            (user, lwr, upr) = rng.choice(positions)
+            rows.append(('burn', user, 0, 0, expandTo18Decimals(1) // 10, lwr, upr))
+        else:
+            (user, lwr, upr) = rng.choice(positions)
+            rows.append(('collect', user, MAX_UINT128, MAX_UINT128, 0, lwr, upr))
+    return pd.DataFrame(rows, columns=['event', 'user', 'amount0', 'amount1', 'liquidity', 'tick_lower', 'tick_upper'])
+
+
+def pool_state(lp):
+    return copy.deepcopy((
+        lp.slot0, lp.ticks, lp.positions, lp.feeGrowthGlobal0X128, lp.feeGrowthGlobal1X128,
+        lp.reserve0, lp.reserve1, lp.total_supply, lp.liquidity_providers
+    ))
+
+
+class TestUniV3Replay(unittest.TestCase):
+
+    def test_replay_matchesExchangeApi(self):
+        log = gen_log(0)
+        lp_ref = setup_v3_lp()
+        for row in log.itertuples():
+            if row.event == 'swap' and row.amount0 > 0:
+                lp_ref.swapExact0For1(row.user, row.amount0, None)
+            elif row.event == 'swap':
+                lp_ref.swapExact1For0(row.user, row.amount1, None)
+            elif row.event == 'mint':
+                lp_ref.mint(row.user, row.tick_lower, row.tick_upper, row.liquidity)
+            elif row.event == 'burn':
+                lp_ref.burn(row.user, row.tick_lower, row.tick_upper, row.liquidity)
+            else:
+                lp_ref.collect(row.user, row.tick_lower, row.tick_upper, row.amount0, row.amount1)
+
+        lp = setup_v3_lp()
+        self.assertEqual(ReplayEngine(lp, chunk_size=32).replay(log), N_OPS)
+        self.assertEqual(pool_state(lp), pool_state(lp_ref))
+
+    def test_replay_dec(self):
+        # DEC pools take human amounts in every column, swaps included
+        log = pd.DataFrame([('swap', 'user1', 10.5, 0, 0, 0, 0),
+                            ('mint', 'user2', 0, 0, 2.5, -600, 600),
+                            ('swap', 'user1', 0, 3.25, 0, 0, 0),
+                            ('burn', 'user2', 0, 0, 1.0, -600, 600),
+                            ('collect', 'user2', 0.5, 0.5, 0, -600, 600)],
+                           columns=['event', 'user', 'amount0', 'amount1', 'liquidity', 'tick_lower', 'tick_upper'])
+        lp_ref = setup_v3_lp(UniswapExchangeData.TYPE_DEC)
+        lp_ref.swapExact0For1('user1', 10.5, None)
+        lp_ref.mint('user2', -600, 600, 2.5)
+        lp_ref.swapExact1For0('user1', 3.25, None)
+        lp_ref.burn('user2', -600, 600, 1.0)
+        lp_ref.collect('user2', -600, 600, 0.5, 0.5)
+
+        lp = setup_v3_lp(UniswapExchangeData.TYPE_DEC)
+        self.assertEqual(ReplayEngine(lp).replay(log), 5)
+        self.assertEqual(pool_state(lp), pool_state(lp_ref))
+
+    def test_resume_fromCheckpoint(self):
+        log = gen_log(1)
+        lp_full = setup_v3_lp()
+        ReplayEngine(lp_full).replay(log)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint_path = os.path.join(tmp, 'replay.ckpt')
+            # Replaying a prefix leaves a checkpoint at its end, as a crash right after it would
+            ReplayEngine(setup_v3_lp(), checkpoint_path, checkpoint_every=50).replay(log.iloc[:120])
+            lp = setup_v3_lp()
+            engine = ReplayEngine(lp, checkpoint_path, checkpoint_every=50)
+            self.assertEqual(engine.resume(log), N_OPS)
+        self.assertEqual(pool_state(lp), pool_state(lp_full))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, copy
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.test.v3.utilities import *
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.erc import ERC20
+from python.prod.utils.data import UniswapExchangeData
+
+USER = 'user0'
+
+
+def setup_v3_lp():
+    tick_spacing = TICK_SPACINGS[FeeAmount.MEDIUM]
+    usdc = ERC20("USDC", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("TEST pool factory", "0x2")
+    exch_data = UniswapExchangeData(
+        tkn0=usdc, tkn1=dai, symbol="LP", address="0x011",
+        version=UniswapExchangeData.VERSION_V3,
+        precision=UniswapExchangeData.TYPE_GWEI,
+        tick_spacing=tick_spacing, fee=FeeAmount.MEDIUM
+    )
+    lp = factory.deploy(exch_data)
+    lp.initialize(encodePriceSqrt(1, 1))
+    lp.mint(USER, getMinTick(tick_spacing), getMaxTick(tick_spacing), expandTo18Decimals(10))
+    for k in range(1, 4):
+        lp.mint(USER, -k*120, k*180, expandTo18Decimals(5))
+    return lp, usdc, dai
+
+
+def pool_state(lp):
+    tokens = lp.factory.token_from_exchange[lp.name]
+    return copy.deepcopy((lp.slot0, lp.feeGrowthGlobal0X128, lp.feeGrowthGlobal1X128, lp.protocolFees,
+            lp.reserve0, lp.reserve1, lp.total_supply, getattr(lp, 'liquidity', None),
+            dict(lp.ticks), dict(lp.positions), list(lp.tick_index),
+            dict(lp.tick_bitmap), dict(lp.liquidity_providers),
+            tokens[lp.token0].token_total, tokens[lp.token1].token_total))
+
+
+def trade(lp):
+    lp.swapExact0For1(USER, expandTo18Decimals(2), None)
+    lp.mint('user1', -600, 60, expandTo18Decimals(3))
+    lp.swapExact1For0(USER, expandTo18Decimals(3), None)
+    lp.burn(USER, -120, 180, expandTo18Decimals(1))
+    lp.collect(USER, -120, 180, MAX_UINT128, MAX_UINT128)
+
+
+class Test_UniV3Snapshot(unittest.TestCase):
+
+    def test_restore(self):
+        lp, usdc, dai = setup_v3_lp()
+        before = pool_state(lp)
+        snap = lp.snapshot()
+        trade(lp)
+        self.assertNotEqual(pool_state(lp), before)
+        lp.restore(snap)
+        self.assertEqual(pool_state(lp), before)
+        trade(lp)
+        lp.restore(snap)
+        self.assertEqual(pool_state(lp), before)
+
+    def test_restore_replays_identically(self):
+        lp, usdc, dai = setup_v3_lp()
+        snap = lp.snapshot()
+        trade(lp)
+        after = pool_state(lp)
+        lp.restore(snap)
+        trade(lp)
+        self.assertEqual(pool_state(lp), after)
+
+    def test_fork_is_independent(self):
+        lp, usdc, dai = setup_v3_lp()
+        before = pool_state(lp)
+        forks = [lp.fork() for _ in range(3)]
+        trade(forks[0])
+        trade(forks[1])
+        self.assertEqual(pool_state(lp), before)
+        self.assertEqual(pool_state(forks[2]), before)
+        self.assertEqual(pool_state(forks[0]), pool_state(forks[1]))
+        trade(lp)
+        self.assertEqual(pool_state(lp), pool_state(forks[0]))
+
+    def test_fork_shares_unmodified_ticks(self):
+        lp, usdc, dai = setup_v3_lp()
+        forked = lp.fork()
+        self.assertTrue(all(dict.__getitem__(forked.ticks, tick) is dict.__getitem__(lp.ticks, tick)
+                            for tick in lp.ticks))
+        quote = lp.quote_exact_input(usdc, expandTo18Decimals(1))
+        forked.swapExact0For1(USER, expandTo18Decimals(1), None)
+        # Only the ticks crossed by the swap were copied into the fork
+        copied = [tick for tick in lp.ticks
+                  if dict.__getitem__(forked.ticks, tick) is not dict.__getitem__(lp.ticks, tick)]
+        self.assertEqual(sorted(copied), sorted(quote.ticksCrossed))
+        self.assertLess(len(copied), len(lp.ticks))
+
+
+if __name__ == '__main__':
+    unittest.main()
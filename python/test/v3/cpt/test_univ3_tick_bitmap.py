@@ -0,0 +1,140 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.test.v3.utilities import *
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.erc import ERC20
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.utils.tools.v3 import TickBitmap, TickMath
+
+USER = 'user0'
+TICKS = [-200, -55, -4, 70, 78, 84, 139, 240, 535]
+
+
+def setup_bitmap(ticks = TICKS):
+    bitmap = {}
+    for tick in ticks:
+        TickBitmap.flipTick(bitmap, tick, 1)
+    return bitmap
+
+
+def setup_v3_lp(tick_search):
+    tick_spacing = TICK_SPACINGS[FeeAmount.MEDIUM]
+    usdc = ERC20("USDC", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("TEST pool factory", "0x2")
+    exch_data = UniswapExchangeData(
+        tkn0=usdc, tkn1=dai, symbol="LP", address="0x011",
+        version=UniswapExchangeData.VERSION_V3,
+        precision=UniswapExchangeData.TYPE_GWEI,
+        tick_spacing=tick_spacing, fee=FeeAmount.MEDIUM,
+        tick_search=tick_search
+    )
+    lp = factory.deploy(exch_data)
+    lp.initialize(encodePriceSqrt(1, 1))
+    lp.mint(USER, getMinTick(tick_spacing), getMaxTick(tick_spacing), expandTo18Decimals(1))
+    lp.mint(USER, -600, 600, expandTo18Decimals(10))
+    lp.mint(USER, -1200, -120, expandTo18Decimals(5))
+    lp.mint(USER, 120, 1800, expandTo18Decimals(5))
+    return lp
+
+
+class TestTickBitmap(unittest.TestCase):
+
+    def test_flipTick_toggles(self):
+        bitmap = setup_bitmap([-230])
+        self.assertEqual(bitmap[-1], 1 << 26)
+        TickBitmap.flipTick(bitmap, -230, 1)
+        self.assertEqual(bitmap, {})
+
+    def test_flipTick_requiresSpacing(self):
+        with self.assertRaises(AssertionError):
+            TickBitmap.flipTick({}, 61, 60)
+
+    def test_next_gt_returnsTickToRight(self):
+        bitmap = setup_bitmap()
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 78, 1, False), (84, True))
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, -55, 1, False), (-4, True))
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 77, 1, False), (78, True))
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, -56, 1, False), (-55, True))
+
+    def test_next_gt_wordBoundaries(self):
+        bitmap = setup_bitmap()
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 255, 1, False), (511, False))
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, -257, 1, False), (-200, True))
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 508, 1, False), (511, False))
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 383, 1, False), (511, False))
+        TickBitmap.flipTick(bitmap, 340, 1)
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 328, 1, False), (340, True))
+
+    def test_next_lte_returnsSameOrLeft(self):
+        bitmap = setup_bitmap()
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 78, 1, True), (78, True))
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 79, 1, True), (78, True))
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 72, 1, True), (70, True))
+
+    def test_next_lte_wordBoundaries(self):
+        bitmap = setup_bitmap()
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 258, 1, True), (256, False))
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 256, 1, True), (256, False))
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, -257, 1, True), (-512, False))
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 1023, 1, True), (768, False))
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 900, 1, True), (768, False))
+        TickBitmap.flipTick(bitmap, 329, 1)
+        self.assertEqual(TickBitmap.nextInitializedTickWithinOneWord(bitmap, 456, 1, True), (329, True))
+
+    def test_bitmap_syncedWithTicks(self):
+        lp = setup_v3_lp(UniswapExchangeData.TICK_SEARCH_BITMAP)
+        lp.burn(USER, -1200, -120, expandTo18Decimals(5))
+        flagged = set()
+        for word_pos, word in lp.tick_bitmap.items():
+            for bit_pos in range(256):
+                if word >> bit_pos & 1:
+                    flagged.add((256*word_pos + bit_pos)*lp.tickSpacing)
+        self.assertEqual(flagged, set(lp.ticks.keys()))
+        # each pool only keeps the structure its tick search reads
+        self.assertEqual(list(lp.tick_index), [])
+        self.assertEqual(lp.get_initialized_ticks(), sorted(lp.ticks.keys()))
+        lp = setup_v3_lp(UniswapExchangeData.TICK_SEARCH_INDEX)
+        lp.burn(USER, -1200, -120, expandTo18Decimals(5))
+        self.assertEqual(dict(lp.tick_bitmap), {})
+        self.assertEqual(lp.get_initialized_ticks(), sorted(lp.ticks.keys()))
+
+    def test_swap_matchesIndexSearch(self):
+        lp_index = setup_v3_lp(UniswapExchangeData.TICK_SEARCH_INDEX)
+        lp_bitmap = setup_v3_lp(UniswapExchangeData.TICK_SEARCH_BITMAP)
+        limits = [TickMath.getSqrtRatioAtTick(-1500), TickMath.getSqrtRatioAtTick(1500)]
+        for lp in (lp_index, lp_bitmap):
+            lp.swap(USER, True, expandTo18Decimals(3), limits[0])
+            lp.swap(USER, False, expandTo18Decimals(5), limits[1])
+            lp.swap(USER, True, -expandTo18Decimals(1), limits[0])
+        self.assertEqual(lp_index.slot0, lp_bitmap.slot0)
+        self.assertEqual(lp_index.ticks, lp_bitmap.ticks)
+        self.assertEqual(lp_index.feeGrowthGlobal0X128, lp_bitmap.feeGrowthGlobal0X128)
+        self.assertEqual(lp_index.feeGrowthGlobal1X128, lp_bitmap.feeGrowthGlobal1X128)
+        # The bitmap search also stops at empty word boundaries (e.g. tick 0), and each
+        # extra swap step can round the token amounts by 1 wei
+        self.assertAlmostEqual(lp_index.reserve0, lp_bitmap.reserve0, delta = 3)
+        self.assertAlmostEqual(lp_index.reserve1, lp_bitmap.reserve1, delta = 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -238,6 +238,28 @@ class Test_UniV3Tick(unittest.TestCase):
         )
         assert amt0 == 0
         assert amt1 == 3                           
+
+    def test_tickIndex_syncedWithTicks(self):
+        tick_spacing = TICK_SPACINGS[FeeAmount.MEDIUM]
+        (_, _, lp) = self.setup_lp_mint() 
+        lp.mint(USER_ACCT, -240, 0, 100)
+        lp.mint(USER_ACCT, -tick_spacing, tick_spacing, 250)
+        assert lp.tick_index == sorted(lp.ticks.keys())
+        lp.burn(USER_ACCT, -240, 0, 100)
+        assert lp.tick_index == sorted(lp.ticks.keys())
+        assert -240 not in lp.tick_index
+
+    def test_nextTick_matchesSortedTicks(self):
+        tick_spacing = TICK_SPACINGS[FeeAmount.MEDIUM]
+        (_, _, lp) = self.setup_lp_mint() 
+        lp.mint(USER_ACCT, -240, 0, 100)
+        lp.mint(USER_ACCT, -tick_spacing, tick_spacing, 250)
+        assert lp.nextTick(0, True) == (0, True)
+        assert lp.nextTick(-1, True) == (-tick_spacing, True)
+        assert lp.nextTick(0, False) == (tick_spacing, True)
+        assert lp.nextTick(-241, False) == (-240, True)
+        assert lp.nextTick(MIN_TICK, True) == (MIN_TICK, False)
+        assert lp.nextTick(MAX_TICK - 1, False) == (MAX_TICK, False)
          
 if __name__ == '__main__':
     unittest.main()    
\ No newline at end of file
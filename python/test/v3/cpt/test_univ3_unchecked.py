@@ -0,0 +1,122 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, random
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.test.v3.utilities import *
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.erc import ERC20
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.utils.tools.v3 import TickMath
+
+USERS = ['user0', 'user1', 'user2']
+N_OPS = 150
+SEEDS = [0, 1, 2, 3]
+
+
+def setup_v3_lp(execution, tick_search = UniswapExchangeData.TICK_SEARCH_INDEX):
+    tick_spacing = TICK_SPACINGS[FeeAmount.MEDIUM]
+    usdc = ERC20("USDC", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("TEST pool factory", "0x2")
+    exch_data = UniswapExchangeData(
+        tkn0=usdc, tkn1=dai, symbol="LP", address="0x011",
+        version=UniswapExchangeData.VERSION_V3,
+        precision=UniswapExchangeData.TYPE_GWEI,
+        tick_spacing=tick_spacing, fee=FeeAmount.MEDIUM,
+        tick_search=tick_search, execution=execution
+    )
+    lp = factory.deploy(exch_data)
+    lp.initialize(encodePriceSqrt(1, 1))
+    lp.mint(USERS[0], getMinTick(tick_spacing), getMaxTick(tick_spacing), expandTo18Decimals(10))
+    return lp
+
+
+def gen_ops(seed):
+    # Random sequence of mints, burns and swaps (both directions, exact in and exact out)
+    rng = random.Random(seed)
+    ops = []
+    for _ in range(N_OPS):
+        kind = rng.choice(['mint', 'burn', 'swap', 'swap', 'swap'])
+        user = rng.choice(USERS)
+        if kind == 'swap':
+            zero_for_one = rng.random() < 0.5
+            amount = rng.randint(1, expandTo18Decimals(2)) * rng.choice([1, -1])
+            limit_tick = rng.randint(1, 40) * 60 * (-1 if zero_for_one else 1)
+            ops.append(('swap', user, zero_for_one, amount, limit_tick))
+        else:
+            lwr = rng.randint(-40, 39) * 60
+            upr = lwr + rng.randint(1, 20) * 60
+            ops.append((kind, user, lwr, upr, rng.randint(1, expandTo18Decimals(5))))
+    return ops
+
+
+def apply_op(lp, op):
+    try:
+        if op[0] == 'swap':
+            (_, user, zero_for_one, amount, limit_tick) = op
+            limit = TickMath.getSqrtRatioAtTick(lp.slot0.tick + limit_tick)
+            lp.swap(user, zero_for_one, amount, limit)
+        elif op[0] == 'mint':
+            (_, user, lwr, upr, amount) = op
+            lp.mint(user, lwr, upr, amount)
+        else:
+            (_, user, lwr, upr, amount) = op
+            position = [p for (l, u, p) in lp.get_positions_for_owner(user) if (l, u) == (lwr, upr)]
+            if position and position[0].liquidity > 0:
+                lp.burn(user, lwr, upr, min(amount, position[0].liquidity))
+        return 'ok'
+    except AssertionError as msg:
+        return str(msg)
+
+
+def pool_state(lp):
+    return (
+        lp.slot0, lp.ticks, lp.positions, lp.tick_index, lp.tick_bitmap,
+        lp.feeGrowthGlobal0X128, lp.feeGrowthGlobal1X128, lp.protocolFees,
+        lp.reserve0, lp.reserve1, lp.total_supply, lp.liquidity_providers
+    )
+
+
+class TestUncheckedExecution(unittest.TestCase):
+
+    def check_differential(self, tick_search):
+        for seed in SEEDS:
+            lp_checked = setup_v3_lp(UniswapExchangeData.EXECUTION_CHECKED, tick_search)
+            lp_unchecked = setup_v3_lp(UniswapExchangeData.EXECUTION_UNCHECKED, tick_search)
+            for op in gen_ops(seed):
+                self.assertEqual(apply_op(lp_checked, op), apply_op(lp_unchecked, op))
+                self.assertEqual(pool_state(lp_checked), pool_state(lp_unchecked))
+
+    def test_random_swaps_identicalState(self):
+        self.check_differential(UniswapExchangeData.TICK_SEARCH_INDEX)
+
+    def test_random_swaps_identicalState_bitmap(self):
+        self.check_differential(UniswapExchangeData.TICK_SEARCH_BITMAP)
+
+    def test_boundary_stillValidated(self):
+        lp = setup_v3_lp(UniswapExchangeData.EXECUTION_UNCHECKED)
+        with self.assertRaises(AssertionError):
+            lp.swap('user0', True, 1.5, MIN_SQRT_RATIO + 1)
+        with self.assertRaises(AssertionError):
+            lp.mint('user0', -60, 60, -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
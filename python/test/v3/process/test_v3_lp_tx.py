@@ -0,0 +1,98 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, math
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.erc import ERC20
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.process import lp_tx
+from python.prod.process.swap import Swap
+from python.prod.process.deposit import SwapDeposit
+
+USER = 'user0'
+FULL_RANGE = (-887220, 887220)
+RANGE = (44220, 47100)
+
+
+def setup_v3_lp(tick_search = UniswapExchangeData.TICK_SEARCH_INDEX):
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("ETH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011",
+                                    version=UniswapExchangeData.VERSION_V3,
+                                    tick_spacing=60, fee=3000, journal=True, tick_search=tick_search)
+    lp = factory.deploy(exch_data)
+    lp.initialize(int(math.sqrt(100) * 2**96))
+    lp.mint(USER, FULL_RANGE[0], FULL_RANGE[1], 1000)
+    lp.mint(USER, RANGE[0], RANGE[1], 100)
+    return factory, lp, eth, dai
+
+
+def pool_state(lp, eth, dai):
+    return (vars(lp.slot0).copy(), vars(lp.protocolFees).copy(), getattr(lp, 'liquidity', None),
+            lp.feeGrowthGlobal0X128, lp.feeGrowthGlobal1X128, lp.reserve0, lp.reserve1, lp.total_supply,
+            eth.token_total, dai.token_total, dict(lp.liquidity_providers), dict(lp.tick_bitmap),
+            list(lp.tick_index), {k: vars(v).copy() for k, v in lp.ticks.items()},
+            {k: vars(v).copy() for k, v in lp.positions.items()},
+            {k: set(v) for k, v in lp.positions_for_owner.items()}, len(lp.journal))
+
+
+class TestV3LPTransaction(unittest.TestCase):
+
+    def setUp(self):
+        (self.factory, self.lp, self.eth, self.dai) = setup_v3_lp()
+        Swap().apply(self.lp, self.eth, USER, 1)
+
+    def state(self):
+        return pool_state(self.lp, self.eth, self.dai)
+
+    def test_rollback(self):
+        before = self.state()
+        forked = self.lp.fork()
+        with lp_tx(self.factory) as tx:
+            self.lp.mint('user1', 45000, 46200, 50)
+            SwapDeposit().apply(self.lp, self.dai, 'user1', 200, RANGE[0], RANGE[1])
+            # swap across the initialized ticks, then close a position
+            Swap().apply(self.lp, self.eth, 'user2', 20)
+            self.lp.burn(USER, RANGE[0], RANGE[1], 50)
+            self.assertNotEqual(self.state(), before)
+            tx.rollback()
+            self.assertEqual(self.state(), before)
+            # the pool trades from the restored state as the untouched fork does
+            self.assertEqual(Swap().apply(self.lp, self.eth, 'user2', 20), Swap().apply(forked, self.eth, 'user2', 20))
+        self.assertEqual(self.lp.slot0, forked.slot0)
+
+
+    def test_tick_flips_rollBack(self):
+        for tick_search in (UniswapExchangeData.TICK_SEARCH_INDEX, UniswapExchangeData.TICK_SEARCH_BITMAP):
+            (factory, lp, eth, dai) = setup_v3_lp(tick_search)
+            before = pool_state(lp, eth, dai)
+            with lp_tx(factory) as tx:
+                # initializes two ticks, then clears the ticks of RANGE
+                lp.mint('user1', 45000, 46200, 50)
+                lp.burn(USER, RANGE[0], RANGE[1], 100)
+                Swap().apply(lp, eth, 'user2', 20)
+                self.assertNotEqual(pool_state(lp, eth, dai), before)
+                tx.rollback()
+            self.assertEqual(pool_state(lp, eth, dai), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
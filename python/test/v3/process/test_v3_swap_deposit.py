@@ -0,0 +1,97 @@
+# ─────────────────────────────────────────────────────────────────────────────
+# Apache 2.0 License (DeFiPy)
+# ─────────────────────────────────────────────────────────────────────────────
+# Copyright 2023–2025 Ian Moore
+# Email: defipy.devs@gmail.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import sys, os, unittest, math
+import numpy as np
+from scipy import optimize
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)).split('/python/')[0])
+
+from python.prod.cpt.factory import UniswapFactory
+from python.prod.erc import ERC20
+from python.prod.utils.data import UniswapExchangeData
+from python.prod.process.deposit import SwapDeposit
+
+USER = 'user0'
+FULL_RANGE = (-887220, 887220)
+RANGE = (44220, 47100)
+
+
+def setup_v3_lp():
+    eth = ERC20("ETH", "0x09")
+    dai = ERC20("DAI", "0x111")
+    factory = UniswapFactory("ETH pool factory", "0x2")
+    exch_data = UniswapExchangeData(tkn0=eth, tkn1=dai, symbol="LP", address="0x011",
+                                    version=UniswapExchangeData.VERSION_V3,
+                                    tick_spacing=60, fee=3000)
+    lp = factory.deploy(exch_data)
+    lp.initialize(int(math.sqrt(100) * 2**96))
+    lp.mint(USER, FULL_RANGE[0], FULL_RANGE[1], 1000)
+    return lp, eth, dai
+
+
+class TestV3SwapDeposit(unittest.TestCase):
+
+    def setUp(self):
+        self.lp, self.eth, self.dai = setup_v3_lp()
+
+    def test_portion_solves_objective(self):
+        deposit = SwapDeposit()
+        for (lwr, upr) in [FULL_RANGE, RANGE, (45000, 46200)]:
+            for tkn in (self.eth, self.dai):
+                for amt in (0.01, 1, 10, 100):
+                    alpha = deposit._calc_univ3_deposit_portion(self.lp, tkn, amt, lwr, upr)
+                    # _obj_func is |amount left over| + 1e-8
+                    self.assertLess(deposit._obj_func(alpha, amt, self.lp, tkn, lwr, upr), 1e-8 + 1e-9*amt)
+
+    def test_portion_matchesNelderMead(self):
+        deposit = SwapDeposit()
+        res = optimize.minimize(deposit._obj_func, x0=0.5, bounds=[(0.35, 0.65)],
+                                args=(10, self.lp, self.eth, RANGE[0], RANGE[1]),
+                                method='Nelder-Mead', tol=1e-8)
+        alpha = deposit._calc_univ3_deposit_portion(self.lp, self.eth, 10, RANGE[0], RANGE[1])
+        self.assertAlmostEqual(alpha, res.x[0], places=6)
+
+    def test_portions_vectorized(self):
+        deposit = SwapDeposit()
+        amounts = np.array([0, 0.5, 5, 50])
+        alphas = deposit.calc_univ3_deposit_portions(self.lp, self.dai, amounts, RANGE[0], RANGE[1])
+        expected = [deposit._calc_univ3_deposit_portion(self.lp, self.dai, amt, RANGE[0], RANGE[1]) for amt in amounts]
+        np.testing.assert_allclose(alphas, expected, rtol=1e-12)
+
+    def test_apply_deposits_everything(self):
+        SwapDeposit().apply(self.lp, self.eth, USER, 10, RANGE[0], RANGE[1])
+        self.assertAlmostEqual(self.lp.get_reserve(self.eth), 110, places=6)
+        self.assertAlmostEqual(self.lp.get_reserve(self.dai), 10000, places=6)
+
+    def test_apply_batch_matches_sequential(self):
+        users = ['user1', 'user2', 'user3']
+        amounts = [0.5, 1, 2]
+        seq_lp, eth, dai = setup_v3_lp()
+        for (user, amt) in zip(users, amounts):
+            SwapDeposit().apply(seq_lp, eth, user, amt, RANGE[0], RANGE[1])
+        SwapDeposit().apply_batch(self.lp, self.eth, users, amounts, RANGE[0], RANGE[1])
+        for user in users:
+            self.assertAlmostEqual(self.lp.get_liquidity_from_provider(user),
+                                   seq_lp.get_liquidity_from_provider(user),
+                                   delta=0.01*seq_lp.get_liquidity_from_provider(user))
+        self.assertAlmostEqual(self.lp.get_reserve(self.eth), seq_lp.get_reserve(eth), places=6)
+        self.assertAlmostEqual(self.lp.get_reserve(self.dai), seq_lp.get_reserve(dai), places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -28,6 +28,7 @@ setup(name='UniswapPy',
           'uniswappy.cpt.factory',
           'uniswappy.cpt.index',
           'uniswappy.cpt.quote',
+          'uniswappy.cpt.router',
           'uniswappy.cpt.vault',
           'uniswappy.cpt.wallet',
           'uniswappy.erc',